@@ -5,16 +5,14 @@
 
 from datetime import timedelta
 import random
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
-def _iter_dependencies(project):
-    """
-    Вернуть зависимости независимо от того, хранятся они списком или словарём.
-    """
-    dependencies = project.proj_dependencies
-    if isinstance(dependencies, dict):
-        return dependencies.values()
-    return dependencies
+import numpy as np
+
+from ltrroe.core.graph import CompiledGraph, _iter_dependencies
+from ltrroe.core.sampling import uniform_design
+from ltrroe.core.objects import ProjectArrays
+from ltrroe.core.skills import SkillMatrix, team_slowdown
 
 def get_predecessors(project, task_id: int) -> List[int]:
     """
@@ -106,9 +104,10 @@ def calculate_task_duration(task, project=None) -> float:
     except (IndexError, KeyError):
         return base_duration
 
-def calculate_schedule(project) -> Tuple[Dict, Dict, Dict]:
+def calculate_schedule(project, graph: Optional[CompiledGraph] = None) -> Tuple[Dict, Dict, Dict]:
     """
     Выполнить forward pass для расчёта ранних дат начала и окончания
+    graph — заранее скомпилированный граф проекта (если не передан, строится здесь)
     Возвращает: early_start, early_finish, task_duration словари
     """
     task_duration = {}  # task_id -> длительность в днях
@@ -117,57 +116,46 @@ def calculate_schedule(project) -> Tuple[Dict, Dict, Dict]:
     for task_id, task in project.proj_tasks.items():
         task_duration[task_id] = calculate_task_duration(task, project)
     
-    early_start, early_finish = _forward_pass(project, task_duration)
+    early_start, early_finish = _forward_pass(project, task_duration, graph)
     
     return early_start, early_finish, task_duration
 
-def _forward_pass(project, task_duration: Dict) -> Tuple[Dict, Dict]:
+def _forward_pass(project, task_duration: Dict,
+                  graph: Optional[CompiledGraph] = None) -> Tuple[Dict, Dict]:
     """
     Общий forward pass для детерминированных и случайных длительностей задач.
+    Задачи обходятся один раз в топологическом порядке скомпилированного графа;
+    учитываются типы связей FS/SS/FF/SF и лаги (в днях).
     Возвращает: early_start, early_finish словари
     """
+    if graph is None:
+        graph = CompiledGraph(project)
+
     early_start = {}  # task_id -> дата начала
     early_finish = {}  # task_id -> дата окончания
-    processed = set()
-    
-    while len(processed) < len(project.proj_tasks):
-        progress = False
-        
-        for task_id in project.proj_tasks.keys():
-            if task_id in processed:
-                continue
-            
-            # Найти предшественников
-            preds = get_predecessors(project, task_id)
-            
-            # Проверить можно ли обработать эту задачу?
-            if not preds or all(p in processed for p in preds):
-                # Определить дату начала
-                if not preds:
-                    # Нет зависимостей -> начинаем с начала проекта
-                    start_date = project.proj_start_date
-                else:
-                    # Есть зависимости -> начинаем ПОСЛЕ окончания последнего предшественника
-                    max_finish_date = max(early_finish[p] for p in preds)
-                    start_date = max_finish_date
-                
-                # Рассчитать дату окончания
-                duration_days = task_duration[task_id]
-                finish_date = start_date + timedelta(days=duration_days)
-                
-                # Сохранить результаты
-                early_start[task_id] = start_date
-                early_finish[task_id] = finish_date
-                processed.add(task_id)
-                progress = True
-        
-        if not progress:
-            unresolved = sorted(set(project.proj_tasks) - processed)
-            raise ValueError(
-                "Невозможно выполнить forward pass: проверьте циклы "
-                f"или отсутствующие зависимости. Неразрешённые задачи: {unresolved}"
-            )
-    
+    task_ids = graph.task_ids
+    indptr = graph.pred_indptr
+
+    for i in graph.order:
+        task_id = task_ids[i]
+        duration = timedelta(days=task_duration[task_id])
+
+        # Без зависимостей (или если связи позволяют раньше) начинаем со старта проекта
+        start_date = project.proj_start_date
+        for k in range(indptr[i], indptr[i + 1]):
+            pred_id = task_ids[graph.pred_indices[k]]
+            # FS/FF отсчитываются от окончания предшественника, SS/SF — от начала
+            anchor = early_finish[pred_id] if graph.pred_from_finish[k] else early_start[pred_id]
+            bound = anchor + timedelta(days=float(graph.pred_lag[k]))
+            if graph.pred_to_finish[k]:
+                # FF/SF ограничивают окончание задачи
+                bound -= duration
+            start_date = max(start_date, bound)
+
+        # Рассчитать дату окончания
+        early_start[task_id] = start_date
+        early_finish[task_id] = start_date + duration
+
     return early_start, early_finish
 
 def get_successors(project, task_id: int) -> List[int]:
@@ -180,45 +168,62 @@ def get_successors(project, task_id: int) -> List[int]:
             successors.append(dep.dep_to_task)
     return successors
 
-def calculate_backward_pass(project, early_finish: Dict, task_duration: Dict) -> Tuple[Dict, Dict]:
+def calculate_backward_pass(project, early_finish: Dict, task_duration: Dict,
+                            graph: Optional[CompiledGraph] = None) -> Tuple[Dict, Dict]:
     """
     Выполнить backward pass для расчёта поздних дат начала и окончания
+    Задачи обходятся в обратном топологическом порядке с учётом типов связей и лагов.
     Возвращает: late_start, late_finish словари
     """
+    if graph is None:
+        graph = CompiledGraph(project)
+
     late_start = {}
     late_finish = {}
+    task_ids = graph.task_ids
     
     # Крайний срок проекта (условно, без буфера)
     project_deadline = max(early_finish.values())
     
-    # Инициализировать поздние даты окончания для конечных задач
-    for task_id in project.proj_tasks.keys():
-        succs = get_successors(project, task_id)
-        if not succs:
-            late_finish[task_id] = project_deadline
-    
-    # обрабатываем задачи в порядке убывания early_finish
-    tasks_sorted = sorted(project.proj_tasks.items(), 
-                         key=lambda x: early_finish[x[0]], 
-                         reverse=True)
-    
-    for task_id, task in tasks_sorted:
-        succs = get_successors(project, task_id)
+    indptr = graph.succ_indptr
+    for i in graph.order[::-1]:
+        task_id = task_ids[i]
+        duration = timedelta(days=task_duration[task_id])
         
-        if succs:
-            # Найти минимальный поздний старт среди последователей
-            min_late_start = min(late_start.get(s, project_deadline) for s in succs)
-            late_finish[task_id] = min_late_start
+        # Конечные задачи заканчиваются к крайнему сроку
+        finish = project_deadline
+        for k in range(indptr[i], indptr[i + 1]):
+            succ_id = task_ids[graph.succ_indices[k]]
+            # FF/SF ограничены окончанием последователя, FS/SS — его началом
+            anchor = late_finish[succ_id] if graph.succ_to_finish[k] else late_start[succ_id]
+            bound = anchor - timedelta(days=float(graph.succ_lag[k]))
+            if not graph.succ_from_finish[k]:
+                # SS/SF ограничивают начало задачи
+                bound += duration
+            finish = min(finish, bound)
+        late_finish[task_id] = finish
         
         # Рассчитать поздний старт
-        late_start[task_id] = late_finish[task_id] - timedelta(days=task_duration[task_id])
+        late_start[task_id] = late_finish[task_id] - duration
     
     return late_start, late_finish
 
-def random_triangular(low: float, most_likely: float, high: float) -> float:
+def random_triangular(low: float, most_likely: float, high: float,
+                      rng: Optional[np.random.Generator] = None) -> float:
     """
     Генерация случайного числа из треугольного распределения
     Используется для симуляции PERT
+    rng — numpy.random.Generator; без него используется глобальный модуль random
+    """
+    if high == low:
+        return low
+    u = rng.random() if rng is not None else random.random()
+    return triangular_from_uniform(low, most_likely, high, u)
+
+def triangular_from_uniform(low: float, most_likely: float, high: float, u: float) -> float:
+    """
+    Обратная функция треугольного распределения: u из [0, 1] -> длительность.
+    Позволяет подавать в симуляцию стратифицированные u (LHS, антитетика, Соболь).
     """
     if high == low:
         return low
@@ -230,8 +235,6 @@ def random_triangular(low: float, most_likely: float, high: float) -> float:
             f"most_likely ({most_likely}) должен быть между low ({low}) и high ({high})"
         )
     
-    u = random.random()
-    
     if u == 0:
         return low
     elif u == 1:
@@ -245,53 +248,90 @@ def random_triangular(low: float, most_likely: float, high: float) -> float:
     else:
         return high - ((1 - u) * (high - low) * (high - most_likely)) ** 0.5
 
-def forward_pass_with_random_duration(project, random_duration: Dict) -> Dict:
+def forward_pass_with_random_duration(project, random_duration: Dict,
+                                      graph: Optional[CompiledGraph] = None) -> Dict:
     """
     Выполнить forward pass со стохастическими длительностями задач
     Возвращает: early_finish словарь для одной симуляции
     """
-    _, early_finish = _forward_pass(project, random_duration)
+    _, early_finish = _forward_pass(project, random_duration, graph)
     return early_finish
 
-def build_task_slowdown_cache(project) -> Dict:
+def build_task_slowdown_cache(project, team: bool = False) -> Dict:
     """
-    Предрассчитать slowdown для каждой задачи по основному исполнителю.
+    Предрассчитать slowdown для каждой задачи по основному исполнителю
+    (team=True — по всей команде task_assigned_to, см. skills.team_slowdown).
     Внутри Монте-Карло этот коэффициент не меняется, поэтому его не нужно
-    пересчитывать на каждой симуляции.
+    пересчитывать на каждой симуляции. Считаются только назначенные пары;
+    для ProjectArrays — векторно (SkillMatrix.assigned_slowdowns).
     """
-    task_slowdowns = {}
+    if isinstance(project, ProjectArrays):
+        matrix = SkillMatrix(project)
+        return dict(zip(matrix.task_ids, matrix.assigned_slowdowns(project, team).tolist()))
 
+    cache = {}
     for task_id, task in project.proj_tasks.items():
-        slowdown = 1.0
-        if task.task_assigned_to:
-            primary_emp_id = task.task_assigned_to[0]
-            employee = project.proj_employees.get(primary_emp_id)
-            if employee:
-                slowdown = calculate_slowdown_factor(employee, task)
-        task_slowdowns[task_id] = slowdown
-
-    return task_slowdowns
+        emp_ids = task.task_assigned_to if team else task.task_assigned_to[:1]
+        slowdowns = [calculate_slowdown_factor(project.proj_employees[emp_id], task)
+                     for emp_id in dict.fromkeys(emp_ids) if emp_id in project.proj_employees]
+        cache[task_id] = team_slowdown(slowdowns)
+    return cache
 
 def monte_carlo_simulation(
     project,
     num_simulations: int = 1000,
-    task_slowdowns: Dict = None
+    task_slowdowns: Dict = None,
+    graph: Optional[CompiledGraph] = None,
+    sampling: str = "random",
+    rng=None,
+    backend: Optional[str] = None
 ) -> List[float]:
     """
     Симуляция Монте-Карло для оценки рисков проекта
-    Возвращает: Список длительностей проекта из всех симуляций
+    Граф компилируется один раз и переиспользуется во всех итерациях.
+    sampling — план сэмплирования из sampling.SAMPLING_METHODS.
+    rng — numpy.random.Generator, из которого берутся все равномерные числа; при
+    одном и том же rng оба backend и engine.monte_carlo_batch дают одинаковый результат.
+    Без rng генератор инициализируется от модуля random (random.seed воспроизводим).
+    backend — "numba" (скомпилированное ядро fast.py) или "python" (поштучный цикл);
+    по умолчанию numba, если она установлена.
+    Возвращает: Список длительностей проекта из всех симуляций (в днях, без округления)
     """
+    from ltrroe.core import fast
+
+    if backend is None:
+        backend = "numba" if fast.HAVE_NUMBA else "python"
+    if backend not in ("numba", "python"):
+        raise ValueError(f"Неизвестный backend Монте-Карло: {backend}. Допустимые: numba, python")
+
     project_durations = []
     if task_slowdowns is None:
         task_slowdowns = build_task_slowdown_cache(project)
+    if graph is None:
+        graph = CompiledGraph(project)
+    
+    if backend == "numba":
+        if rng is None:
+            rng = np.random.default_rng(random.getrandbits(64))
+        return fast.monte_carlo_fast(project, num_simulations, task_slowdowns, rng, graph,
+                                     sampling).tolist()
+    
+    design = None
+    if sampling != "random" or rng is not None:
+        if rng is None:
+            rng = np.random.default_rng(random.getrandbits(64))
+        design = uniform_design(sampling, num_simulations, len(project.proj_tasks), rng)
     
     for sim in range(num_simulations):
         random_durations = {}
         
-        for task_id, task in project.proj_tasks.items():
+        for j, (task_id, task) in enumerate(project.proj_tasks.items()):
             # Генерируем базовую случайную длительность
             low, most_likely, high = task.task_duration_dist
-            base_random = random_triangular(low, most_likely, high)
+            if design is None:
+                base_random = random_triangular(low, most_likely, high)
+            else:
+                base_random = triangular_from_uniform(low, most_likely, high, design[sim, j])
             
             # Корректировка с учётом производительности исполнителя
             adjusted_duration = base_random * task_slowdowns.get(task_id, 1.0)
@@ -299,11 +339,11 @@ def monte_carlo_simulation(
             random_durations[task_id] = adjusted_duration
         
         # Выполняем forward pass со случайными длительностями
-        early_finish = forward_pass_with_random_duration(project, random_durations)
+        early_finish = forward_pass_with_random_duration(project, random_durations, graph)
         
         if early_finish:
             max_finish_date = max(early_finish.values())
-            project_duration = (max_finish_date - project.proj_start_date).days
+            project_duration = (max_finish_date - project.proj_start_date).total_seconds() / 86400
             project_durations.append(project_duration)
     
     return project_durations
@@ -0,0 +1,212 @@
+"""
+Поиск назначений LTRROE: имитация отжига по основным исполнителям задач
+Оценка назначения — перцентиль длительности проекта (по умолчанию P90) плюс
+cost_weight * ожидаемая стоимость работ. Все кандидаты считаются на общих
+случайных числах одного WhatIfSimulator, поэтому разница оценок — разница
+назначений, а не шум сэмплирования.
+
+Шаг поиска выбирает задачу и оценивает сразу всех её кандидатов одним проходом
+по конусу последователей (WhatIfSimulator.task_options), замедления пар берутся
+из SkillMatrix. Новый исполнитель выбирается с вероятностью exp(-(оценка - лучшая) / T)
+(heat bath), температура убывает геометрически; принятый шаг переносится в базу
+симулятора (apply) — пересчитывается только конус задачи.
+
+Ожидаемая стоимость задачи — среднее треугольного распределения * замедление *
+hours_per_day * emp_cost_per_hour исполнителя.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ltrroe.core.engine import RandomSource
+from ltrroe.core.graph import CompiledGraph
+from ltrroe.core.resources import DEFAULT_HOURS_PER_DAY
+from ltrroe.core.skills import SkillMatrix
+from ltrroe.core.stats import expected_work_cost, hourly_rates, mean_task_days, order_statistic
+from ltrroe.core.whatif import WhatIfSimulator
+
+# Начальная температура — доля оценки исходного назначения
+INITIAL_TEMPERATURE = 0.02
+# Температура в конце поиска — доля начальной
+FINAL_TEMPERATURE = 1e-3
+
+
+class AssignmentOptimizer:
+    """
+    Поиск основных исполнителей (task_assigned_to[0]) на общих случайных числах.
+    candidates — task_id -> список допустимых сотрудников; по умолчанию все сотрудники
+    для каждой задачи, у которой уже есть исполнитель (задачи без исполнителя не трогаются).
+    Проект не изменяется; результат — словарь task_id -> новый список исполнителей.
+    """
+
+    def __init__(self, project, num_simulations: int = 1000,
+                 rng: RandomSource = None,
+                 graph: Optional[CompiledGraph] = None,
+                 sampling: str = "random",
+                 percentile: float = 0.9,
+                 cost_weight: float = 0.0,
+                 candidates: Optional[Dict] = None,
+                 hours_per_day: float = DEFAULT_HOURS_PER_DAY):
+        if not 0.0 < percentile < 1.0:
+            raise ValueError(f"percentile должен быть в (0, 1): {percentile}")
+        if cost_weight < 0:
+            raise ValueError(f"cost_weight должен быть неотрицательным: {cost_weight}")
+        if graph is None:
+            graph = CompiledGraph(project)
+        self.project = project
+        self.graph = graph
+        self.percentile = percentile
+        self.cost_weight = cost_weight
+        self.skills = SkillMatrix(project, graph.task_ids)
+        employee_index = self.skills.employee_index
+
+        if candidates is None:
+            candidates = {task_id: self.skills.employee_ids for task_id in graph.task_ids
+                          if project.proj_tasks[task_id].task_assigned_to}
+        # Кандидаты по индексу задачи графа: массивы индексов сотрудников
+        self._candidates: Dict[int, np.ndarray] = {}
+        for task_id, emp_ids in candidates.items():
+            missing = [emp_id for emp_id in emp_ids if emp_id not in employee_index]
+            if missing:
+                raise ValueError(f"Сотрудники не найдены в проекте: {missing}")
+            if emp_ids:
+                self._candidates[graph.index[task_id]] = np.array(
+                    [employee_index[emp_id] for emp_id in dict.fromkeys(emp_ids)], dtype=np.intp)
+
+        # Текущий основной исполнитель (-1 — нет) и ожидаемая стоимость пар
+        self.assignment = np.full(graph.n_tasks, -1, dtype=np.intp)
+        for j, task_id in enumerate(graph.task_ids):
+            assigned = project.proj_tasks[task_id].task_assigned_to
+            if assigned and assigned[0] in employee_index:
+                self.assignment[j] = employee_index[assigned[0]]
+        mean_days = mean_task_days(project, graph.task_ids)
+        hourly = hourly_rates(project, self.skills.employee_ids)
+        self._pair_cost = expected_work_cost(mean_days[:, None], self.skills.slowdown,
+                                             hourly[None, :], hours_per_day)
+
+        slowdowns = self.skills.primary_slowdowns(project)
+        self.simulator = WhatIfSimulator(project, num_simulations, rng, graph, sampling,
+                                         dict(zip(graph.task_ids, slowdowns.tolist())))
+        # Число оценённых кандидатов за всё время поиска
+        self.evaluated = 0
+
+    def _task_cost(self, j: int, e: np.ndarray) -> np.ndarray:
+        return np.where(e >= 0, self._pair_cost[j, np.maximum(e, 0)], 0.0)
+
+    @property
+    def cost(self) -> float:
+        """Ожидаемая стоимость работ текущего назначения."""
+        staffed = self.assignment >= 0
+        return float(self._pair_cost[np.flatnonzero(staffed), self.assignment[staffed]].sum())
+
+    @property
+    def quantile(self) -> float:
+        """Перцентиль длительности проекта текущего назначения."""
+        return float(order_statistic(self.simulator.baseline, self.percentile))
+
+    @property
+    def score(self) -> float:
+        return self.quantile + self.cost_weight * self.cost
+
+    def evaluate_task(self, task_id) -> Dict[str, np.ndarray]:
+        """
+        Оценки всех кандидатов задачи при неизменных остальных назначениях.
+        Возвращает: {"employee_ids", "quantile", "cost", "score"} — массивы по кандидатам
+        """
+        j = self.graph.index[task_id]
+        emp = self._candidates.get(j)
+        if emp is None:
+            raise ValueError(f"Для задачи {task_id} нет кандидатов в исполнители")
+        return self._evaluate(j, emp)
+
+    def _evaluate(self, j: int, emp: np.ndarray) -> Dict[str, np.ndarray]:
+        quantile = order_statistic(
+            self.simulator.task_options(self.graph.task_ids[j], self.skills.slowdown[j, emp]),
+            self.percentile)
+        cost = self.cost - self._task_cost(j, self.assignment[j]) + self._pair_cost[j, emp]
+        self.evaluated += len(emp)
+        return {
+            "employee_ids": [self.skills.employee_ids[e] for e in emp.tolist()],
+            "quantile": quantile,
+            "cost": cost,
+            "score": quantile + self.cost_weight * cost,
+        }
+
+    def move(self, task_id, emp_id) -> float:
+        """Назначить основного исполнителя задачи и перенести сценарий в базу. Возвращает оценку."""
+        j = self.graph.index[task_id]
+        e = self.skills.employee_index[emp_id]
+        self.assignment[j] = e
+        self.simulator.apply(slowdowns={task_id: self.skills.slowdown[j, e]})
+        return self.score
+
+    def optimize(self, iterations: int = 1000,
+                 rng: Optional[np.random.Generator] = None,
+                 temperature: Optional[float] = None,
+                 final_temperature: Optional[float] = None) -> Dict:
+        """
+        Имитация отжига: iterations шагов, каждый оценивает всех кандидатов одной задачи.
+        temperature — начальная температура в единицах оценки (по умолчанию
+        INITIAL_TEMPERATURE от исходной оценки). По окончании база симулятора —
+        лучшее найденное назначение.
+        Возвращает: {"assignments", "score", "quantile", "cost", "initial_score", "evaluated"}
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        tasks = np.fromiter(self._candidates, dtype=np.intp, count=len(self._candidates))
+        initial_score = self.score
+        if temperature is None:
+            temperature = INITIAL_TEMPERATURE * max(initial_score, 1e-12)
+        if final_temperature is None:
+            final_temperature = FINAL_TEMPERATURE * temperature
+        cooling = (final_temperature / temperature) ** (1.0 / max(iterations - 1, 1)) if temperature > 0 else 0.0
+
+        best_score, best = initial_score, self.assignment.copy()
+        if len(tasks):
+            for _ in range(iterations):
+                j = int(tasks[rng.integers(len(tasks))])
+                emp = self._candidates[j]
+                scores = self._evaluate(j, emp)["score"]
+                if temperature > 0:
+                    weights = np.exp(-(scores - scores.min()) / temperature)
+                    choice = int(rng.choice(len(emp), p=weights / weights.sum()))
+                else:
+                    choice = int(np.argmin(scores))
+                if emp[choice] != self.assignment[j]:
+                    self.move(self.graph.task_ids[j], self.skills.employee_ids[emp[choice]])
+                    if scores[choice] < best_score:
+                        best_score, best = float(scores[choice]), self.assignment.copy()
+                temperature *= cooling
+
+        # База симулятора — лучшее назначение
+        changed = np.flatnonzero(self.assignment != best)
+        for j in changed.tolist():
+            self.assignment[j] = best[j]
+        self.simulator.apply(slowdowns={self.graph.task_ids[j]: self.skills.slowdown[j, best[j]]
+                                        for j in changed.tolist()})
+        return {
+            "assignments": self.assignments(),
+            "score": self.score,
+            "quantile": self.quantile,
+            "cost": self.cost,
+            "initial_score": initial_score,
+            "evaluated": self.evaluated,
+        }
+
+    def assignments(self) -> Dict:
+        """
+        task_id -> новый список исполнителей для задач, у которых основной исполнитель
+        отличается от проекта; соисполнители сохраняются.
+        """
+        result = {}
+        for j, task_id in enumerate(self.graph.task_ids):
+            e = self.assignment[j]
+            if e < 0:
+                continue
+            emp_id = self.skills.employee_ids[e]
+            assigned: List = self.project.proj_tasks[task_id].task_assigned_to
+            if assigned and assigned[0] == emp_id:
+                continue
+            result[task_id] = [emp_id] + [x for x in assigned[1:] if x != emp_id]
+        return result
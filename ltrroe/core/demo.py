@@ -2,8 +2,11 @@
 LTRROE Полная демонстрация системы
 Исследовательский проект в области стохастического моделирования проектных рисков
 """
+import numpy as np
+
 from ltrroe.core.test_data import create_test_project
-from ltrroe.core.algorithms import calculate_schedule, monte_carlo_simulation, calculate_backward_pass
+from ltrroe.core.graph import CompiledGraph
+from ltrroe.core.engine import schedule_days, float_analysis, monte_carlo_sensitivity
 from ltrroe.core.visualisation import  plot_gantt_chart, plot_monte_carlo_histogram, plot_employee_load_heatmap, plot_skills_radar_chart
 
 def demonstrate_research_project():
@@ -20,38 +23,45 @@ def demonstrate_research_project():
     
     # 2. Детерминистический расчёт расписания (CPM)
     print("\n2. ДЕТЕРМИНИСТИЧЕСКИЙ АНАЛИЗ РАСПИСАНИЯ (CPM)")
-    early_start, early_finish, task_duration = calculate_schedule(project)
-    late_start, late_finish = calculate_backward_pass(project, early_finish, task_duration)
+    graph = CompiledGraph(project)
+    early_start, early_finish, task_duration = schedule_days(project, graph)
+    total_float, free_float, critical = float_analysis(graph, early_start, early_finish, task_duration)
     
-    critical_tasks = []
-    for task_id in early_start:
-        slack = (late_start[task_id] - early_start[task_id]).days
-        if slack == 0:
-            critical_tasks.append(task_id)
+    # Нулевой резерв времени (с точностью до секунды) -> задача на критическом пути
+    critical_tasks = [graph.task_ids[i] for i in np.flatnonzero(critical)]
     
-    project_end = max(early_finish.values())
-    deterministic_duration = (project_end - project.proj_start_date).days
-    print(f"   • Длительность (CPM): {deterministic_duration} дней")
+    deterministic_duration = float(early_finish.max())
+    print(f"   • Длительность (CPM): {deterministic_duration:.1f} дней")
     print(f"   • Критических задач: {len(critical_tasks)}")
     print(f"   • Задачи с резервом времени: {len(project.proj_tasks) - len(critical_tasks)}")
+    print(f"   • Суммарный резерв: до {float(total_float.max()):.1f} дней, "
+          f"свободный: до {float(free_float.max()):.1f} дней")
     
     # 3. Стохастический анализ рисков Монте-Карло
     print("\n3. СТОХАСТИЧЕСКАЯ ОЦЕНКА РИСКОВ (МОНТЕ-КАРЛО, N=1000)")
-    mc_durations = monte_carlo_simulation(project, num_simulations=1000)
+    mc_durations, sensitivity = monte_carlo_sensitivity(project, num_simulations=1000, graph=graph)
     
-    mc_mean = sum(mc_durations) / len(mc_durations)
-    mc_min = min(mc_durations)
-    mc_max = max(mc_durations)
+    mc_mean = float(mc_durations.mean())
+    mc_min = float(mc_durations.min())
+    mc_max = float(mc_durations.max())
     
     print(f"   • Средняя длительность (МК): {mc_mean:.1f} дней")
     print(f"   • 95% интервал: [{mc_min:.1f}, {mc_max:.1f}] дней")
     print(f"   • Отклонение CPM от МК: {mc_mean - deterministic_duration:.1f} дней ({(mc_mean/deterministic_duration-1)*100:.1f}%)")
     
     deadline = 35
-    success = sum(1 for d in mc_durations if d <= deadline)
+    success = int((mc_durations <= deadline).sum())
     risk_percentage = 100 - (success/len(mc_durations)*100)
     print(f"   • Вероятность превышения {deadline} дней: {risk_percentage:.1f}%")
     
+    # Задачи, сильнее всего влияющие на срок (индекс cruciality)
+    indices = sensitivity.summary(graph.task_ids)
+    drivers = sorted(indices.items(), key=lambda item: item[1]["cruciality"], reverse=True)[:3]
+    print("   • Ключевые задачи риска (критичность / Спирмен):")
+    for task_id, values in drivers:
+        print(f"     - {project.proj_tasks[task_id].task_name}: "
+              f"{values['criticality']:.0%} / {values['spearman']:.2f}")
+    
     # 4. Анализ использования ресурсов
     print("\n4. АНАЛИЗ РЕСУРСОВ")
     employees = list(project.proj_employees.values())
@@ -74,7 +84,7 @@ def demonstrate_research_project():
     
     # 6. Генерация отчётов визуализации
     print("\n6. ГЕНЕРАЦИЯ ВИЗУАЛИЗАЦИЙ")
-    gantt_result = plot_gantt_chart(project, early_start, early_finish, late_start)
+    gantt_result = plot_gantt_chart(project, early_start, early_finish, early_start + total_float)
     mc_result = plot_monte_carlo_histogram(mc_durations, deadline=deadline)
     heatmap_result = plot_employee_load_heatmap(project, early_start, early_finish)
     
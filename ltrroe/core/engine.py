@@ -0,0 +1,450 @@
+"""
+Векторизованный движок Монте-Карло LTRROE
+Сэмплирует матрицу длительностей (n_simulations, n_tasks) средствами NumPy и
+выполняет forward pass по уровням топологической глубины CompiledGraph.
+
+Все проходы CPM здесь работают в числовом режиме: время — float64 дни от старта
+проекта, результаты — массивы по индексу задачи графа. Перевод в календарные даты
+(days_to_dates) выполняется только на границах: в визуализации и демо.
+
+Эталонная (поштучная) реализация остаётся в algorithms.monte_carlo_simulation
+и используется в тестах эквивалентности.
+"""
+
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ltrroe.core.algorithms import build_task_slowdown_cache, calculate_task_duration
+from ltrroe.core.graph import CompiledGraph
+from ltrroe.core.objects import ProjectArrays
+from ltrroe.core.quantiles import StreamingQuantiles
+from ltrroe.core.sampling import batch_generator, uniform_design
+from ltrroe.core.sensitivity import TaskSensitivity
+from ltrroe.core.skills import SkillMatrix
+from ltrroe.core.stats import order_statistic_index
+
+# Generator (пакеты одним потоком) или SeedSequence (свой дочерний поток на пакет)
+RandomSource = Union[np.random.Generator, np.random.SeedSequence, None]
+
+# Допуск нулевого резерва: одна секунда в днях
+CRITICAL_TOLERANCE = 1.0 / 86400
+
+
+def triangular_inverse_cdf(low: np.ndarray, most_likely: np.ndarray,
+                           high: np.ndarray, u: np.ndarray) -> np.ndarray:
+    """
+    Обратная функция треугольного распределения, векторизованная по NumPy.
+    low/most_likely/high — векторы длины n_tasks, u — матрица (n_simulations, n_tasks)
+    """
+    low = np.asarray(low, dtype=np.float64)
+    most_likely = np.asarray(most_likely, dtype=np.float64)
+    high = np.asarray(high, dtype=np.float64)
+
+    if np.any(high < low):
+        raise ValueError("Некорректное треугольное распределение: high < low")
+    if np.any((most_likely < low) | (most_likely > high)):
+        raise ValueError(
+            "Некорректное треугольное распределение: most_likely должен быть между low и high"
+        )
+
+    width = high - low
+    safe_width = np.where(width > 0, width, 1.0)
+    c = (most_likely - low) / safe_width
+
+    left = low + np.sqrt(u * width * (most_likely - low))
+    right = high - np.sqrt((1.0 - u) * width * (high - most_likely))
+    samples = np.where(u < c, left, right)
+    # Вырожденное распределение: всегда low
+    return np.where(width > 0, samples, low)
+
+
+def sample_durations(project, task_ids: List, num_simulations: int,
+                     rng: np.random.Generator,
+                     task_slowdowns: Optional[Dict] = None,
+                     sampling: str = "random",
+                     human_factors=None) -> np.ndarray:
+    """
+    Сгенерировать матрицу (num_simulations, n_tasks) случайных длительностей
+    с учётом коэффициентов замедления исполнителей.
+    sampling — план равномерных чисел (random, lhs, antithetic, sobol)
+    human_factors — human_factors.HumanFactorModel: усталость и переделки после
+    ошибок; его случайные числа берутся из rng после плана длительностей
+    """
+    if task_slowdowns is None:
+        task_slowdowns = build_task_slowdown_cache(project)
+
+    dist = task_duration_matrix(project, task_ids)
+    slowdown = np.array([task_slowdowns.get(task_id, 1.0) for task_id in task_ids],
+                        dtype=np.float64)
+
+    u = uniform_design(sampling, num_simulations, len(task_ids), rng)
+    base = triangular_inverse_cdf(dist[:, 0], dist[:, 1], dist[:, 2], u)
+    if human_factors is not None:
+        return human_factors.apply(base * slowdown, rng)
+    return base * slowdown
+
+
+def _n_tasks(project) -> int:
+    return project.n_tasks if isinstance(project, ProjectArrays) else len(project.proj_tasks)
+
+
+def task_duration_matrix(project, task_ids: List) -> np.ndarray:
+    """Треугольные распределения задач task_ids: (n_tasks, 3) — low, most_likely, high."""
+    if isinstance(project, ProjectArrays):
+        return project.task_duration_dist[project.task_rows(task_ids)]
+    return np.array(
+        [project.proj_tasks[task_id].task_duration_dist for task_id in task_ids],
+        dtype=np.float64,
+    ).reshape(len(task_ids), 3)
+
+
+def task_durations_days(project, graph: CompiledGraph) -> np.ndarray:
+    """
+    Детерминированные длительности задач (PERT с учётом исполнителя)
+    Возвращает: float64 массив по индексу задачи графа
+    """
+    if isinstance(project, ProjectArrays):
+        # Те же операции, что в calculate_task_duration, по всем задачам сразу
+        dist = task_duration_matrix(project, graph.task_ids)
+        base = (dist[:, 0] + dist[:, 1] * 4 + dist[:, 2]) / 6
+        return base * SkillMatrix(project, graph.task_ids).assigned_slowdowns(project)
+    return np.array(
+        [calculate_task_duration(project.proj_tasks[task_id], project) for task_id in graph.task_ids],
+        dtype=np.float64,
+    )
+
+
+def forward_pass_days(graph: CompiledGraph, durations: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Числовой level-synchronous forward pass в днях от старта проекта.
+    Задачи одного уровня топологической глубины не зависят друг от друга, поэтому
+    уровень считается одной операцией np.maximum.reduceat по входящим рёбрам для
+    всех симуляций сразу: число Python-итераций равно глубине графа, а не числу задач.
+    Учитывает типы связей FS/SS/FF/SF и лаги; задача не начинается раньше старта проекта.
+    durations — вектор (n_tasks,) или матрица (n_simulations, n_tasks).
+    Возвращает: early_start, early_finish той же формы
+    """
+    durations = np.asarray(durations, dtype=np.float64)
+    # Задачи — по первой оси: строки уровня берутся из непрерывной памяти
+    task_major = np.ascontiguousarray(np.moveaxis(durations, -1, 0))
+    flag_shape = (-1,) + (1,) * (durations.ndim - 1)
+    early_start = np.zeros_like(task_major)
+    # Уровень 0 — задачи без предшественников, начинаются со старта проекта
+    early_finish = task_major.copy()
+    fs_only = graph.finish_to_start_only
+    for tasks, edges, starts in graph.levels:
+        src = graph.edge_from[edges]
+        if fs_only:
+            bound = early_finish[src]
+        else:
+            # Опорная точка предшественника + лаг; для FF/SF ограничено окончание задачи
+            bound = np.where(graph.edge_from_finish[edges].reshape(flag_shape),
+                             early_finish[src], early_start[src])
+            bound += graph.edge_lag[edges].reshape(flag_shape)
+            bound -= (graph.edge_to_finish[edges].reshape(flag_shape)
+                      * task_major[graph.edge_to[edges]])
+        start = np.maximum.reduceat(bound, starts, axis=0)
+        if not fs_only:
+            np.maximum(start, 0.0, out=start)
+        early_start[tasks] = start
+        early_finish[tasks] = start + task_major[tasks]
+    return np.moveaxis(early_start, 0, -1), np.moveaxis(early_finish, 0, -1)
+
+
+def _forward_pass_by_task(graph: CompiledGraph, durations: np.ndarray
+                          ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Forward pass по одной задаче за итерацию в топологическом порядке.
+    Оставлен как эталон для тестов и базовая линия бенчмарка forward pass.
+    """
+    durations = np.asarray(durations, dtype=np.float64)
+    early_start = np.zeros_like(durations)
+    early_finish = np.empty_like(durations)
+    indptr = graph.pred_indptr
+    fs_only = graph.finish_to_start_only
+    for j in graph.order:
+        lo, hi = indptr[j], indptr[j + 1]
+        if hi > lo:
+            preds = graph.pred_indices[lo:hi]
+            if fs_only:
+                early_start[..., j] = early_finish[..., preds].max(axis=-1)
+            else:
+                bound = np.where(graph.pred_from_finish[lo:hi],
+                                 early_finish[..., preds], early_start[..., preds])
+                bound = bound + graph.pred_lag[lo:hi]
+                bound = bound - graph.pred_to_finish[lo:hi] * durations[..., j, None]
+                early_start[..., j] = np.maximum(bound.max(axis=-1), 0.0)
+        early_finish[..., j] = early_start[..., j] + durations[..., j]
+    return early_start, early_finish
+
+
+def forward_pass_matrix(graph: CompiledGraph, durations: np.ndarray) -> np.ndarray:
+    """
+    Forward pass для всех симуляций сразу: по столбцам в топологическом порядке.
+    durations — матрица (n_simulations, n_tasks) в днях от старта проекта.
+    Возвращает: матрицу ранних окончаний той же формы
+    """
+    return forward_pass_days(graph, durations)[1]
+
+
+def _deadline(early_finish: np.ndarray, project_end: Optional[np.ndarray]) -> np.ndarray:
+    """Крайний срок по каждой задаче: по умолчанию максимальное раннее окончание."""
+    early_finish = np.asarray(early_finish)
+    if project_end is None:
+        project_end = early_finish.max(axis=-1)[..., None]
+    return np.broadcast_to(project_end, early_finish.shape)
+
+
+def backward_pass_days(graph: CompiledGraph, early_finish: np.ndarray,
+                       durations: np.ndarray, project_end: Optional[np.ndarray] = None
+                       ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Числовой backward pass в обратном топологическом порядке.
+    Крайний срок — максимальное раннее окончание (по каждой симуляции) или
+    project_end той же формы, что durations (свой срок у каждого проекта пакета);
+    типы связей и лаги учитываются так же, как в forward_pass_days.
+    Возвращает: late_start, late_finish той же формы, что durations
+    """
+    durations = np.asarray(durations, dtype=np.float64)
+    project_end = _deadline(early_finish, project_end)
+    late_start = np.empty_like(durations)
+    late_finish = np.empty_like(durations)
+    indptr = graph.succ_indptr
+    fs_only = graph.finish_to_start_only
+    for i in graph.order[::-1]:
+        lo, hi = indptr[i], indptr[i + 1]
+        if hi == lo:
+            late_finish[..., i] = project_end[..., i]
+        elif fs_only:
+            late_finish[..., i] = late_start[..., graph.succ_indices[lo:hi]].min(axis=-1)
+        else:
+            succs = graph.succ_indices[lo:hi]
+            # Опорная точка последователя - лаг; для SS/SF переводим ограничение начала i в окончание
+            bound = np.where(graph.succ_to_finish[lo:hi],
+                             late_finish[..., succs], late_start[..., succs])
+            bound = bound - graph.succ_lag[lo:hi]
+            bound = bound + (~graph.succ_from_finish[lo:hi]) * durations[..., i, None]
+            late_finish[..., i] = np.minimum(bound.min(axis=-1), project_end[..., i])
+        late_start[..., i] = late_finish[..., i] - durations[..., i]
+    return late_start, late_finish
+
+
+def float_analysis(graph: CompiledGraph, early_start: np.ndarray, early_finish: np.ndarray,
+                   durations: np.ndarray, tol: float = CRITICAL_TOLERANCE,
+                   project_end: Optional[np.ndarray] = None
+                   ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Резервы времени за O(n + m): backward pass по обратному топологическому порядку
+    и свободный резерв по рёбрам. Работает для вектора или матрицы симуляций.
+    Свободный резерв — насколько задача может сдвинуться, не задерживая
+    ни одного последователя и окончание проекта (project_end — как в backward_pass_days).
+    Возвращает: total_float, free_float, critical (bool-маска total_float < tol)
+    """
+    durations = np.asarray(durations, dtype=np.float64)
+    project_end = _deadline(early_finish, project_end)
+    late_start, _ = backward_pass_days(graph, early_finish, durations, project_end)
+    total_float = late_start - early_start
+
+    free_float = project_end - early_finish
+    if graph.n_edges:
+        src, dst = graph.edge_from, graph.edge_to
+        available = np.where(graph.edge_to_finish, early_finish[..., dst], early_start[..., dst])
+        used = np.where(graph.edge_from_finish, early_finish[..., src], early_start[..., src])
+        edge_slack = available - graph.edge_lag - used
+        if free_float.ndim == 1:
+            np.minimum.at(free_float, src, edge_slack)
+        else:
+            np.minimum.at(free_float, (slice(None), src), edge_slack)
+    return total_float, free_float, total_float < tol
+
+
+def schedule_days(project, graph: Optional[CompiledGraph] = None
+                  ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Детерминированный CPM в числовом режиме
+    Возвращает: early_start, early_finish, task_duration — float64 массивы по индексу задачи
+    """
+    if graph is None:
+        graph = CompiledGraph(project)
+    durations = task_durations_days(project, graph)
+    early_start, early_finish = forward_pass_days(graph, durations)
+    return early_start, early_finish, durations
+
+
+def days_to_dates(project, days: np.ndarray, task_ids: Optional[List] = None) -> Dict:
+    """
+    Перевести дни от старта проекта в календарные даты (task_id -> datetime).
+    По умолчанию индексы соответствуют порядку задач проекта, как в CompiledGraph.
+    """
+    if task_ids is None:
+        task_ids = project.task_ids if isinstance(project, ProjectArrays) else list(project.proj_tasks.keys())
+    return {
+        task_id: project.proj_start_date + timedelta(days=float(day))
+        for task_id, day in zip(task_ids, days)
+    }
+
+
+def monte_carlo_batch(project, num_simulations: int = 1000,
+                      task_slowdowns: Optional[Dict] = None,
+                      rng: RandomSource = None,
+                      graph: Optional[CompiledGraph] = None,
+                      sampling: str = "random",
+                      sensitivity: Optional[TaskSensitivity] = None,
+                      batch_size: Optional[int] = None,
+                      human_factors=None) -> np.ndarray:
+    """
+    Пакетная симуляция Монте-Карло
+    sampling — план сэмплирования (random, lhs, antithetic, sobol)
+    sensitivity — накопитель индексов чувствительности задач: при передаче на каждом
+    пакете дополнительно считаются резервы, и в него добавляются длительности задач,
+    проекта и маска критичности. batch_size ограничивает размер матрицы в памяти
+    (по умолчанию один пакет; для lhs/sobol пакеты стратифицируются независимо).
+    rng — Generator или SeedSequence; во втором случае пакет k берёт поток
+    sampling.batch_generator(rng, k) и может быть пересчитан отдельно.
+    human_factors — модель ошибок и усталости (см. sample_durations).
+    Возвращает: ndarray длительностей проекта (в днях, без округления)
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if not _n_tasks(project) or num_simulations <= 0:
+        return np.empty(0, dtype=np.float64)
+    if graph is None:
+        graph = CompiledGraph(project)
+    if task_slowdowns is None:
+        task_slowdowns = build_task_slowdown_cache(project)
+    if batch_size is None:
+        batch_size = num_simulations
+
+    batches = []
+    done = 0
+    while done < num_simulations:
+        size = min(batch_size, num_simulations - done)
+        durations = sample_durations(project, graph.task_ids, size,
+                                     batch_generator(rng, len(batches)), task_slowdowns, sampling,
+                                     human_factors)
+        if sensitivity is None:
+            batches.append(forward_pass_matrix(graph, durations).max(axis=1))
+        else:
+            early_start, early_finish = forward_pass_days(graph, durations)
+            _, _, critical = float_analysis(graph, early_start, early_finish, durations)
+            project_durations = early_finish.max(axis=1)
+            sensitivity.update(durations, project_durations, critical)
+            batches.append(project_durations)
+        done += size
+    return np.concatenate(batches)
+
+
+def monte_carlo_sensitivity(project, num_simulations: int = 1000, batch_size: int = 10000,
+                            task_slowdowns: Optional[Dict] = None,
+                            rng: RandomSource = None,
+                            graph: Optional[CompiledGraph] = None,
+                            sampling: str = "random",
+                            human_factors=None) -> Tuple[np.ndarray, TaskSensitivity]:
+    """
+    Монте-Карло с индексами чувствительности задач за один прогон
+    Возвращает: (длительности проекта, TaskSensitivity по индексу задачи графа)
+    """
+    if graph is None:
+        graph = CompiledGraph(project)
+    sensitivity = TaskSensitivity(graph.n_tasks)
+    durations = monte_carlo_batch(project, num_simulations, task_slowdowns, rng, graph, sampling,
+                                  sensitivity=sensitivity, batch_size=batch_size,
+                                  human_factors=human_factors)
+    return durations, sensitivity
+
+
+def percentile_halfwidth(sorted_samples: np.ndarray, q: float, z: float = 1.96) -> float:
+    """
+    Полуширина доверительного интервала квантиля q по порядковым статистикам.
+    Ранг выборочного квантиля ~ Binomial(n, q), поэтому интервал — значения
+    с рангами n*q ± z*sqrt(n*q*(1-q)).
+    """
+    n = len(sorted_samples)
+    delta = z * np.sqrt(n * q * (1.0 - q))
+    lo = int(max(0, np.floor(n * q - delta)))
+    hi = int(min(n - 1, np.ceil(n * q + delta)))
+    return float(sorted_samples[hi] - sorted_samples[lo]) / 2.0
+
+
+def monte_carlo_adaptive(project, percentiles=(0.5, 0.9), rel_tol: float = 0.01,
+                         batch_size: int = 500, max_simulations: int = 10000,
+                         task_slowdowns: Optional[Dict] = None,
+                         rng: RandomSource = None,
+                         graph: Optional[CompiledGraph] = None,
+                         z: float = 1.96, sampling: str = "random",
+                         human_factors=None) -> Tuple[np.ndarray, int]:
+    """
+    Адаптивная симуляция Монте-Карло: пакеты по batch_size, пока полуширины
+    доверительных интервалов всех percentiles не станут меньше rel_tol от оценки
+    или не будет исчерпан бюджет max_simulations.
+    Возвращает: (длительности проекта, число выполненных итераций)
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if not _n_tasks(project) or max_simulations <= 0:
+        return np.empty(0, dtype=np.float64), 0
+    if graph is None:
+        graph = CompiledGraph(project)
+    if task_slowdowns is None:
+        task_slowdowns = build_task_slowdown_cache(project)
+
+    batches = []
+    done = 0
+    while done < max_simulations:
+        size = min(batch_size, max_simulations - done)
+        durations = sample_durations(project, graph.task_ids, size,
+                                     batch_generator(rng, len(batches)), task_slowdowns, sampling,
+                                     human_factors)
+        batches.append(forward_pass_matrix(graph, durations).max(axis=1))
+        done += size
+
+        sorted_samples = np.sort(np.concatenate(batches))
+        converged = True
+        for q in percentiles:
+            estimate = sorted_samples[order_statistic_index(done, q)]
+            if percentile_halfwidth(sorted_samples, q, z) > rel_tol * abs(estimate):
+                converged = False
+                break
+        if converged:
+            break
+
+    return np.concatenate(batches), done
+
+
+def monte_carlo_sketch(project, num_simulations: int = 1000, batch_size: int = 10000,
+                       sketch: Optional[StreamingQuantiles] = None,
+                       task_slowdowns: Optional[Dict] = None,
+                       rng: RandomSource = None,
+                       graph: Optional[CompiledGraph] = None,
+                       sampling: str = "random",
+                       human_factors=None) -> StreamingQuantiles:
+    """
+    Монте-Карло без хранения выборки: длительности каждого пакета сразу уходят
+    в потоковый скетч квантилей, память не зависит от num_simulations.
+    Возвращает: StreamingQuantiles с p10/p50/p90 и schedule_risk_ratio
+    (None при пустом проекте или num_simulations <= 0)
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if sketch is None:
+        sketch = StreamingQuantiles()
+    if not _n_tasks(project) or num_simulations <= 0:
+        return sketch
+    if graph is None:
+        graph = CompiledGraph(project)
+    if task_slowdowns is None:
+        task_slowdowns = build_task_slowdown_cache(project)
+
+    done = 0
+    batch_index = 0
+    while done < num_simulations:
+        size = min(batch_size, num_simulations - done)
+        durations = sample_durations(project, graph.task_ids, size,
+                                     batch_generator(rng, batch_index), task_slowdowns, sampling,
+                                     human_factors)
+        batch_index += 1
+        sketch.update(forward_pass_matrix(graph, durations).max(axis=1))
+        done += size
+    return sketch
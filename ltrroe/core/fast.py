@@ -0,0 +1,128 @@
+"""
+Ускоренное ядро Монте-Карло LTRROE на Numba (pip install "ltrroe[fast]")
+Сэмплирование треугольных длительностей и forward pass выполняются в одном
+скомпилированном цикле; симуляции распределяются по потокам через prange.
+
+Равномерные числа генерируются снаружи (план из sampling.uniform_design), поэтому
+при том же rng результат совпадает с engine.monte_carlo_batch. Без Numba ядро
+остаётся обычной Python-функцией: корректно, но медленно, и monte_carlo_simulation
+его не выбирает (HAVE_NUMBA = False).
+"""
+
+import math
+import os
+from typing import Dict, Optional
+
+import numpy as np
+
+from ltrroe.core.algorithms import build_task_slowdown_cache
+from ltrroe.core.graph import CompiledGraph
+from ltrroe.core.sampling import batch_generator, uniform_design
+
+try:
+    import numba
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:  # numba — необязательная зависимость
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+# Приоритет слоёв потоков ядра: слой TBB зависает при выходе из процесса, который
+# делал fork после запуска потоков (ProcessPoolExecutor в project_level), поэтому он последний
+FORK_SAFE_THREADING_LAYERS = ["omp", "workqueue", "tbb"]
+
+_threading_layer_selected = False
+
+
+def _select_threading_layer():
+    """
+    Выбрать слой потоков перед первым запуском ядра: Numba фиксирует слой при первом
+    параллельном запуске, поэтому импорт модуля глобальную настройку не меняет.
+    Явный NUMBA_THREADING_LAYER не переопределяется.
+    """
+    global _threading_layer_selected
+    if _threading_layer_selected:
+        return
+    _threading_layer_selected = True
+    if HAVE_NUMBA and "NUMBA_THREADING_LAYER" not in os.environ:
+        numba.config.THREADING_LAYER_PRIORITY = FORK_SAFE_THREADING_LAYERS
+
+
+@njit(parallel=True, cache=True)
+def _simulate(u, low, most_likely, high, slowdown, order, pred_indptr, pred_edges,
+              edge_from, edge_from_finish, edge_to_finish, edge_lag, out):
+    n_simulations, n_tasks = u.shape
+    for sim in prange(n_simulations):
+        duration = np.empty(n_tasks)
+        early_start = np.empty(n_tasks)
+        early_finish = np.empty(n_tasks)
+        for j in range(n_tasks):
+            width = high[j] - low[j]
+            if width > 0:
+                c = (most_likely[j] - low[j]) / width
+                if u[sim, j] < c:
+                    base = low[j] + math.sqrt(u[sim, j] * width * (most_likely[j] - low[j]))
+                else:
+                    base = high[j] - math.sqrt((1.0 - u[sim, j]) * width * (high[j] - most_likely[j]))
+            else:
+                base = low[j]
+            duration[j] = base * slowdown[j]
+
+        project_end = 0.0
+        for k in range(n_tasks):
+            j = order[k]
+            start = 0.0
+            for e_pos in range(pred_indptr[j], pred_indptr[j + 1]):
+                e = pred_edges[e_pos]
+                p = edge_from[e]
+                bound = early_finish[p] if edge_from_finish[e] else early_start[p]
+                bound += edge_lag[e]
+                if edge_to_finish[e]:
+                    bound -= duration[j]
+                if bound > start:
+                    start = bound
+            early_start[j] = start
+            early_finish[j] = start + duration[j]
+            if early_finish[j] > project_end:
+                project_end = early_finish[j]
+        out[sim] = project_end
+
+
+def monte_carlo_fast(project, num_simulations: int = 1000,
+                     task_slowdowns: Optional[Dict] = None,
+                     rng: Optional[np.random.Generator] = None,
+                     graph: Optional[CompiledGraph] = None,
+                     sampling: str = "random") -> np.ndarray:
+    """
+    Монте-Карло на скомпилированном ядре
+    Возвращает: ndarray длительностей проекта (в днях, без округления)
+    """
+    rng = batch_generator(rng, 0)
+    if not project.proj_tasks or num_simulations <= 0:
+        return np.empty(0, dtype=np.float64)
+    if graph is None:
+        graph = CompiledGraph(project)
+    if task_slowdowns is None:
+        task_slowdowns = build_task_slowdown_cache(project)
+
+    dist = np.array(
+        [project.proj_tasks[task_id].task_duration_dist for task_id in graph.task_ids],
+        dtype=np.float64,
+    ).reshape(graph.n_tasks, 3)
+    if np.any(dist[:, 2] < dist[:, 0]) or np.any((dist[:, 1] < dist[:, 0]) | (dist[:, 1] > dist[:, 2])):
+        raise ValueError(
+            "Некорректное треугольное распределение: most_likely должен быть между low и high"
+        )
+    slowdown = np.array([task_slowdowns.get(task_id, 1.0) for task_id in graph.task_ids],
+                        dtype=np.float64)
+
+    u = uniform_design(sampling, num_simulations, graph.n_tasks, rng)
+    out = np.empty(num_simulations, dtype=np.float64)
+    _select_threading_layer()
+    _simulate(np.ascontiguousarray(u), dist[:, 0].copy(), dist[:, 1].copy(), dist[:, 2].copy(),
+              slowdown, graph.order, graph.pred_indptr, graph.pred_edges, graph.edge_from,
+              graph.edge_from_finish, graph.edge_to_finish, graph.edge_lag, out)
+    return out
@@ -0,0 +1,213 @@
+"""
+Скомпилированный граф проекта LTRROE
+Строится один раз из Project и переиспользуется всеми проходами CPM и Монте-Карло:
+- целочисленные индексы задач вместо поиска по proj_dependencies;
+- списки предшественников и последователей в формате CSR;
+- кэшированный топологический порядок и обнаружение циклов;
+- типы связей (FS, SS, FF, SF) и лаги, выровненные с CSR-списками;
+- уровни топологической глубины для level-synchronous forward pass.
+
+Связь i -> j с лагом L задаёт ограничение:
+    FS: ES_j >= EF_i + L        SS: ES_j >= ES_i + L
+    FF: EF_j >= EF_i + L        SF: EF_j >= ES_i + L
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from ltrroe.core.objects import DEPENDENCY_TYPES, ProjectArrays
+
+# Связь отсчитывается от окончания предшественника (FS, FF), а не от его начала
+FROM_FINISH = {"FS": True, "SS": False, "FF": True, "SF": False}
+# Связь ограничивает окончание последователя (FF, SF), а не его начало
+TO_FINISH = {"FS": False, "SS": False, "FF": True, "SF": True}
+
+
+def _iter_dependencies(project):
+    """
+    Вернуть зависимости независимо от того, хранятся они списком или словарём.
+    """
+    dependencies = project.proj_dependencies
+    if isinstance(dependencies, dict):
+        return dependencies.values()
+    return dependencies
+
+
+def _csr(keys: np.ndarray, values: np.ndarray, n: int):
+    """Сгруппировать values по keys: возвращает (indptr, indices, порядок рёбер)."""
+    edge_order = np.argsort(keys, kind="stable")
+    counts = np.bincount(keys, minlength=n)
+    indptr = np.zeros(n + 1, dtype=np.intp)
+    np.cumsum(counts, out=indptr[1:])
+    return indptr, values[edge_order].astype(np.intp), edge_order
+
+
+class CompiledGraph:
+    """
+    Граф зависимостей проекта в индексной форме.
+    task_ids[i] — исходный task_id задачи с индексом i.
+    project — Project или ProjectArrays (рёбра берутся из его массивов без поиска по task_id).
+    """
+
+    def __init__(self, project):
+        if isinstance(project, ProjectArrays):
+            if project.n_dependencies and (
+                    min(project.dep_from.min(), project.dep_to.min()) < 0
+                    or max(project.dep_from.max(), project.dep_to.max()) >= project.n_tasks):
+                raise ValueError("Зависимость ссылается на отсутствующую задачу")
+            self._compile(project.task_ids, project.dep_from, project.dep_to,
+                          [DEPENDENCY_TYPES[t] for t in project.dep_type.tolist()], project.dep_lag)
+            return
+        task_ids = list(project.proj_tasks.keys())
+        index = {task_id: i for i, task_id in enumerate(task_ids)}
+
+        edge_from, edge_to, edge_type, edge_lag = [], [], [], []
+        for dep in _iter_dependencies(project):
+            if dep.dep_from_task not in index or dep.dep_to_task not in index:
+                raise ValueError(
+                    "Зависимость ссылается на отсутствующую задачу: "
+                    f"{dep.dep_from_task} -> {dep.dep_to_task}"
+                )
+            dep_type = (dep.dep_type or "FS").upper()
+            if dep_type not in DEPENDENCY_TYPES:
+                raise ValueError(
+                    f"Неизвестный тип зависимости {dep.dep_type}: "
+                    f"{dep.dep_from_task} -> {dep.dep_to_task}. Допустимые: {DEPENDENCY_TYPES}"
+                )
+            edge_from.append(index[dep.dep_from_task])
+            edge_to.append(index[dep.dep_to_task])
+            edge_type.append(dep_type)
+            edge_lag.append(float(dep.dep_lag or 0.0))
+
+        self._compile(task_ids, edge_from, edge_to, edge_type, edge_lag)
+
+    @classmethod
+    def union(cls, graphs: List["CompiledGraph"]) -> "CompiledGraph":
+        """
+        Дизъюнктное объединение графов: задачи k-го графа получают индексы со сдвигом
+        на число задач предыдущих и task_id вида (k, task_id). Уровни объединения —
+        уровни всех графов сразу, поэтому forward pass идёт одной серией reduceat.
+        """
+        task_ids, edge_from, edge_to, edge_type, edge_lag = [], [], [], [], []
+        offset = 0
+        for k, graph in enumerate(graphs):
+            task_ids.extend((k, task_id) for task_id in graph.task_ids)
+            edge_from.append(graph.edge_from + offset)
+            edge_to.append(graph.edge_to + offset)
+            edge_type.extend(graph.edge_type)
+            edge_lag.append(graph.edge_lag)
+            offset += graph.n_tasks
+
+        merged = cls.__new__(cls)
+        merged._compile(
+            task_ids,
+            np.concatenate(edge_from) if graphs else [],
+            np.concatenate(edge_to) if graphs else [],
+            edge_type,
+            np.concatenate(edge_lag) if graphs else [],
+        )
+        return merged
+
+    def _compile(self, task_ids: List, edge_from, edge_to, edge_type: List[str], edge_lag):
+        """Построить индексы, CSR-списки, топологический порядок и уровни по рёбрам."""
+        self.task_ids = task_ids
+        self.index: Dict = {task_id: i for i, task_id in enumerate(task_ids)}
+        self.n_tasks = len(task_ids)
+
+        self.edge_from = np.asarray(edge_from, dtype=np.intp)
+        self.edge_to = np.asarray(edge_to, dtype=np.intp)
+        self.edge_type: List[str] = edge_type
+        self.edge_lag = np.asarray(edge_lag, dtype=np.float64)
+        self.edge_from_finish = np.array([FROM_FINISH[t] for t in edge_type], dtype=bool)
+        self.edge_to_finish = np.array([TO_FINISH[t] for t in edge_type], dtype=bool)
+        self.n_edges = len(self.edge_from)
+        # Только FS без лагов: проходы сводятся к max/min по соседям
+        self.finish_to_start_only = bool(
+            not self.edge_to_finish.any() and self.edge_from_finish.all() and not self.edge_lag.any()
+        )
+
+        self.pred_indptr, self.pred_indices, pred_edges = _csr(self.edge_to, self.edge_from, self.n_tasks)
+        self.succ_indptr, self.succ_indices, succ_edges = _csr(self.edge_from, self.edge_to, self.n_tasks)
+        # Атрибуты рёбер в порядке CSR-списков предшественников и последователей
+        self.pred_edges = pred_edges.astype(np.intp)
+        self.succ_edges = succ_edges.astype(np.intp)
+        self.pred_lag = self.edge_lag[pred_edges]
+        self.pred_from_finish = self.edge_from_finish[pred_edges]
+        self.pred_to_finish = self.edge_to_finish[pred_edges]
+        self.succ_lag = self.edge_lag[succ_edges]
+        self.succ_from_finish = self.edge_from_finish[succ_edges]
+        self.succ_to_finish = self.edge_to_finish[succ_edges]
+
+        self.order = self._topological_order()
+        self.depth = self._depths()
+        self.n_levels = int(self.depth.max()) + 1 if self.n_tasks else 0
+        self.levels = self._levels()
+
+    def _depths(self) -> np.ndarray:
+        """Глубина задачи: 0 для задач без предшественников, иначе 1 + max глубины предшественников."""
+        depth = [0] * self.n_tasks
+        pred_indptr = self.pred_indptr.tolist()
+        pred_indices = self.pred_indices.tolist()
+        for j in self.order.tolist():
+            preds = pred_indices[pred_indptr[j]:pred_indptr[j + 1]]
+            if preds:
+                depth[j] = 1 + max(depth[p] for p in preds)
+        return np.asarray(depth, dtype=np.intp)
+
+    def _levels(self) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Уровни глубины >= 1 для np.maximum.reduceat: у каждой задачи уровня есть
+        предшественники, и все они лежат на меньших уровнях.
+        Возвращает: список (tasks, edges, starts) — задачи уровня, индексы их входящих
+        рёбер (сгруппированы по задаче) и начала групп в edges
+        """
+        levels = []
+        counts = np.diff(self.pred_indptr)
+        by_depth = np.argsort(self.depth, kind="stable")
+        bounds = np.searchsorted(self.depth[by_depth], np.arange(self.n_levels + 1))
+        for level in range(1, self.n_levels):
+            tasks = by_depth[bounds[level]:bounds[level + 1]]
+            edges = np.concatenate([
+                self.pred_edges[self.pred_indptr[j]:self.pred_indptr[j + 1]] for j in tasks
+            ])
+            starts = np.zeros(len(tasks), dtype=np.intp)
+            np.cumsum(counts[tasks][:-1], out=starts[1:])
+            levels.append((tasks, edges, starts))
+        return levels
+
+    def predecessors(self, i: int) -> np.ndarray:
+        """Индексы предшественников задачи i"""
+        return self.pred_indices[self.pred_indptr[i]:self.pred_indptr[i + 1]]
+
+    def successors(self, i: int) -> np.ndarray:
+        """Индексы последователей задачи i"""
+        return self.succ_indices[self.succ_indptr[i]:self.succ_indptr[i + 1]]
+
+    def _topological_order(self) -> np.ndarray:
+        """
+        Топологический порядок по алгоритму Кана.
+        При наличии цикла выбрасывает ValueError со списком неразрешённых задач.
+        """
+        indegree = np.diff(self.pred_indptr).tolist()
+        succ_indptr = self.succ_indptr.tolist()
+        succ_indices = self.succ_indices.tolist()
+
+        queue = [i for i, d in enumerate(indegree) if d == 0]
+        order = []
+        while queue:
+            i = queue.pop()
+            order.append(i)
+            for s in succ_indices[succ_indptr[i]:succ_indptr[i + 1]]:
+                indegree[s] -= 1
+                if indegree[s] == 0:
+                    queue.append(s)
+
+        if len(order) < self.n_tasks:
+            unresolved = sorted(self.task_ids[i] for i, d in enumerate(indegree) if d > 0)
+            raise ValueError(
+                "Невозможно выполнить forward pass: проверьте циклы "
+                f"или отсутствующие зависимости. Неразрешённые задачи: {unresolved}"
+            )
+
+        return np.asarray(order, dtype=np.intp)
@@ -0,0 +1,84 @@
+"""
+Человеческий фактор в Монте-Карло LTRROE: ошибки с переделкой и усталость
+Модель применяется к матрице длительностей (n_simulations, n_tasks) целиком,
+поэтому её включение стоит несколько операций NumPy, а не цикл по задачам.
+
+Для задачи j с основным исполнителем e в каждой симуляции:
+- усталость  fatigue_j = emp_fatigue_e * (1 + fatigue_rate * W), где W — дни работы
+              e над его задачами, начинающимися раньше j (порядок раннего начала CPM);
+              накопленная нагрузка — сегментированный cumsum по задачам сотрудника;
+- скорость   длительность умножается на fatigue_j;
+- ошибки     Bernoulli(min(1, emp_error_prob_e * fatigue_j)); при ошибке задача
+              переделывается: + rework_fraction от её длительности.
+Задачи без исполнителя из проекта не устают и не ошибаются.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from ltrroe.core.engine import schedule_days
+from ltrroe.core.graph import CompiledGraph
+
+# Доля длительности задачи, которая уходит на переделку после ошибки
+REWORK_FRACTION = 0.5
+# Прирост усталости за день накопленной работы сотрудника
+FATIGUE_RATE = 0.01
+
+
+class HumanFactorModel:
+    """
+    Параметры ошибок и усталости по индексу задачи графа.
+    Передаётся в sample_durations / monte_carlo_batch как human_factors.
+    """
+
+    def __init__(self, project, graph: Optional[CompiledGraph] = None,
+                 rework_fraction: float = REWORK_FRACTION, fatigue_rate: float = FATIGUE_RATE):
+        if graph is None:
+            graph = CompiledGraph(project)
+        if rework_fraction < 0 or fatigue_rate < 0:
+            raise ValueError("rework_fraction и fatigue_rate должны быть неотрицательными")
+        self.task_ids = graph.task_ids
+        self.rework_fraction = rework_fraction
+        self.fatigue_rate = fatigue_rate
+
+        employee = np.full(graph.n_tasks, -1, dtype=np.intp)
+        employee_index = {emp_id: e for e, emp_id in enumerate(project.proj_employees)}
+        self.error_prob = np.zeros(graph.n_tasks)
+        self.fatigue = np.ones(graph.n_tasks)
+        for j, task_id in enumerate(graph.task_ids):
+            assigned = project.proj_tasks[task_id].task_assigned_to
+            emp = project.proj_employees.get(assigned[0]) if assigned else None
+            if emp is None:
+                continue
+            employee[j] = employee_index[assigned[0]]
+            self.error_prob[j] = float(emp.emp_error_prob or 0.0)
+            self.fatigue[j] = float(emp.emp_fatigue)
+
+        # Задачи с исполнителем, сгруппированные по сотруднику и по раннему началу
+        early_start = schedule_days(project, graph)[0]
+        staffed = np.flatnonzero(employee >= 0)
+        self._load_order = staffed[np.lexsort((early_start[staffed], employee[staffed]))]
+        groups = employee[self._load_order]
+        is_first = np.ones(len(groups), dtype=bool)
+        is_first[1:] = groups[1:] != groups[:-1]
+        # Для каждой позиции — начало группы её сотрудника
+        self._group_start = np.maximum.accumulate(np.where(is_first, np.arange(len(groups)), 0))
+
+    def prior_load(self, durations: np.ndarray) -> np.ndarray:
+        """Дни работы исполнителя над его более ранними задачами (та же форма, что durations)."""
+        load = np.zeros_like(durations)
+        if not len(self._load_order):
+            return load
+        ordered = durations[..., self._load_order]
+        before = np.cumsum(ordered, axis=-1) - ordered
+        load[..., self._load_order] = before - before[..., self._group_start]
+        return load
+
+    def apply(self, durations: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Длительности с усталостью и переделками; rng даёт равномерные числа ошибок."""
+        durations = np.asarray(durations, dtype=np.float64)
+        fatigue = self.fatigue * (1.0 + self.fatigue_rate * self.prior_load(durations))
+        slowed = durations * fatigue
+        errors = rng.random(durations.shape) < np.minimum(self.error_prob * fatigue, 1.0)
+        return slowed + errors * (self.rework_fraction * slowed)
@@ -0,0 +1,277 @@
+"""
+Инкрементальный CPM LTRROE для интерактивного анализа "что если"
+IncrementalSchedule хранит ранние и поздние времена задач и после изменения
+длительности, исполнителя или зависимости пересчитывает только затронутый конус:
+- вперёд — последователей, чьи ES/EF действительно сдвинулись;
+- назад — предшественников, чей хвост до окончания проекта изменился.
+Очередь упорядочена по позиции в топологическом порядке (heapq), поэтому каждая
+задача конуса пересчитывается один раз. Новая зависимость, нарушающая порядок,
+переставляет только задачи между её концами (алгоритм Пирса–Келли).
+
+Поздние времена хранятся как хвост tail = project_end - LF (длиннейший путь от
+окончания задачи до конца проекта): сдвиг срока проекта не требует обратного
+прохода, LS/LF получаются вычитанием при чтении.
+"""
+
+import heapq
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ltrroe.core.algorithms import calculate_task_duration
+from ltrroe.core.engine import CRITICAL_TOLERANCE, backward_pass_days, forward_pass_days, task_durations_days
+from ltrroe.core.graph import DEPENDENCY_TYPES, FROM_FINISH, TO_FINISH, CompiledGraph
+from ltrroe.core.objects import Dependency
+
+
+class IncrementalSchedule:
+    """
+    Детерминированный график проекта с локальными пересчётами.
+    Массивы (early_start, late_finish, ...) — по индексу задачи, как в CompiledGraph.
+    Исполнители и зависимости меняются и в самом project; set_duration задаёт
+    длительность только в графике (в модели проекта для неё нет поля).
+    """
+
+    def __init__(self, project, graph: Optional[CompiledGraph] = None):
+        if graph is None:
+            graph = CompiledGraph(project)
+        self.project = project
+        self.task_ids: List = list(graph.task_ids)
+        self.index: Dict = dict(graph.index)
+        # Число задач, пересчитанных последним изменением (размер конуса)
+        self.last_recomputed = 0
+
+        durations = task_durations_days(project, graph)
+        early_start, early_finish = forward_pass_days(graph, durations)
+        tail = np.zeros(graph.n_tasks)
+        if graph.n_tasks:
+            _, late_finish = backward_pass_days(graph, early_finish, durations)
+            tail = early_finish.max() - late_finish
+
+        # Python-списки: точечный доступ к ним быстрее, чем к элементам ndarray
+        self._duration = durations.tolist()
+        self._es = early_start.tolist()
+        self._ef = early_finish.tolist()
+        self._tail = tail.tolist()
+        self._order = graph.order.tolist()
+        self._pos = [0] * graph.n_tasks
+        for position, i in enumerate(self._order):
+            self._pos[i] = position
+
+        # Рёбра: (соседняя задача, от окончания, к окончанию, лаг)
+        self._preds: List[List] = [[] for _ in range(graph.n_tasks)]
+        self._succs: List[List] = [[] for _ in range(graph.n_tasks)]
+        for i, j, from_finish, to_finish, lag in zip(
+                graph.edge_from.tolist(), graph.edge_to.tolist(), graph.edge_from_finish.tolist(),
+                graph.edge_to_finish.tolist(), graph.edge_lag.tolist()):
+            self._preds[j].append((i, from_finish, to_finish, lag))
+            self._succs[i].append((j, from_finish, to_finish, lag))
+
+    @property
+    def project_end(self) -> float:
+        return max(self._ef, default=0.0)
+
+    @property
+    def durations(self) -> np.ndarray:
+        return np.asarray(self._duration)
+
+    @property
+    def early_start(self) -> np.ndarray:
+        return np.asarray(self._es)
+
+    @property
+    def early_finish(self) -> np.ndarray:
+        return np.asarray(self._ef)
+
+    @property
+    def late_finish(self) -> np.ndarray:
+        return self.project_end - np.asarray(self._tail)
+
+    @property
+    def late_start(self) -> np.ndarray:
+        return self.late_finish - self.durations
+
+    @property
+    def total_float(self) -> np.ndarray:
+        return self.late_start - self.early_start
+
+    def critical(self, tol: float = CRITICAL_TOLERANCE) -> np.ndarray:
+        return self.total_float < tol
+
+    def task_times(self, task_id) -> Dict[str, float]:
+        """ES, EF, LS, LF и длительность одной задачи за O(1) (плюс срок проекта)."""
+        i = self.index[task_id]
+        late_finish = self.project_end - self._tail[i]
+        return {
+            "early_start": self._es[i],
+            "early_finish": self._ef[i],
+            "late_start": late_finish - self._duration[i],
+            "late_finish": late_finish,
+            "duration": self._duration[i],
+        }
+
+    def set_duration(self, task_id, days: float) -> int:
+        """Задать длительность задачи в днях. Возвращает размер пересчитанного конуса."""
+        if days < 0:
+            raise ValueError(f"Отрицательная длительность задачи {task_id}: {days}")
+        i = self.index[task_id]
+        self._duration[i] = float(days)
+        # Хвост предшественников зависит от длительности i через связи к началу (FS, SS)
+        return self._propagate([i], [i] + [p for p, *_ in self._preds[i]])
+
+    def assign(self, task_id, employee_ids: List) -> int:
+        """Сменить исполнителей задачи (первый — основной) и пересчитать её длительность."""
+        missing = [emp_id for emp_id in employee_ids if emp_id not in self.project.proj_employees]
+        if missing:
+            raise ValueError(f"Сотрудники не найдены в проекте: {missing}")
+        task = self.project.proj_tasks[task_id]
+        task.task_assigned_to = list(employee_ids)
+        return self.set_duration(task_id, calculate_task_duration(task, self.project))
+
+    def add_dependency(self, from_task, to_task, dep_type: str = "FS", lag: float = 0.0) -> int:
+        """
+        Добавить связь from_task -> to_task. Если связь замыкает цикл, выбрасывает
+        ValueError и ничего не меняет.
+        """
+        dep_type = (dep_type or "FS").upper()
+        if dep_type not in DEPENDENCY_TYPES:
+            raise ValueError(f"Неизвестный тип зависимости {dep_type}. Допустимые: {DEPENDENCY_TYPES}")
+        i, j = self.index[from_task], self.index[to_task]
+        if self._pos[j] <= self._pos[i]:
+            self._reorder(i, j)
+
+        edge = (FROM_FINISH[dep_type], TO_FINISH[dep_type], float(lag or 0.0))
+        self._preds[j].append((i,) + edge)
+        self._succs[i].append((j,) + edge)
+        _add_project_dependency(self.project, Dependency(from_task, to_task, dep_type, lag))
+        return self._propagate([j], [i])
+
+    def remove_dependency(self, from_task, to_task) -> int:
+        """Удалить все связи from_task -> to_task (топологический порядок остаётся верным)."""
+        i, j = self.index[from_task], self.index[to_task]
+        if not any(s == j for s, *_ in self._succs[i]):
+            raise ValueError(f"Зависимость {from_task} -> {to_task} не найдена")
+        self._preds[j] = [edge for edge in self._preds[j] if edge[0] != i]
+        self._succs[i] = [edge for edge in self._succs[i] if edge[0] != j]
+        _remove_project_dependency(self.project, from_task, to_task)
+        return self._propagate([j], [i])
+
+    def _propagate(self, forward_seeds: List[int], backward_seeds: List[int]) -> int:
+        self.last_recomputed = self._forward(forward_seeds) + self._backward(backward_seeds)
+        return self.last_recomputed
+
+    def _forward(self, seeds: List[int]) -> int:
+        pos, es, ef, duration = self._pos, self._es, self._ef, self._duration
+        heap = [(pos[j], j) for j in set(seeds)]
+        heapq.heapify(heap)
+        queued = set(seeds)
+        recomputed = 0
+        while heap:
+            _, j = heapq.heappop(heap)
+            queued.discard(j)
+            recomputed += 1
+            start = 0.0
+            for p, from_finish, to_finish, lag in self._preds[j]:
+                bound = (ef[p] if from_finish else es[p]) + lag
+                if to_finish:
+                    bound -= duration[j]
+                if bound > start:
+                    start = bound
+            finish = start + duration[j]
+            if start == es[j] and finish == ef[j]:
+                continue
+            es[j], ef[j] = start, finish
+            for s, *_ in self._succs[j]:
+                if s not in queued:
+                    queued.add(s)
+                    heapq.heappush(heap, (pos[s], s))
+        return recomputed
+
+    def _backward(self, seeds: List[int]) -> int:
+        pos, tail, duration = self._pos, self._tail, self._duration
+        heap = [(-pos[i], i) for i in set(seeds)]
+        heapq.heapify(heap)
+        queued = set(seeds)
+        recomputed = 0
+        while heap:
+            _, i = heapq.heappop(heap)
+            queued.discard(i)
+            recomputed += 1
+            # tail_i = max(0, tail_j + (d_j для связей к началу) + L - (d_i для связей от начала))
+            value = 0.0
+            for s, from_finish, to_finish, lag in self._succs[i]:
+                bound = tail[s] + lag
+                if not to_finish:
+                    bound += duration[s]
+                if not from_finish:
+                    bound -= duration[i]
+                if bound > value:
+                    value = bound
+            if value == tail[i]:
+                continue
+            tail[i] = value
+            for p, *_ in self._preds[i]:
+                if p not in queued:
+                    queued.add(p)
+                    heapq.heappush(heap, (-pos[p], p))
+        return recomputed
+
+    def _reorder(self, i: int, j: int):
+        """
+        Восстановить топологический порядок перед добавлением ребра i -> j при pos[j] <= pos[i]
+        (Пирс–Келли): переставляются только задачи с позициями между j и i.
+        """
+        pos = self._pos
+        lower, upper = pos[j], pos[i]
+
+        forward, stack, seen = [], [j], {j}
+        while stack:
+            k = stack.pop()
+            if k == i:
+                raise ValueError(
+                    f"Зависимость {self.task_ids[i]} -> {self.task_ids[j]} образует цикл"
+                )
+            forward.append(k)
+            for s, *_ in self._succs[k]:
+                if s not in seen and pos[s] <= upper:
+                    seen.add(s)
+                    stack.append(s)
+
+        backward, stack, seen = [], [i], {i}
+        while stack:
+            k = stack.pop()
+            backward.append(k)
+            for p, *_ in self._preds[k]:
+                if p not in seen and pos[p] >= lower:
+                    seen.add(p)
+                    stack.append(p)
+
+        # Предшественники i встают перед последователями j на те же позиции
+        moved = sorted(backward, key=pos.__getitem__) + sorted(forward, key=pos.__getitem__)
+        slots = sorted(pos[k] for k in moved)
+        for slot, k in zip(slots, moved):
+            pos[k] = slot
+            self._order[slot] = k
+
+
+def _add_project_dependency(project, dep: Dependency):
+    """Отразить новую связь в project (proj_dependencies — словарь или список)."""
+    dependencies = project.proj_dependencies
+    if not isinstance(dependencies, dict):
+        dependencies.append(dep)
+    elif getattr(project, "_next_dep_id", None) not in (None, *dependencies):
+        project.add_dependency(dep.dep_from_task, dep.dep_to_task, dep.dep_type, dep.dep_lag)
+    else:
+        dep.dep_id = max(dependencies, default=0) + 1
+        dependencies[dep.dep_id] = dep
+
+
+def _remove_project_dependency(project, from_task, to_task):
+    def keep(dep):
+        return not (dep.dep_from_task == from_task and dep.dep_to_task == to_task)
+
+    if isinstance(project.proj_dependencies, dict):
+        for key in [key for key, dep in project.proj_dependencies.items() if not keep(dep)]:
+            del project.proj_dependencies[key]
+    else:
+        project.proj_dependencies[:] = [dep for dep in project.proj_dependencies if keep(dep)]
@@ -10,18 +10,31 @@
 - Dependency: Связь между задачами с типом и временным лагом
 - Outsource: Опция аутсорсинга задачи
 - Assignment: Назначение задачи сотруднику
+- ProjectArrays: Колоночное представление проекта (структура массивов)
 
 Архитектура:
 Классы реализованы с методами для удобных операций и расчёта производных параметров.
 Каждый класс содержит все необходимые атрибуты для моделирования и анализа.
+Атрибуты объявлены в __slots__: у объектов нет __dict__, что экономит память на
+больших синтетических проектах. Для миллионов задач — ProjectArrays: длительности
+матрицей (n, 3), концы зависимостей целочисленными массивами; граф, сэмплирование
+и замедления движка читают его напрямую, преобразование в объекты — без потерь.
 """
  
 from datetime import datetime
 from typing import Dict, List, Optional, Union
 
+import numpy as np
+
 EntityId = Union[int, str]
 
+DEPENDENCY_TYPES = ("FS", "SS", "FF", "SF")
+
 class Employee:
+    __slots__ = ("emp_id", "emp_name", "emp_skills", "emp_error_prob", "emp_cost_per_hour",
+                 "emp_efficiency", "emp_max_daily_hours", "emp_current_load", "emp_fatigue",
+                 "emp_assigned_tasks")
+
     def __init__(self, emp_id: EntityId, emp_name: str, emp_skills: List[str],
                  emp_error_prob: float, emp_cost_per_hour: float,
                  emp_efficiency: Dict[str, float]):
@@ -37,6 +50,10 @@ class Employee:
         self.emp_assigned_tasks = []  # Текущие назначенные задачи
 
 class Task:
+    __slots__ = ("task_id", "task_name", "task_skills", "task_crit", "task_cost",
+                 "task_duration_dist", "task_assigned_to", "task_status",
+                 "task_actual_duration", "task_primary_assignee")
+
     def __init__(self, task_id: EntityId, task_name: str, task_skills: List[str], 
                  task_crit: int, task_cost: float, task_duration_dist: tuple):
         self.task_id = task_id
@@ -51,6 +68,8 @@ class Task:
         self.task_primary_assignee = None 
 
 class Dependency:
+    __slots__ = ("dep_id", "dep_from_task", "dep_to_task", "dep_type", "dep_lag", "dep_mandatory")
+
     def __init__(self, dep_from_task: EntityId, dep_to_task: EntityId, 
                  dep_type: str, dep_lag: float, 
                  dep_mandatory: bool = True, dep_id: Optional[int] = None):
@@ -62,6 +81,9 @@ class Dependency:
         self.dep_mandatory = dep_mandatory
 
 class Outsource:
+    __slots__ = ("outs_id", "outs_name", "outs_skills", "outs_daily_cost", "outs_reliability",
+                 "outs_lead_time_days", "outs_duration_multiplier")
+
     def __init__(self, outs_id: int, outs_name: str, outs_skills: List[str],
                  outs_daily_cost: float, outs_reliability: float,
                  outs_lead_time_days: int, outs_duration_multiplier: float = 1.5):
@@ -74,6 +96,9 @@ class Outsource:
         self.outs_duration_multiplier = outs_duration_multiplier  # Множитель длительности задачи для аутсорсера (>1)
 
 class Project:
+    __slots__ = ("proj_id", "proj_employees", "proj_tasks", "proj_dependencies", "proj_outsources",
+                 "proj_start_date", "proj_current_date", "proj_simulation_results", "_next_dep_id")
+
     def __init__(self, proj_id=None):
         self.proj_id = proj_id
         self.proj_employees: Dict[EntityId, Employee] = {}  # Словарь сотрудников
@@ -101,6 +126,9 @@ class Project:
         return dep
     
 class Assignment:
+    __slots__ = ("asg_task_id", "asg_emp_id", "asg_planned_start", "asg_planned_end",
+                 "asg_hours_per_day", "asg_actual_start", "asg_actual_end", "asg_progress")
+
     def __init__(self, asg_task_id: EntityId, asg_emp_id: EntityId, 
                  asg_planned_start: datetime, asg_planned_end: datetime,
                  asg_hours_per_day: float):
@@ -112,3 +140,157 @@ class Assignment:
         self.asg_actual_start = None
         self.asg_actual_end = None
         self.asg_progress = 0.0  # Прогресс назначения (0.0 - 1.0)
+
+
+def _optional_floats(values) -> np.ndarray:
+    """Числа с None -> float64 с NaN на месте None."""
+    return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+
+
+def _from_optional(value: float):
+    return None if np.isnan(value) else float(value)
+
+
+class ProjectArrays:
+    """
+    Колоночный вид проекта: по массиву (или списку) на поле, индекс — позиция
+    задачи, сотрудника или зависимости.
+    Задачи: task_ids, task_duration_dist (n, 3), task_crit, task_cost и др.;
+    исполнители — CSR: task_assigned[task_assigned_indptr[i]:task_assigned_indptr[i + 1]].
+    Зависимости: dep_from / dep_to — индексы задач, dep_type — код в DEPENDENCY_TYPES,
+    dep_lag, dep_mandatory; dep_keys — ключи словаря proj_dependencies (None — список).
+    Тип связи и лаг нормализуются как в CompiledGraph (None -> "FS" и 0.0);
+    task_actual_duration и emp_error_prob хранят None как NaN.
+    """
+
+    __slots__ = ("proj_id", "proj_outsources", "proj_start_date", "proj_current_date",
+                 "proj_simulation_results", "next_dep_id",
+                 "task_ids", "task_names", "task_skills", "task_crit", "task_cost",
+                 "task_duration_dist", "task_assigned_indptr", "task_assigned", "task_status",
+                 "task_actual_duration", "task_primary_assignee", "_task_index",
+                 "employee_ids", "emp_names", "emp_skills", "emp_error_prob", "emp_cost_per_hour",
+                 "emp_efficiency", "emp_max_daily_hours", "emp_current_load", "emp_fatigue",
+                 "emp_assigned_tasks",
+                 "dep_keys", "dep_ids", "dep_from", "dep_to", "dep_type", "dep_lag", "dep_mandatory")
+
+    @classmethod
+    def from_project(cls, project: "Project") -> "ProjectArrays":
+        arrays = cls.__new__(cls)
+        arrays.proj_id = project.proj_id
+        arrays.proj_outsources = list(project.proj_outsources)
+        arrays.proj_start_date = project.proj_start_date
+        arrays.proj_current_date = project.proj_current_date
+        arrays.proj_simulation_results = project.proj_simulation_results
+        arrays.next_dep_id = project._next_dep_id
+
+        tasks = list(project.proj_tasks.values())
+        arrays.task_ids = list(project.proj_tasks)
+        arrays._task_index = None
+        arrays.task_names = [task.task_name for task in tasks]
+        arrays.task_skills = [list(task.task_skills) for task in tasks]
+        arrays.task_crit = np.array([task.task_crit for task in tasks], dtype=np.int64)
+        arrays.task_cost = np.array([task.task_cost for task in tasks], dtype=np.float64)
+        arrays.task_duration_dist = np.array(
+            [task.task_duration_dist for task in tasks], dtype=np.float64).reshape(len(tasks), 3)
+        arrays.task_assigned_indptr = np.zeros(len(tasks) + 1, dtype=np.intp)
+        np.cumsum([len(task.task_assigned_to) for task in tasks], out=arrays.task_assigned_indptr[1:])
+        arrays.task_assigned = [emp_id for task in tasks for emp_id in task.task_assigned_to]
+        arrays.task_status = [task.task_status for task in tasks]
+        arrays.task_actual_duration = _optional_floats(task.task_actual_duration for task in tasks)
+        arrays.task_primary_assignee = [task.task_primary_assignee for task in tasks]
+
+        employees = list(project.proj_employees.values())
+        arrays.employee_ids = list(project.proj_employees)
+        arrays.emp_names = [emp.emp_name for emp in employees]
+        arrays.emp_skills = [list(emp.emp_skills) for emp in employees]
+        arrays.emp_error_prob = _optional_floats(emp.emp_error_prob for emp in employees)
+        arrays.emp_cost_per_hour = np.array([emp.emp_cost_per_hour for emp in employees], dtype=np.float64)
+        arrays.emp_efficiency = [dict(emp.emp_efficiency) for emp in employees]
+        arrays.emp_max_daily_hours = np.array([emp.emp_max_daily_hours for emp in employees],
+                                              dtype=np.float64)
+        arrays.emp_current_load = np.array([emp.emp_current_load for emp in employees], dtype=np.float64)
+        arrays.emp_fatigue = np.array([emp.emp_fatigue for emp in employees], dtype=np.float64)
+        arrays.emp_assigned_tasks = [list(emp.emp_assigned_tasks) for emp in employees]
+
+        dependencies = project.proj_dependencies
+        arrays.dep_keys = list(dependencies) if isinstance(dependencies, dict) else None
+        deps = list(dependencies.values()) if isinstance(dependencies, dict) else list(dependencies)
+        index = arrays.task_index
+        missing = [(dep.dep_from_task, dep.dep_to_task) for dep in deps
+                   if dep.dep_from_task not in index or dep.dep_to_task not in index]
+        if missing:
+            raise ValueError(f"Зависимость ссылается на отсутствующую задачу: {missing[0][0]} -> {missing[0][1]}")
+        types = [(dep.dep_type or "FS").upper() for dep in deps]
+        unknown = sorted(set(types) - set(DEPENDENCY_TYPES))
+        if unknown:
+            raise ValueError(f"Неизвестный тип зависимости {unknown[0]}. Допустимые: {DEPENDENCY_TYPES}")
+        arrays.dep_ids = [dep.dep_id for dep in deps]
+        arrays.dep_from = np.array([index[dep.dep_from_task] for dep in deps], dtype=np.intp)
+        arrays.dep_to = np.array([index[dep.dep_to_task] for dep in deps], dtype=np.intp)
+        arrays.dep_type = np.array([DEPENDENCY_TYPES.index(t) for t in types], dtype=np.uint8)
+        arrays.dep_lag = np.array([float(dep.dep_lag or 0.0) for dep in deps], dtype=np.float64)
+        arrays.dep_mandatory = np.array([dep.dep_mandatory for dep in deps], dtype=bool)
+        return arrays
+
+    @property
+    def n_tasks(self) -> int:
+        return len(self.task_ids)
+
+    @property
+    def n_dependencies(self) -> int:
+        return len(self.dep_from)
+
+    @property
+    def task_index(self) -> Dict:
+        """task_id -> позиция задачи (строится при первом обращении)."""
+        if self._task_index is None:
+            self._task_index = {task_id: i for i, task_id in enumerate(self.task_ids)}
+        return self._task_index
+
+    def task_rows(self, task_ids: List) -> np.ndarray:
+        """Позиции задач task_ids; для собственного порядка task_ids — без поиска по словарю."""
+        if task_ids is self.task_ids or task_ids == self.task_ids:
+            return np.arange(self.n_tasks)
+        index = self.task_index
+        return np.array([index[task_id] for task_id in task_ids], dtype=np.intp)
+
+    def assigned_to(self, i: int) -> List:
+        """Исполнители задачи с позицией i (task_assigned_to)."""
+        return self.task_assigned[self.task_assigned_indptr[i]:self.task_assigned_indptr[i + 1]]
+
+    def to_project(self) -> "Project":
+        """Объектная модель проекта с теми же значениями полей."""
+        project = Project(self.proj_id)
+        project.proj_outsources = list(self.proj_outsources)
+        project.proj_start_date = self.proj_start_date
+        project.proj_current_date = self.proj_current_date
+        project.proj_simulation_results = self.proj_simulation_results
+        project._next_dep_id = self.next_dep_id
+
+        for e, emp_id in enumerate(self.employee_ids):
+            emp = Employee(emp_id, self.emp_names[e], list(self.emp_skills[e]),
+                           _from_optional(self.emp_error_prob[e]), float(self.emp_cost_per_hour[e]),
+                           dict(self.emp_efficiency[e]))
+            emp.emp_max_daily_hours = float(self.emp_max_daily_hours[e])
+            emp.emp_current_load = float(self.emp_current_load[e])
+            emp.emp_fatigue = float(self.emp_fatigue[e])
+            emp.emp_assigned_tasks = list(self.emp_assigned_tasks[e])
+            project.proj_employees[emp_id] = emp
+
+        for i, task_id in enumerate(self.task_ids):
+            task = Task(task_id, self.task_names[i], list(self.task_skills[i]), int(self.task_crit[i]),
+                        float(self.task_cost[i]), tuple(self.task_duration_dist[i].tolist()))
+            task.task_assigned_to = list(self.assigned_to(i))
+            task.task_status = self.task_status[i]
+            task.task_actual_duration = _from_optional(self.task_actual_duration[i])
+            task.task_primary_assignee = self.task_primary_assignee[i]
+            project.proj_tasks[task_id] = task
+
+        deps = [
+            Dependency(self.task_ids[i], self.task_ids[j], DEPENDENCY_TYPES[t], lag, mandatory, dep_id)
+            for i, j, t, lag, mandatory, dep_id in zip(
+                self.dep_from.tolist(), self.dep_to.tolist(), self.dep_type.tolist(),
+                self.dep_lag.tolist(), self.dep_mandatory.tolist(), self.dep_ids)
+        ]
+        project.proj_dependencies = deps if self.dep_keys is None else dict(zip(self.dep_keys, deps))
+        return project
@@ -0,0 +1,246 @@
+"""
+Анализ аутсорсинга LTRROE: "своими силами или подрядчику k" на Монте-Карло
+Все варианты считаются на общих случайных числах одного WhatIfSimulator; варианты
+одной задачи (своими силами и все допустимые подрядчики) — строками матрицы
+(k, n_simulations) за один проход по конусу её последователей.
+
+Длительность задачи у подрядчика в симуляции:
+    outs_lead_time_days + d * outs_duration_multiplier * (1 + rework_fraction * сбой),
+где d — длительность по треугольному распределению задачи без замедления исполнителя,
+сбой — Bernoulli(1 - outs_reliability) на отдельных сохранённых равномерных числах.
+Ожидаемая стоимость: подрядчик — outs_daily_cost за рабочие дни (без онбординга),
+своими силами — среднее распределения * замедление * hours_per_day * emp_cost_per_hour
+основного исполнителя.
+
+Кривая стоимость/перцентиль строится жадно, как сжатие сроков в CPM: от самого
+дешёвого плана на каждом шаге берётся вариант с наименьшей ценой дня сокращения
+перцентиля, пока перцентиль уменьшается; из пройденных планов остаётся граница Парето.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ltrroe.core.algorithms import build_task_slowdown_cache
+from ltrroe.core.engine import RandomSource
+from ltrroe.core.graph import CompiledGraph
+from ltrroe.core.human_factors import REWORK_FRACTION
+from ltrroe.core.resources import DEFAULT_HOURS_PER_DAY
+from ltrroe.core.sampling import batch_generator
+from ltrroe.core.stats import expected_work_cost, hourly_rates, mean_task_days, order_statistic
+from ltrroe.core.whatif import WhatIfSimulator
+
+# Минимальное сокращение перцентиля (дни), которое считается улучшением
+QUANTILE_TOLERANCE = 1e-9
+
+
+def pareto_front(points: List[Dict]) -> List[Dict]:
+    """Недоминируемые точки {"cost", "quantile", ...} по возрастанию стоимости."""
+    front = []
+    for point in sorted(points, key=lambda p: (p["cost"], p["quantile"])):
+        if not front or point["quantile"] < front[-1]["quantile"] - QUANTILE_TOLERANCE:
+            front.append(point)
+    return front
+
+
+class OutsourcingAnalyzer:
+    """
+    План аутсорсинга проекта: для каждой задачи — своими силами (None) или outs_id.
+    outsources — варианты (по умолчанию project.proj_outsources); require_skills —
+    подрядчик допустим, только если у него есть все навыки задачи.
+    Проект не изменяется, план хранится в analyzer.plan.
+    """
+
+    def __init__(self, project, num_simulations: int = 1000,
+                 rng: RandomSource = None,
+                 graph: Optional[CompiledGraph] = None,
+                 sampling: str = "random",
+                 percentile: float = 0.9,
+                 outsources: Optional[List] = None,
+                 require_skills: bool = True,
+                 rework_fraction: float = REWORK_FRACTION,
+                 hours_per_day: float = DEFAULT_HOURS_PER_DAY):
+        if not 0.0 < percentile < 1.0:
+            raise ValueError(f"percentile должен быть в (0, 1): {percentile}")
+        if rework_fraction < 0:
+            raise ValueError("rework_fraction должен быть неотрицательным")
+        outsources = list(project.proj_outsources if outsources is None else outsources)
+        for outs in outsources:
+            if not 0.0 <= outs.outs_reliability <= 1.0:
+                raise ValueError(f"Надёжность подрядчика {outs.outs_id} вне диапазона 0.0-1.0")
+            if outs.outs_duration_multiplier <= 0 or outs.outs_lead_time_days < 0:
+                raise ValueError(f"Некорректные параметры подрядчика {outs.outs_id}")
+        if graph is None:
+            graph = CompiledGraph(project)
+        self.project = project
+        self.graph = graph
+        self.percentile = percentile
+        self.outsources = outsources
+
+        task_slowdowns = build_task_slowdown_cache(project)
+        slowdowns = np.array([task_slowdowns[task_id] for task_id in graph.task_ids], dtype=np.float64)
+        self.simulator = WhatIfSimulator(project, num_simulations, rng, graph, sampling, task_slowdowns)
+        # Равномерные числа сбоев подрядчиков: строка на задачу, общие для всех вариантов
+        self._failure_u = batch_generator(rng, 1).random((graph.n_tasks, num_simulations))
+
+        mean_days = mean_task_days(project, graph.task_ids)
+        primary = [(project.proj_tasks[task_id].task_assigned_to or [None])[0]
+                   for task_id in graph.task_ids]
+        self._in_house_cost = expected_work_cost(mean_days, slowdowns,
+                                                 hourly_rates(project, primary), hours_per_day)
+
+        self._lead = np.array([float(o.outs_lead_time_days) for o in outsources])
+        self._multiplier = np.array([float(o.outs_duration_multiplier) for o in outsources])
+        self._reliability = np.array([float(o.outs_reliability) for o in outsources])
+        self._rework = rework_fraction
+        # Ожидаемая стоимость пары (задача, подрядчик)
+        self._vendor_cost = (mean_days[:, None] * self._multiplier[None, :]
+                             * (1.0 + rework_fraction * (1.0 - self._reliability[None, :]))
+                             * np.array([float(o.outs_daily_cost) for o in outsources])[None, :])
+
+        # Допустимые подрядчики по индексу задачи
+        self._vendors: List[np.ndarray] = []
+        for task_id in graph.task_ids:
+            required = set(project.proj_tasks[task_id].task_skills or [])
+            self._vendors.append(np.array(
+                [v for v, outs in enumerate(outsources)
+                 if not require_skills or required <= set(outs.outs_skills or [])],
+                dtype=np.intp))
+
+        # Текущий план: -1 — своими силами, иначе индекс подрядчика
+        self._choice = np.full(graph.n_tasks, -1, dtype=np.intp)
+
+    @property
+    def cost(self) -> float:
+        """Ожидаемая стоимость текущего плана."""
+        return float(self._option_cost(np.arange(self.graph.n_tasks), self._choice).sum())
+
+    @property
+    def quantile(self) -> float:
+        return float(order_statistic(self.simulator.baseline, self.percentile))
+
+    @property
+    def plan(self) -> Dict:
+        """task_id -> outs_id для задач, переданных подрядчикам."""
+        return {self.graph.task_ids[j]: self.outsources[v].outs_id
+                for j, v in enumerate(self._choice.tolist()) if v >= 0}
+
+    def _option_cost(self, j, v) -> np.ndarray:
+        return np.where(v >= 0, self._vendor_cost[j, np.maximum(v, 0)], self._in_house_cost[j])
+
+    def _option_durations(self, j: int, v: np.ndarray) -> np.ndarray:
+        """Строки длительностей задачи j для вариантов v (-1 — своими силами): (k, n_simulations)."""
+        task_id = self.graph.task_ids[j]
+        rows = np.empty((len(v), self.simulator.num_simulations))
+        in_house = v < 0
+        if in_house.any():
+            rows[in_house] = self.simulator.task_durations(task_id)
+        vendors = v[~in_house]
+        if len(vendors):
+            base = self.simulator.task_durations(task_id, 1.0)
+            failed = self._failure_u[j] < 1.0 - self._reliability[vendors, None]
+            rows[~in_house] = (self._lead[vendors, None] + base * self._multiplier[vendors, None]
+                               * (1.0 + self._rework * failed))
+        return rows
+
+    def _evaluate(self, j: int) -> Dict[str, np.ndarray]:
+        options = np.concatenate(([-1], self._vendors[j]))
+        quantile = order_statistic(
+            self.simulator.duration_options(self.graph.task_ids[j], self._option_durations(j, options)),
+            self.percentile)
+        cost = self.cost - self._option_cost(j, self._choice[j]) + self._option_cost(j, options)
+        return {"options": options, "quantile": quantile, "cost": cost}
+
+    def evaluate_task(self, task_id) -> Dict:
+        """
+        Все варианты задачи при неизменном остальном плане.
+        Возвращает: {"outs_ids" (None — своими силами), "quantile", "cost"} — по вариантам
+        """
+        result = self._evaluate(self.graph.index[task_id])
+        return {
+            "outs_ids": [None if v < 0 else self.outsources[v].outs_id
+                         for v in result["options"].tolist()],
+            "quantile": result["quantile"],
+            "cost": result["cost"],
+        }
+
+    def sweep(self) -> List[Dict]:
+        """
+        Оценка каждого варианта каждой задачи относительно текущего плана.
+        Возвращает: список {"task_id", "outs_id", "quantile", "cost", "delta_quantile", "delta_cost"}
+        """
+        base_quantile, base_cost = self.quantile, self.cost
+        rows = []
+        for j, task_id in enumerate(self.graph.task_ids):
+            result = self.evaluate_task(task_id)
+            for outs_id, quantile, cost in zip(result["outs_ids"], result["quantile"].tolist(),
+                                               result["cost"].tolist()):
+                rows.append({
+                    "task_id": task_id,
+                    "outs_id": outs_id,
+                    "quantile": quantile,
+                    "cost": cost,
+                    "delta_quantile": quantile - base_quantile,
+                    "delta_cost": cost - base_cost,
+                })
+        return rows
+
+    def set_option(self, task_id, outs_id=None) -> float:
+        """Передать задачу подрядчику outs_id (None — своими силами). Возвращает перцентиль плана."""
+        j = self.graph.index[task_id]
+        if outs_id is None:
+            v = -1
+        else:
+            v = next((v for v in self._vendors[j].tolist() if self.outsources[v].outs_id == outs_id), None)
+            if v is None:
+                raise ValueError(f"Подрядчик {outs_id} недопустим для задачи {task_id}")
+        self._set(j, v)
+        return self.quantile
+
+    def _set(self, j: int, v: int):
+        self._choice[j] = v
+        row = self._option_durations(j, np.array([v], dtype=np.intp))[0]
+        self.simulator.apply(durations={self.graph.task_ids[j]: row})
+
+    def pareto_frontier(self, max_steps: Optional[int] = None) -> List[Dict]:
+        """
+        Жадная кривая стоимость/перцентиль (см. описание модуля) и её граница Парето.
+        Текущий план после расчёта восстанавливается.
+        Возвращает: [{"plan", "cost", "quantile"}, ...] по возрастанию стоимости
+        """
+        initial = self._choice.copy()
+        points = [{"plan": self.plan, "cost": self.cost, "quantile": self.quantile}]
+
+        # Самый дешёвый план: у каждой задачи — вариант с наименьшей стоимостью
+        for j in range(self.graph.n_tasks):
+            options = np.concatenate(([-1], self._vendors[j]))
+            cheapest = int(options[np.argmin(self._option_cost(j, options))])
+            if cheapest != self._choice[j]:
+                self._set(j, cheapest)
+        points.append({"plan": self.plan, "cost": self.cost, "quantile": self.quantile})
+
+        steps = 0
+        while max_steps is None or steps < max_steps:
+            quantile, cost = self.quantile, self.cost
+            best = None
+            for j in range(self.graph.n_tasks):
+                if not len(self._vendors[j]):
+                    continue
+                result = self._evaluate(j)
+                saved = quantile - result["quantile"]
+                useful = saved > QUANTILE_TOLERANCE
+                if not useful.any():
+                    continue
+                price = (result["cost"][useful] - cost) / saved[useful]
+                k = int(np.argmin(price))
+                if best is None or price[k] < best[0]:
+                    best = (float(price[k]), j, int(result["options"][useful][k]))
+            if best is None:
+                break
+            self._set(best[1], best[2])
+            points.append({"plan": self.plan, "cost": self.cost, "quantile": self.quantile})
+            steps += 1
+
+        for j in np.flatnonzero(self._choice != initial).tolist():
+            self._set(j, int(initial[j]))
+        return pareto_front(points)
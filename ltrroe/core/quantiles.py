@@ -0,0 +1,108 @@
+"""
+Потоковая оценка квантилей для Монте-Карло LTRROE
+Постоянная память вместо сортировки полного списка длительностей.
+
+Скетч — гистограмма из n_bins корзин одинаковой ширины. Когда новое значение
+выходит за текущий диапазон, ширина корзины удваивается (соседние корзины
+сливаются попарно), а диапазон расширяется в нужную сторону.
+
+Гарантия точности: квантиль q определяется как в ltrroe.core.stats —
+элемент с индексом int(n * q) отсортированной выборки. Этот элемент всегда лежит
+в найденной корзине, а оценка — середина корзины (с обрезкой по min/max), поэтому
+|оценка - точный квантиль| <= error_bound = bin_width / 2.
+"""
+
+from typing import Iterable, Optional, Union
+
+import numpy as np
+
+from ltrroe.core.stats import order_statistic_index
+
+DEFAULT_BINS = 4096
+
+
+class StreamingQuantiles:
+    """
+    Скетч квантилей с фиксированной памятью O(n_bins).
+    Принимает значения по одному или пакетами (update), отдаёт p10/p50/p90
+    и Schedule Risk Ratio без хранения выборки.
+    """
+
+    def __init__(self, n_bins: int = DEFAULT_BINS):
+        if n_bins < 2 or n_bins % 2:
+            raise ValueError(f"n_bins должно быть чётным и не меньше 2, получено {n_bins}")
+        self.n_bins = n_bins
+        self.counts = np.zeros(n_bins, dtype=np.int64)
+        self.origin = 0.0
+        self.bin_width = 0.0
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def error_bound(self) -> float:
+        """Максимальное отклонение оценки квантиля от точного выборочного значения."""
+        return self.bin_width / 2.0
+
+    def _expand(self, to_left: bool):
+        """Удвоить ширину корзин; старый диапазон занимает нижнюю или верхнюю половину."""
+        half = self.n_bins // 2
+        merged = self.counts.reshape(half, 2).sum(axis=1)
+        self.counts = np.zeros(self.n_bins, dtype=np.int64)
+        if to_left:
+            self.counts[half:] = merged
+            self.origin -= self.n_bins * self.bin_width
+        else:
+            self.counts[:half] = merged
+        self.bin_width *= 2.0
+
+    def update(self, values: Union[float, Iterable[float], np.ndarray]):
+        """Добавить одно значение или пакет значений."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if values.size == 0:
+            return
+        low, high = float(values.min()), float(values.max())
+
+        if self.count == 0:
+            span = high - low
+            self.origin = low
+            self.bin_width = span / (self.n_bins - 1) if span > 0 else max(abs(low), 1.0) * 1e-9
+        while low < self.origin:
+            self._expand(to_left=True)
+        while high >= self.origin + self.n_bins * self.bin_width:
+            self._expand(to_left=False)
+
+        idx = ((values - self.origin) / self.bin_width).astype(np.int64)
+        np.clip(idx, 0, self.n_bins - 1, out=idx)
+        self.counts += np.bincount(idx, minlength=self.n_bins)
+        self.count += values.size
+        self.min = min(self.min, low)
+        self.max = max(self.max, high)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Оценка квантиля q (0..1); None, пока значений нет (как project_level.percentile)."""
+        if self.count == 0:
+            return None
+        rank = order_statistic_index(self.count, q)
+        b = int(np.searchsorted(np.cumsum(self.counts), rank, side="right"))
+        estimate = self.origin + (b + 0.5) * self.bin_width
+        return float(min(max(estimate, self.min), self.max))
+
+    @property
+    def p10(self) -> Optional[float]:
+        return self.quantile(0.10)
+
+    @property
+    def p50(self) -> Optional[float]:
+        return self.quantile(0.50)
+
+    @property
+    def p90(self) -> Optional[float]:
+        return self.quantile(0.90)
+
+    def schedule_risk_ratio(self) -> Optional[float]:
+        """Schedule Risk Ratio = (P90 - P50) / P50; None, пока значений нет."""
+        if self.count == 0:
+            return None
+        p50 = self.p50
+        return (self.p90 - p50) / p50 if p50 else 0.0
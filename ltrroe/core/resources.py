@@ -0,0 +1,232 @@
+"""
+Расписание LTRROE с ограничением ресурсов (parallel schedule generation scheme)
+CPM считает сотрудников бесконечными; здесь каждая задача занимает у своих
+исполнителей часы в день, а сумма часов одновременно идущих задач сотрудника
+не превышает emp_max_daily_hours.
+
+Событийный цикл на очередях с приоритетом (heapq):
+- release — задачи, у которых начались все предшественники (их ограничения
+  известны), по времени готовности и приоритету;
+- running — выполняемые задачи по времени окончания, освобождают часы;
+- parked[e] — задачи, ожидающие часов сотрудника e, по приоритету.
+В момент t готовые задачи запускаются по приоритету, если у всех исполнителей
+хватает часов; иначе задача ждёт первого занятого сотрудника и повторяется только
+при освобождении его часов. Каждая задача проходит очереди O(1) раз (команда
+задачи ограничена), поэтому итерация стоит O((n + m) log n) и годится для
+Монте-Карло. Приоритет по умолчанию — позднее начало CPM (правило LST).
+"""
+
+import heapq
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ltrroe.core.algorithms import build_task_slowdown_cache
+from ltrroe.core.engine import (
+    RandomSource,
+    backward_pass_days,
+    forward_pass_days,
+    sample_durations,
+    task_durations_days,
+)
+from ltrroe.core.graph import CompiledGraph
+from ltrroe.core.sampling import batch_generator
+
+# Часов в день на задачу по умолчанию (не больше ёмкости сотрудника)
+DEFAULT_HOURS_PER_DAY = 8.0
+PRIORITY_RULES = ("lst", "est")
+# Допуск сравнения часов
+HOURS_TOLERANCE = 1e-9
+
+
+class ResourceModel:
+    """
+    Требования задач к сотрудникам в индексной форме CompiledGraph.
+    assignments — объекты Assignment: asg_hours_per_day задаёт часы сотрудника
+    на задаче; для остальных пар (задача, исполнитель) — hours_per_day.
+    """
+
+    def __init__(self, project, graph: CompiledGraph, assignments: Optional[List] = None,
+                 hours_per_day: float = DEFAULT_HOURS_PER_DAY):
+        self.employee_ids: List = list(project.proj_employees.keys())
+        employee_index = {emp_id: e for e, emp_id in enumerate(self.employee_ids)}
+        self.capacity: List[float] = [
+            float(emp.emp_max_daily_hours) for emp in project.proj_employees.values()
+        ]
+
+        planned = {
+            (asg.asg_task_id, asg.asg_emp_id): float(asg.asg_hours_per_day)
+            for asg in assignments or []
+        }
+        # demand[j] — {индекс сотрудника: часов в день} для задачи j
+        self.demand: List[Dict[int, float]] = []
+        for task_id in graph.task_ids:
+            hours = {}
+            for emp_id in project.proj_tasks[task_id].task_assigned_to:
+                e = employee_index.get(emp_id)
+                if e is None:
+                    continue
+                if self.capacity[e] <= 0:
+                    raise ValueError(f"Сотрудник {emp_id} без рабочих часов назначен на задачу {task_id}")
+                hours[e] = min(planned.get((task_id, emp_id), hours_per_day), self.capacity[e])
+            self.demand.append(hours)
+
+
+def _successor_edges(graph: CompiledGraph) -> List[List[Tuple[int, bool, bool, float]]]:
+    edges = [[] for _ in range(graph.n_tasks)]
+    for i, j, from_finish, to_finish, lag in zip(
+            graph.edge_from.tolist(), graph.edge_to.tolist(), graph.edge_from_finish.tolist(),
+            graph.edge_to_finish.tolist(), graph.edge_lag.tolist()):
+        edges[i].append((j, from_finish, to_finish, lag))
+    return edges
+
+
+def _parallel_sgs(durations: List[float], priority: List[float], n_preds: List[int],
+                  succ_edges: List[List], demand: List[Dict[int, float]],
+                  capacity: List[float]) -> Tuple[List[float], List[float]]:
+    """Событийный цикл parallel SGS на Python-списках (одна симуляция)."""
+    n = len(durations)
+    start = [0.0] * n
+    finish = [0.0] * n
+    waiting = list(n_preds)
+    bound = [0.0] * n
+    free = list(capacity)
+    parked = [[] for _ in free]
+    release = [(0.0, priority[j], j) for j in range(n) if not waiting[j]]
+    heapq.heapify(release)
+    running = []
+
+    def try_start(j, t):
+        for e, hours in demand[j].items():
+            if free[e] + HOURS_TOLERANCE < hours:
+                heapq.heappush(parked[e], (priority[j], j))
+                return
+        for e, hours in demand[j].items():
+            free[e] -= hours
+        start[j] = t
+        finish[j] = t + durations[j]
+        heapq.heappush(running, (finish[j], j))
+        for s, from_finish, to_finish, lag in succ_edges[j]:
+            value = (finish[j] if from_finish else t) + lag
+            if to_finish:
+                value -= durations[s]
+            if value > bound[s]:
+                bound[s] = value
+            waiting[s] -= 1
+            if not waiting[s]:
+                heapq.heappush(release, (max(bound[s], t), priority[s], s))
+
+    t = 0.0
+    done = 0
+    while done < n:
+        while release and release[0][0] <= t:
+            _, _, j = heapq.heappop(release)
+            try_start(j, t)
+        if not running and not release:
+            raise ValueError("Расписание с ресурсами зашло в тупик: задачи ждут часов без работающих задач")
+        t = min(running[0][0] if running else float("inf"), release[0][0] if release else float("inf"))
+
+        freed = []
+        while running and running[0][0] <= t:
+            _, j = heapq.heappop(running)
+            done += 1
+            for e, hours in demand[j].items():
+                free[e] += hours
+                freed.append(e)
+        for e in freed:
+            queue = parked[e]
+            # Ожидающие сотрудника e по приоритету, пока часов хватает первому в очереди
+            while queue and free[e] + HOURS_TOLERANCE >= demand[queue[0][1]][e]:
+                _, j = heapq.heappop(queue)
+                try_start(j, t)
+    return start, finish
+
+
+def task_priorities(graph: CompiledGraph, durations: np.ndarray,
+                    rule: Union[str, np.ndarray] = "lst") -> np.ndarray:
+    """
+    Приоритеты задач (меньше — раньше) по детерминированному CPM:
+    lst — позднее начало, est — раннее начало; массив возвращается как есть.
+    """
+    if not isinstance(rule, str):
+        priority = np.asarray(rule, dtype=np.float64)
+        if priority.shape != (graph.n_tasks,):
+            raise ValueError(f"Ожидался массив приоритетов длины {graph.n_tasks}")
+        return priority
+    if rule not in PRIORITY_RULES:
+        raise ValueError(f"Неизвестное правило приоритета {rule}. Допустимые: {PRIORITY_RULES}")
+    early_start, early_finish = forward_pass_days(graph, durations)
+    if rule == "est" or not graph.n_tasks:
+        return early_start
+    return backward_pass_days(graph, early_finish, durations)[0]
+
+
+class ResourceScheduler:
+    """
+    Подготовленный parallel SGS для одного проекта: граф, требования и приоритеты
+    строятся один раз, run() выполняет расписание для вектора длительностей.
+    """
+
+    def __init__(self, project, graph: Optional[CompiledGraph] = None,
+                 assignments: Optional[List] = None,
+                 priority: Union[str, np.ndarray] = "lst",
+                 hours_per_day: float = DEFAULT_HOURS_PER_DAY):
+        if graph is None:
+            graph = CompiledGraph(project)
+        self.graph = graph
+        self.resources = ResourceModel(project, graph, assignments, hours_per_day)
+        self.priority = task_priorities(graph, task_durations_days(project, graph), priority)
+        self._priority = self.priority.tolist()
+        self._n_preds = np.diff(graph.pred_indptr).tolist()
+        self._succ_edges = _successor_edges(graph)
+
+    def _run(self, durations: List[float]) -> Tuple[List[float], List[float]]:
+        return _parallel_sgs(durations, self._priority, self._n_preds, self._succ_edges,
+                             self.resources.demand, self.resources.capacity)
+
+    def run(self, durations: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Возвращает: start, finish — float64 массивы дней по индексу задачи графа"""
+        start, finish = self._run(np.asarray(durations, dtype=np.float64).tolist())
+        return np.asarray(start), np.asarray(finish)
+
+    def project_durations(self, durations: np.ndarray) -> np.ndarray:
+        """Длительности проекта для матрицы (n_simulations, n_tasks) длительностей задач."""
+        return np.array([max(self._run(row)[1], default=0.0)
+                         for row in np.asarray(durations, dtype=np.float64).tolist()])
+
+
+def schedule_resources(project, graph: Optional[CompiledGraph] = None,
+                       assignments: Optional[List] = None,
+                       priority: Union[str, np.ndarray] = "lst"
+                       ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Детерминированное расписание с ограничением ресурсов
+    Возвращает: start, finish, task_duration — как schedule_days
+    """
+    scheduler = ResourceScheduler(project, graph, assignments, priority)
+    durations = task_durations_days(project, scheduler.graph)
+    start, finish = scheduler.run(durations)
+    return start, finish, durations
+
+
+def monte_carlo_resources(project, num_simulations: int = 1000,
+                          task_slowdowns: Optional[Dict] = None,
+                          rng: RandomSource = None,
+                          graph: Optional[CompiledGraph] = None,
+                          sampling: str = "random",
+                          assignments: Optional[List] = None,
+                          priority: Union[str, np.ndarray] = "lst") -> np.ndarray:
+    """
+    Монте-Карло с ограничением ресурсов: длительности сэмплируются как в
+    monte_carlo_batch (тот же rng — те же длительности задач), каждая симуляция
+    планируется parallel SGS с приоритетами детерминированного CPM.
+    Возвращает: ndarray длительностей проекта (в днях)
+    """
+    if not project.proj_tasks or num_simulations <= 0:
+        return np.empty(0, dtype=np.float64)
+    scheduler = ResourceScheduler(project, graph, assignments, priority)
+    if task_slowdowns is None:
+        task_slowdowns = build_task_slowdown_cache(project)
+    durations = sample_durations(project, scheduler.graph.task_ids, num_simulations,
+                                 batch_generator(rng, 0), task_slowdowns, sampling)
+    return scheduler.project_durations(durations)
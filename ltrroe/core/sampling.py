@@ -0,0 +1,60 @@
+"""
+Планы сэмплирования для Монте-Карло LTRROE
+Матрица равномерных чисел (n_simulations, n_tasks) подаётся в обратную функцию
+треугольного распределения, поэтому стратегия выбирается независимо от модели:
+- random      — независимые U(0, 1), как random.random() в эталонной симуляции;
+- lhs         — латинский гиперкуб: в каждом столбце ровно одна точка на страту 1/n;
+- antithetic  — антитетические пары u и 1 - u;
+- sobol       — скремблированная последовательность Соболя (scipy.stats.qmc).
+
+Источник случайности пакетного Монте-Карло — numpy.random.Generator (пакеты идут
+одним потоком) или numpy.random.SeedSequence: тогда у пакета k свой дочерний поток
+(batch_generator), и любой пакет воспроизводится отдельно, без прогона предыдущих.
+"""
+
+import numpy as np
+from scipy.stats import qmc
+
+SAMPLING_METHODS = ("random", "lhs", "antithetic", "sobol")
+
+
+def batch_generator(rng, batch_index: int) -> np.random.Generator:
+    """
+    Генератор для пакета batch_index.
+    rng — Generator (возвращается как есть), SeedSequence (дочерний поток пакета)
+    или None (новый генератор без фиксированного сида).
+    """
+    if isinstance(rng, np.random.SeedSequence):
+        child = np.random.SeedSequence(rng.entropy, spawn_key=tuple(rng.spawn_key) + (batch_index,))
+        return np.random.default_rng(child)
+    if rng is None:
+        return np.random.default_rng()
+    return rng
+
+
+def uniform_design(method: str, num_simulations: int, num_tasks: int,
+                   rng: np.random.Generator) -> np.ndarray:
+    """
+    Сгенерировать матрицу равномерных чисел (num_simulations, num_tasks) по плану method
+    """
+    if method == "random":
+        return rng.random((num_simulations, num_tasks))
+
+    if method == "lhs":
+        strata = np.tile(np.arange(num_simulations), (num_tasks, 1))
+        strata = rng.permuted(strata, axis=1).T
+        return (strata + rng.random((num_simulations, num_tasks))) / num_simulations
+
+    if method == "antithetic":
+        half = rng.random(((num_simulations + 1) // 2, num_tasks))
+        return np.concatenate([half, 1.0 - half])[:num_simulations]
+
+    if method == "sobol":
+        if num_tasks == 0 or num_simulations == 0:
+            return np.empty((num_simulations, num_tasks))
+        sobol = qmc.Sobol(d=num_tasks, scramble=True, seed=rng)
+        # Мощность двойки сохраняет баланс последовательности; лишние точки отбрасываем
+        m = max(0, int(np.ceil(np.log2(num_simulations))))
+        return sobol.random_base2(m)[:num_simulations]
+
+    raise ValueError(f"Неизвестный план сэмплирования: {method}. Допустимые: {SAMPLING_METHODS}")
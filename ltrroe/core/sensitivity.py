@@ -0,0 +1,126 @@
+"""
+Индексы чувствительности задач по результатам Монте-Карло LTRROE
+Накапливаются по пакетам симуляций, полная матрица длительностей не хранится.
+
+- criticality  — доля симуляций, в которых задача была на критическом пути;
+- pearson      — корреляция Пирсона длительности задачи с длительностью проекта;
+                 моменты объединяются по пакетам (формулы Чана), результат точный;
+- spearman     — ранговая корреляция Спирмена; ранги считаются внутри пакета,
+                 коэффициенты усредняются с весом размера пакета (смещение O(1/batch));
+- cruciality   — criticality * |pearson|: как часто задача критична и насколько
+                 сильно её длительность двигает срок проекта.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+from scipy.stats import rankdata
+
+
+def _ranks(values: np.ndarray) -> np.ndarray:
+    """Ранги по первой оси; совпадающим значениям (вырожденные задачи) — средний ранг."""
+    return rankdata(values, axis=0)
+
+
+def _correlation(cov: np.ndarray, var_x: np.ndarray, var_y) -> np.ndarray:
+    """Корреляция по ковариации и дисперсиям; 0 для задач с постоянной длительностью."""
+    denom = np.sqrt(var_x * var_y)
+    safe = np.where(denom > 0, denom, 1.0)
+    return np.where(denom > 0, cov / safe, 0.0)
+
+
+class TaskSensitivity:
+    """
+    Потоковый накопитель индексов чувствительности для n_tasks задач.
+    update() принимает пакет: матрицу длительностей задач (batch, n_tasks),
+    длительности проекта (batch,) и маску критичности (batch, n_tasks).
+    """
+
+    def __init__(self, n_tasks: int):
+        self.n_tasks = n_tasks
+        self.count = 0
+        self.critical_counts = np.zeros(n_tasks, dtype=np.int64)
+        # Средние и суммы квадратов отклонений для Пирсона
+        self._mean_x = np.zeros(n_tasks)
+        self._mean_y = 0.0
+        self._m2_x = np.zeros(n_tasks)
+        self._m2_y = 0.0
+        self._c_xy = np.zeros(n_tasks)
+        # Взвешенная сумма пакетных коэффициентов Спирмена
+        self._spearman_sum = np.zeros(n_tasks)
+        self._spearman_weight = 0
+
+    def update(self, task_durations: np.ndarray, project_durations: np.ndarray,
+               critical: np.ndarray):
+        task_durations = np.asarray(task_durations, dtype=np.float64)
+        project_durations = np.asarray(project_durations, dtype=np.float64)
+        n_b = len(project_durations)
+        if n_b == 0:
+            return
+        if task_durations.shape != (n_b, self.n_tasks):
+            raise ValueError(
+                f"Ожидалась матрица длительностей формы {(n_b, self.n_tasks)}, "
+                f"получено {task_durations.shape}"
+            )
+
+        self.critical_counts += np.asarray(critical, dtype=bool).sum(axis=0)
+
+        mean_x = task_durations.mean(axis=0)
+        mean_y = project_durations.mean()
+        dx = task_durations - mean_x
+        dy = project_durations - mean_y
+        m2_x = (dx * dx).sum(axis=0)
+        m2_y = float(dy @ dy)
+        c_xy = dy @ dx
+
+        n_a = self.count
+        n = n_a + n_b
+        delta_x = mean_x - self._mean_x
+        delta_y = mean_y - self._mean_y
+        self._m2_x += m2_x + delta_x ** 2 * n_a * n_b / n
+        self._m2_y += m2_y + delta_y ** 2 * n_a * n_b / n
+        self._c_xy += c_xy + delta_x * delta_y * n_a * n_b / n
+        self._mean_x += delta_x * n_b / n
+        self._mean_y += delta_y * n_b / n
+        self.count = n
+
+        if n_b > 1:
+            rank_x = _ranks(task_durations)
+            rank_y = _ranks(project_durations)
+            rank_dx = rank_x - rank_x.mean(axis=0)
+            rank_dy = rank_y - rank_y.mean()
+            rho = _correlation(rank_dy @ rank_dx, (rank_dx * rank_dx).sum(axis=0),
+                               float(rank_dy @ rank_dy))
+            self._spearman_sum += rho * n_b
+            self._spearman_weight += n_b
+
+    @property
+    def criticality(self) -> np.ndarray:
+        return self.critical_counts / self.count if self.count else np.zeros(self.n_tasks)
+
+    @property
+    def pearson(self) -> np.ndarray:
+        return _correlation(self._c_xy, self._m2_x, self._m2_y)
+
+    @property
+    def spearman(self) -> np.ndarray:
+        if not self._spearman_weight:
+            return np.zeros(self.n_tasks)
+        return self._spearman_sum / self._spearman_weight
+
+    @property
+    def cruciality(self) -> np.ndarray:
+        return self.criticality * np.abs(self.pearson)
+
+    def summary(self, task_ids: List) -> Dict:
+        """Индексы по задачам: task_id -> {criticality, pearson, spearman, cruciality}"""
+        columns = {
+            "criticality": self.criticality,
+            "pearson": self.pearson,
+            "spearman": self.spearman,
+            "cruciality": self.cruciality,
+        }
+        return {
+            task_id: {name: float(values[i]) for name, values in columns.items()}
+            for i, task_id in enumerate(task_ids)
+        }
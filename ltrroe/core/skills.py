@@ -0,0 +1,192 @@
+"""
+Матрицы навыков LTRROE: замедления всех пар (задача, сотрудник) одной операцией
+SkillMatrix строится один раз на проект:
+- requirement (n_tasks, n_skills)   — сколько раз навык указан в task_skills;
+- has_skill   (n_employees, n_skills) — навык есть в emp_skills;
+- efficiency  (n_employees, n_skills) — emp_efficiency (0.20, если не указана);
+- overload    (n_employees,)         — +5% за час нагрузки сверх emp_max_daily_hours.
+pair_slowdowns повторяет calculate_slowdown_factor для выбранных пар без циклов
+Python: для назначений проекта (assigned_slowdowns, в том числе по ProjectArrays)
+считаются только назначенные пары. Полная матрица slowdown (n_tasks, n_employees)
+строится лениво — она нужна поиску назначений, где кандидаты — все сотрудники.
+
+Команда работает параллельно: скорости участников (1 / slowdown) складываются,
+а координация добавляет COORDINATION_OVERHEAD за каждого участника сверх первого.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ltrroe.core.objects import ProjectArrays
+
+# Штрафы calculate_slowdown_factor
+ALL_MISSING_SLOWDOWN = 3.0
+PARTIAL_MISSING_SLOWDOWN = 2.0
+DEFAULT_EFFICIENCY = 0.20
+MIN_EFFICIENCY = 0.01
+OVERLOAD_PER_HOUR = 0.05
+# Доля времени на координацию за каждого участника команды сверх первого
+COORDINATION_OVERHEAD = 0.15
+# Ячеек (пары x навыки) в одном блоке полной матрицы замедлений
+MAX_PAIR_CELLS = 1 << 22
+
+
+class SkillMatrix:
+    """
+    Навыки и эффективность проекта в матричной форме.
+    project — Project или ProjectArrays; task_ids — порядок строк (по умолчанию
+    порядок задач проекта, как в CompiledGraph).
+    """
+
+    def __init__(self, project, task_ids: Optional[List] = None):
+        if isinstance(project, ProjectArrays):
+            self.task_ids: List = project.task_ids if task_ids is None else list(task_ids)
+            self.employee_ids: List = list(project.employee_ids)
+            task_skills = [project.task_skills[i] for i in project.task_rows(self.task_ids).tolist()]
+            emp_skills, emp_efficiency = project.emp_skills, project.emp_efficiency
+            excess = project.emp_current_load - project.emp_max_daily_hours
+        else:
+            self.task_ids = list(project.proj_tasks) if task_ids is None else list(task_ids)
+            self.employee_ids = list(project.proj_employees)
+            task_skills = [project.proj_tasks[task_id].task_skills for task_id in self.task_ids]
+            employees = list(project.proj_employees.values())
+            emp_skills = [emp.emp_skills for emp in employees]
+            emp_efficiency = [emp.emp_efficiency for emp in employees]
+            excess = np.array([emp.emp_current_load - emp.emp_max_daily_hours for emp in employees],
+                              dtype=np.float64)
+        self.employee_index: Dict = {emp_id: e for e, emp_id in enumerate(self.employee_ids)}
+
+        skills = {}
+        for required in task_skills:
+            for skill in required or []:
+                skills.setdefault(skill, len(skills))
+        for owned in emp_skills:
+            for skill in owned or []:
+                skills.setdefault(skill, len(skills))
+        self.skills: List = list(skills)
+
+        self.requirement = np.zeros((len(task_skills), len(skills)), dtype=np.int64)
+        for t, required in enumerate(task_skills):
+            for skill in required or []:
+                self.requirement[t, skills[skill]] += 1
+
+        self.has_skill = np.zeros((len(emp_skills), len(skills)), dtype=bool)
+        self.efficiency = np.full((len(emp_skills), len(skills)), DEFAULT_EFFICIENCY)
+        for e, (owned, efficiency) in enumerate(zip(emp_skills, emp_efficiency)):
+            for skill in owned or []:
+                self.has_skill[e, skills[skill]] = True
+            for skill, value in (efficiency or {}).items():
+                if skill in skills:
+                    self.efficiency[e, skills[skill]] = value
+
+        self.overload = np.where(excess > 0, 1.0 + excess * OVERLOAD_PER_HOUR, 1.0)
+        self._slowdown: Optional[np.ndarray] = None
+
+    @property
+    def slowdown(self) -> np.ndarray:
+        """
+        Замедление каждой пары (задача, сотрудник): (n_tasks, n_employees).
+        Строится при первом обращении блоками задач (поиск назначений); замедления
+        назначенных пар считаются без него (assigned_slowdowns).
+        """
+        if self._slowdown is None:
+            n_tasks, n_employees = len(self.task_ids), len(self.employee_ids)
+            block = max(1, MAX_PAIR_CELLS // max(1, n_employees * len(self.skills)))
+            self._slowdown = np.empty((n_tasks, n_employees))
+            employees = np.arange(n_employees)
+            for start in range(0, n_tasks, block):
+                tasks = np.arange(start, min(start + block, n_tasks))
+                self._slowdown[tasks] = self.pair_slowdowns(
+                    np.repeat(tasks, n_employees), np.tile(employees, len(tasks))
+                ).reshape(len(tasks), n_employees)
+        return self._slowdown
+
+    def pair_slowdowns(self, tasks: np.ndarray, employees: np.ndarray) -> np.ndarray:
+        """Замедление пар (tasks[k], employees[k]) — индексы строк задач и сотрудников."""
+        tasks = np.asarray(tasks, dtype=np.intp)
+        employees = np.asarray(employees, dtype=np.intp)
+        requirement = self.requirement[tasks]
+        total = requirement.sum(axis=1)
+        missing = (requirement * ~self.has_skill[employees]).sum(axis=1)
+
+        # Минимальная эффективность по требуемым навыкам (если все они есть)
+        masked = np.where(requirement > 0, self.efficiency[employees], np.inf)
+        min_efficiency = np.maximum(masked.min(axis=1, initial=np.inf), MIN_EFFICIENCY)
+
+        safe_total = np.where(total > 0, total, 1)
+        skill_slowdown = np.select(
+            [total == 0, missing == total, missing > 0],
+            [1.0, ALL_MISSING_SLOWDOWN, PARTIAL_MISSING_SLOWDOWN + missing / safe_total * 1.0],
+            default=1.0 / min_efficiency,
+        )
+        return skill_slowdown * self.overload[employees]
+
+    def _assigned_pairs(self, project, primary_only: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """Пары (строка задачи, сотрудник) из task_assigned_to без повторов, по возрастанию."""
+        if isinstance(project, ProjectArrays):
+            task_assigned = [project.assigned_to(i) for i in project.task_rows(self.task_ids).tolist()]
+        else:
+            task_assigned = [project.proj_tasks[task_id].task_assigned_to for task_id in self.task_ids]
+        pairs = []
+        n_employees = len(self.employee_ids)
+        for t, emp_ids in enumerate(task_assigned):
+            for emp_id in emp_ids[:1] if primary_only else emp_ids:
+                e = self.employee_index.get(emp_id)
+                if e is not None:
+                    pairs.append(t * n_employees + e)
+        pairs = np.unique(np.asarray(pairs, dtype=np.intp))
+        return pairs // max(n_employees, 1), pairs % max(n_employees, 1)
+
+    def assignment_matrix(self, project, primary_only: bool = False) -> np.ndarray:
+        """Булева матрица (n_tasks, n_employees) назначений task_assigned_to."""
+        assigned = np.zeros((len(self.task_ids), len(self.employee_ids)), dtype=bool)
+        assigned[self._assigned_pairs(project, primary_only)] = True
+        return assigned
+
+    def assigned_slowdowns(self, project, team: bool = False,
+                           coordination: float = COORDINATION_OVERHEAD) -> np.ndarray:
+        """
+        Замедление задач по назначениям проекта: основной исполнитель (1.0 без него)
+        или вся команда (team=True). Считаются только назначенные пары.
+        """
+        tasks, employees = self._assigned_pairs(project, primary_only=not team)
+        values = self.pair_slowdowns(tasks, employees)
+        n_tasks = len(self.task_ids)
+        return _team_slowdowns(np.bincount(tasks, minlength=n_tasks),
+                               np.bincount(tasks, values, minlength=n_tasks),
+                               np.bincount(tasks, 1.0 / values, minlength=n_tasks), coordination)
+
+    def primary_slowdowns(self, project) -> np.ndarray:
+        """Замедление основного исполнителя (1.0 без исполнителя), как build_task_slowdown_cache."""
+        return self.assigned_slowdowns(project)
+
+    def team_slowdowns(self, assigned: np.ndarray,
+                       coordination: float = COORDINATION_OVERHEAD) -> np.ndarray:
+        """
+        Замедление команд по булевой матрице назначений (n_tasks, n_employees) или
+        пакету матриц (..., n_tasks, n_employees); задача без участников — 1.0.
+        Использует полную матрицу slowdown.
+        """
+        assigned = np.asarray(assigned, dtype=bool)
+        return _team_slowdowns(assigned.sum(axis=-1),
+                               np.where(assigned, self.slowdown, 0.0).sum(axis=-1),
+                               np.where(assigned, 1.0 / self.slowdown, 0.0).sum(axis=-1),
+                               coordination)
+
+
+def _team_slowdowns(size: np.ndarray, single: np.ndarray, rate: np.ndarray,
+                    coordination: float) -> np.ndarray:
+    """size — число участников, single — сумма их замедлений, rate — сумма скоростей."""
+    # Для одного участника — его замедление без обращения скорости (точно)
+    team = (1.0 + coordination * (size - 1)) / np.where(rate > 0, rate, 1.0)
+    return np.select([size == 0, size == 1], [1.0, single], default=team)
+
+
+def team_slowdown(slowdowns: List[float], coordination: float = COORDINATION_OVERHEAD) -> float:
+    """Замедление команды по замедлениям участников (скалярная версия team_slowdowns)."""
+    if not slowdowns:
+        return 1.0
+    if len(slowdowns) == 1:
+        return slowdowns[0]
+    return (1.0 + coordination * (len(slowdowns) - 1)) / sum(1.0 / value for value in slowdowns)
@@ -0,0 +1,46 @@
+"""
+Порядковые статистики и ожидаемая стоимость работ LTRROE
+Перцентиль q выборки из n значений везде в проекте — элемент с индексом int(n * q)
+отсортированной выборки, обрезанным до [0, n - 1]: так считают датасеты и хранилище
+выборок, monte_carlo_adaptive, скетч квантилей, what-if, поиск назначений и аутсорсинг.
+
+Ожидаемая стоимость задачи — среднее треугольного распределения длительности *
+замедление исполнителя * hours_per_day * emp_cost_per_hour.
+"""
+
+from typing import List
+
+import numpy as np
+
+
+def order_statistic_index(n: int, q: float) -> int:
+    """Индекс перцентиля q в отсортированной выборке из n значений."""
+    return min(n - 1, max(0, int(n * q)))
+
+
+def order_statistic(values: np.ndarray, q: float) -> np.ndarray:
+    """Перцентиль q по последней оси без полной сортировки."""
+    k = order_statistic_index(values.shape[-1], q)
+    return np.partition(values, k, axis=-1)[..., k]
+
+
+def mean_task_days(project, task_ids: List) -> np.ndarray:
+    """Средние треугольных распределений длительности задач (дни)."""
+    return np.array([sum(project.proj_tasks[task_id].task_duration_dist) / 3.0
+                     for task_id in task_ids], dtype=np.float64).reshape(-1)
+
+
+def hourly_rates(project, employee_ids: List) -> np.ndarray:
+    """Ставки emp_cost_per_hour; 0 для None и сотрудников не из проекта."""
+    rates = np.zeros(len(employee_ids))
+    for i, emp_id in enumerate(employee_ids):
+        employee = project.proj_employees.get(emp_id) if emp_id is not None else None
+        if employee is not None:
+            rates[i] = employee.emp_cost_per_hour
+    return rates
+
+
+def expected_work_cost(mean_days: np.ndarray, slowdowns: np.ndarray, hourly: np.ndarray,
+                       hours_per_day: float) -> np.ndarray:
+    """Ожидаемая стоимость работ; массивы транслируются (задачи или пары задача-сотрудник)."""
+    return mean_days * slowdowns * hours_per_day * hourly
@@ -17,17 +17,35 @@ import numpy as np
 from math import pi
 from pathlib import Path
 from ltrroe.paths import FILES_DIR, figures
-from typing import Dict, List, Tuple, Optional, Any
+from ltrroe.core.engine import days_to_dates
+from typing import Dict, List, Tuple, Optional, Any, Union
 
 VIS_DIR = figures("arch")
 
-def plot_gantt_chart(project, early_start: Dict, early_finish: Dict, 
-                     late_start: Optional[Dict] = None) -> Tuple[Optional[plt.Figure], Optional[plt.Axes]]:
+Schedule = Union[Dict, np.ndarray]
+
+def _as_dates(project, schedule: Optional[Schedule]) -> Optional[Dict]:
+    """
+    Привести расписание к словарю task_id -> datetime.
+    Числовое расписание (дни от старта по индексу задачи) переводится в даты здесь,
+    на границе визуализации.
+    """
+    if schedule is None or isinstance(schedule, dict):
+        return schedule
+    return days_to_dates(project, schedule)
+
+def plot_gantt_chart(project, early_start: Schedule, early_finish: Schedule, 
+                     late_start: Optional[Schedule] = None) -> Tuple[Optional[plt.Figure], Optional[plt.Axes]]:
     """
     Создать диаграмму Ганта, отображающую задачи как горизонтальные полосы
+    Расписание принимается словарями дат или float-массивами дней от старта.
     Возвращает: (фигура, оси) или (None, None) при ошибке
     """
     try: 
+        early_start = _as_dates(project, early_start)
+        early_finish = _as_dates(project, early_finish)
+        late_start = _as_dates(project, late_start)
+
         fig, ax = plt.subplots(figsize=(12, 8))
         
         # Сортируем задачи по дате начала
@@ -46,7 +64,7 @@ def plot_gantt_chart(project, early_start: Dict, early_finish: Dict,
             start_num = mdates.date2num(start_date)
             end_date = early_finish[task_id]
             end_num = mdates.date2num(end_date)
-            duration_days = (end_date - start_date).days
+            duration_days = (end_date - start_date).total_seconds() / 86400
             
             # Определяем цвет по критичности (1-5)
             color_index = min(task.task_crit - 1, 4) if 1 <= task.task_crit <= 5 else 0
@@ -190,12 +208,16 @@ def plot_monte_carlo_histogram(project_durations: List[float],
     except Exception:
         return None, None
 
-def plot_employee_load_heatmap(project, early_start: Dict, early_finish: Dict) -> Tuple:
+def plot_employee_load_heatmap(project, early_start: Schedule, early_finish: Schedule) -> Tuple:
     """
     Создать тепловую карту загрузки сотрудников по дням проекта
+    Расписание принимается словарями дат или float-массивами дней от старта.
     Возвращает: (фигура, оси, матрица_нагрузки) или (None, None, None) при ошибке
     """
     try:
+        early_start = _as_dates(project, early_start)
+        early_finish = _as_dates(project, early_finish)
+
         # Определяем диапазон дат проекта
         dates_list = list(early_start.values()) + list(early_finish.values())
         if not dates_list:
@@ -0,0 +1,280 @@
+"""
+Монте-Карло "что если" LTRROE на общих случайных числах (CRN)
+WhatIfSimulator один раз сэмплирует равномерные числа и базовый прогон и хранит
+матрицы длительностей, ES и EF по задачам. Сценарий (смена исполнителей или
+распределения длительности задач) пересчитывает длительности только изменённых
+задач из тех же равномерных чисел и forward pass только для их последователей,
+поэтому разница сценария и базы — парная и не тонет в шуме сэмплирования.
+
+Окончание проекта — максимум EF только по задачам-кандидатам: задача со связью
+FS или FF с неотрицательным лагом заканчивается не позже последователя (длительности
+неотрицательны) и на срок не влияет. Интервалы дельт перцентилей — парный бутстрэп;
+перцентиль — порядковая статистика n*q, как в датасетах и monte_carlo_adaptive.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ltrroe.core.algorithms import build_task_slowdown_cache, calculate_slowdown_factor
+from ltrroe.core.engine import RandomSource, forward_pass_days, triangular_inverse_cdf
+from ltrroe.core.graph import CompiledGraph
+from ltrroe.core.sampling import batch_generator, uniform_design
+from ltrroe.core.stats import order_statistic
+
+BOOTSTRAP_SAMPLES = 500
+
+
+def assignee_slowdown(project, task, employee_ids: List) -> float:
+    """Замедление задачи при исполнителях employee_ids, как в build_task_slowdown_cache."""
+    if employee_ids:
+        employee = project.proj_employees.get(employee_ids[0])
+        if employee:
+            return calculate_slowdown_factor(employee, task)
+    return 1.0
+
+
+def paired_quantile_deltas(baseline: np.ndarray, scenario: np.ndarray,
+                           percentiles=(0.5, 0.9), n_bootstrap: int = BOOTSTRAP_SAMPLES,
+                           level: float = 0.95,
+                           rng: Optional[np.random.Generator] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Дельты перцентилей scenario - baseline по парным симуляциям.
+    Интервал — перцентильный бутстрэп: симуляции пересэмплируются парами,
+    поэтому общая случайность базы и сценария в ширину интервала не входит.
+    Возвращает: {"p50": {"baseline", "scenario", "delta", "ci_low", "ci_high"}, ...}
+    """
+    baseline = np.asarray(baseline, dtype=np.float64)
+    scenario = np.asarray(scenario, dtype=np.float64)
+    if baseline.shape != scenario.shape or baseline.ndim != 1 or not len(baseline):
+        raise ValueError("Для парного сравнения нужны непустые выборки одинаковой длины")
+    if rng is None:
+        rng = np.random.default_rng()
+
+    n = len(baseline)
+    resamples = rng.integers(0, n, size=(n_bootstrap, n))
+    base_boot = baseline[resamples]
+    scen_boot = scenario[resamples]
+    alpha = (1.0 - level) / 2.0
+
+    result = {}
+    for q in percentiles:
+        base_q = float(order_statistic(baseline, q))
+        scen_q = float(order_statistic(scenario, q))
+        deltas = order_statistic(scen_boot, q) - order_statistic(base_boot, q)
+        low, high = np.quantile(deltas, [alpha, 1.0 - alpha])
+        result[f"p{round(q * 100)}"] = {
+            "baseline": base_q,
+            "scenario": scen_q,
+            "delta": scen_q - base_q,
+            "ci_low": float(low),
+            "ci_high": float(high),
+        }
+    return result
+
+
+class WhatIfSimulator:
+    """
+    Базовый прогон Монте-Карло с сохранёнными равномерными числами.
+    Матрицы хранятся по задачам: строка j — все симуляции задачи j.
+    baseline совпадает с monte_carlo_batch(project, num_simulations, rng=rng).
+    Проект не изменяется: сценарии задаются словарями, apply() меняет только базу.
+    """
+
+    def __init__(self, project, num_simulations: int = 10000,
+                 rng: RandomSource = None,
+                 graph: Optional[CompiledGraph] = None,
+                 sampling: str = "random",
+                 task_slowdowns: Optional[Dict] = None):
+        if not project.proj_tasks or num_simulations <= 0:
+            raise ValueError("Для анализа \"что если\" нужны задачи и хотя бы одна симуляция")
+        if graph is None:
+            graph = CompiledGraph(project)
+        if task_slowdowns is None:
+            task_slowdowns = build_task_slowdown_cache(project)
+        self.project = project
+        self.graph = graph
+        self.num_simulations = num_simulations
+
+        self._dist = np.array(
+            [project.proj_tasks[task_id].task_duration_dist for task_id in graph.task_ids],
+            dtype=np.float64,
+        ).reshape(graph.n_tasks, 3)
+        self._slowdown = np.array([task_slowdowns.get(task_id, 1.0) for task_id in graph.task_ids],
+                                  dtype=np.float64)
+        self._u = np.ascontiguousarray(
+            uniform_design(sampling, num_simulations, graph.n_tasks, batch_generator(rng, 0)).T)
+
+        self._durations = self._sample(np.arange(graph.n_tasks), self._dist, self._slowdown)
+        early_start, early_finish = forward_pass_days(self.graph, self._durations.T)
+        # forward_pass_days возвращает вид на массивы по задачам — копии не нужны
+        self._es = np.moveaxis(early_start, -1, 0)
+        self._ef = np.moveaxis(early_finish, -1, 0)
+
+        self._position = np.empty(graph.n_tasks, dtype=np.intp)
+        self._position[graph.order] = np.arange(graph.n_tasks)
+        dominated = np.zeros(graph.n_tasks, dtype=bool)
+        dominated[graph.edge_from[graph.edge_from_finish & (graph.edge_lag >= 0)]] = True
+        self._end_candidates = np.flatnonzero(~dominated)
+        self._end_candidate_set = set(self._end_candidates.tolist())
+        self.baseline = self._ef[self._end_candidates].max(axis=0)
+
+    def _sample(self, tasks: np.ndarray, dist: np.ndarray, slowdown: np.ndarray) -> np.ndarray:
+        """Длительности задач tasks (строки) из сохранённых равномерных чисел."""
+        base = triangular_inverse_cdf(dist[:, 0, None], dist[:, 1, None], dist[:, 2, None],
+                                      self._u[tasks])
+        if slowdown.ndim == 2:
+            return base[:, None, :] * slowdown[:, :, None]
+        return base * slowdown[:, None]
+
+    def _changes(self, assignments: Optional[Dict], distributions: Optional[Dict],
+                 slowdowns: Optional[Dict] = None, durations: Optional[Dict] = None
+                 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[int, np.ndarray]]:
+        """Изменённые задачи, их новые распределения, замедления и строки длительностей."""
+        changed = {}
+        for task_id, dist in (distributions or {}).items():
+            changed.setdefault(self.graph.index[task_id], [None, None])[0] = dist
+        for task_id, employee_ids in (assignments or {}).items():
+            task = self.project.proj_tasks[task_id]
+            changed.setdefault(self.graph.index[task_id], [None, None])[1] = assignee_slowdown(
+                self.project, task, employee_ids)
+        for task_id, slowdown in (slowdowns or {}).items():
+            changed.setdefault(self.graph.index[task_id], [None, None])[1] = float(slowdown)
+        for task_id in durations or {}:
+            changed.setdefault(self.graph.index[task_id], [None, None])
+
+        tasks = np.fromiter(changed, dtype=np.intp, count=len(changed))
+        dist = self._dist[tasks].copy()
+        slowdown = self._slowdown[tasks].copy()
+        for row, (new_dist, new_slowdown) in enumerate(changed.values()):
+            if new_dist is not None:
+                dist[row] = np.asarray(new_dist, dtype=np.float64).reshape(3)
+            if new_slowdown is not None:
+                slowdown[row] = new_slowdown
+        rows = dict(zip(tasks.tolist(), self._sample(tasks, dist, slowdown)))
+        for task_id, row in (durations or {}).items():
+            rows[self.graph.index[task_id]] = self._duration_row(row)
+        return tasks, dist, slowdown, rows
+
+    def _duration_row(self, row) -> np.ndarray:
+        row = np.asarray(row, dtype=np.float64)
+        if row.shape[-1:] != (self.num_simulations,):
+            raise ValueError(f"Ожидались длительности по {self.num_simulations} симуляциям")
+        return row
+
+    def _cone(self, tasks: np.ndarray) -> List[int]:
+        """Изменённые задачи и все их последователи в топологическом порядке."""
+        seen = set(tasks.tolist())
+        stack = list(seen)
+        while stack:
+            for s in self.graph.successors(stack.pop()).tolist():
+                if s not in seen:
+                    seen.add(s)
+                    stack.append(s)
+        return sorted(seen, key=self._position.__getitem__)
+
+    def _propagate(self, durations: Dict[int, np.ndarray]):
+        """
+        Forward pass по конусу изменённых задач (индекс -> новая строка длительностей).
+        Строка формы (k, n_simulations) задаёт k вариантов, считаемых одним проходом.
+        Возвращает: (конус, новые строки длительностей, ES, EF, длительности проекта)
+        """
+        graph = self.graph
+        durations = dict(durations)
+        cone = self._cone(np.fromiter(durations, dtype=np.intp, count=len(durations)))
+        es, ef = {}, {}
+        for j in cone:
+            duration = durations.get(j)
+            if duration is None:
+                duration = durations[j] = self._durations[j]
+            start = np.zeros(self.num_simulations)
+            for e_pos in range(graph.pred_indptr[j], graph.pred_indptr[j + 1]):
+                p = graph.pred_indices[e_pos]
+                if graph.pred_from_finish[e_pos]:
+                    anchor = ef[p] if p in ef else self._ef[p]
+                else:
+                    anchor = es[p] if p in es else self._es[p]
+                bound = anchor + graph.pred_lag[e_pos]
+                if graph.pred_to_finish[e_pos]:
+                    bound = bound - duration
+                start = np.maximum(start, bound)
+            es[j] = start
+            ef[j] = start + duration
+
+        changed_end = [ef[j] for j in cone if j in self._end_candidate_set]
+        kept = np.setdiff1d(self._end_candidates, cone, assume_unique=True)
+        project_end = self._ef[kept].max(axis=0) if len(kept) else np.zeros(self.num_simulations)
+        for row in changed_end:
+            project_end = np.maximum(project_end, row)
+        return cone, durations, es, ef, project_end
+
+    def scenario(self, assignments: Optional[Dict] = None,
+                 distributions: Optional[Dict] = None,
+                 slowdowns: Optional[Dict] = None,
+                 durations: Optional[Dict] = None) -> np.ndarray:
+        """
+        Длительности проекта в сценарии, попарно с baseline.
+        assignments — task_id -> список исполнителей (первый — основной);
+        distributions — task_id -> (low, most_likely, high) в днях;
+        slowdowns — task_id -> замедление напрямую (например, из SkillMatrix);
+        durations — task_id -> длительности задачи по симуляциям напрямую.
+        """
+        tasks, _, _, rows = self._changes(assignments, distributions, slowdowns, durations)
+        if not len(tasks):
+            return self.baseline.copy()
+        return self._propagate(rows)[-1]
+
+    def task_durations(self, task_id, slowdown: Optional[float] = None) -> np.ndarray:
+        """Длительности задачи по симуляциям из сохранённых равномерных чисел (slowdown — текущее)."""
+        tasks = np.array([self.graph.index[task_id]], dtype=np.intp)
+        if slowdown is None:
+            slowdown = self._slowdown[tasks]
+        return self._sample(tasks, self._dist[tasks], np.asarray(slowdown, dtype=np.float64).reshape(1))[0]
+
+    def task_options(self, task_id, slowdowns) -> np.ndarray:
+        """
+        Длительности проекта (k, n_simulations) для k вариантов замедления одной задачи
+        (например, всех кандидатов-исполнителей) за один проход по её конусу.
+        """
+        slowdowns = np.asarray(slowdowns, dtype=np.float64).reshape(1, -1)
+        tasks = np.array([self.graph.index[task_id]], dtype=np.intp)
+        return self.duration_options(task_id, self._sample(tasks, self._dist[tasks], slowdowns)[0])
+
+    def duration_options(self, task_id, durations) -> np.ndarray:
+        """
+        Длительности проекта (k, n_simulations) для k вариантов строк длительностей
+        одной задачи (durations — (k, n_simulations)) за один проход по её конусу.
+        """
+        durations = self._duration_row(durations).reshape(-1, self.num_simulations)
+        project_end = self._propagate({self.graph.index[task_id]: durations})[-1]
+        return np.broadcast_to(project_end, durations.shape)
+
+    def compare(self, assignments: Optional[Dict] = None,
+                distributions: Optional[Dict] = None,
+                percentiles=(0.5, 0.9), n_bootstrap: int = BOOTSTRAP_SAMPLES,
+                level: float = 0.95,
+                rng: Optional[np.random.Generator] = None) -> Dict[str, Dict[str, float]]:
+        """Парные дельты перцентилей сценария относительно базы (paired_quantile_deltas)."""
+        return paired_quantile_deltas(self.baseline, self.scenario(assignments, distributions),
+                                      percentiles, n_bootstrap, level, rng)
+
+    def apply(self, assignments: Optional[Dict] = None,
+              distributions: Optional[Dict] = None,
+              slowdowns: Optional[Dict] = None,
+              durations: Optional[Dict] = None) -> np.ndarray:
+        """
+        Сделать сценарий новой базой (например, принятый шаг поиска назначений).
+        Строки durations заменяют длительности, распределение и замедление задачи не меняются.
+        """
+        tasks, dist, slowdown, rows = self._changes(assignments, distributions, slowdowns, durations)
+        if not len(tasks):
+            return self.baseline
+        cone, durations, es, ef, project_end = self._propagate(rows)
+        self._dist[tasks] = dist
+        self._slowdown[tasks] = slowdown
+        for j in cone:
+            self._durations[j] = durations[j]
+            self._es[j] = es[j]
+            self._ef[j] = ef[j]
+        self.baseline = project_end
+        return self.baseline
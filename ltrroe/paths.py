@@ -6,8 +6,14 @@ All generated artifacts live under ``outputs/`` at the repository root:
 
 Raw input data (if any) lives under ``data/``.
 Importing this module ensures the output directories exist.
+
+Synthetic datasets are written and read in ``DATA_FORMAT`` — ``csv`` (default) or
+``parquet`` (typed columnar storage, needs the ``parquet`` extra). Override it with
+the ``LTRROE_DATA_FORMAT`` environment variable and resolve dataset files via
+:func:`dataset` so writers and readers always agree.
 """
 
+import os
 from pathlib import Path
 
 # ltrroe/paths.py -> parents[1] is the repository root
@@ -18,6 +24,11 @@ OUTPUTS = ROOT / "outputs"
 FILES_DIR = OUTPUTS / "files"
 FIG_DIR = OUTPUTS / "figures"
 
+DATA_FORMATS = {"csv": ".csv", "parquet": ".parquet"}
+DATA_FORMAT = os.environ.get("LTRROE_DATA_FORMAT", "csv").lower()
+if DATA_FORMAT not in DATA_FORMATS:
+    raise ValueError(f"LTRROE_DATA_FORMAT must be one of {sorted(DATA_FORMATS)}, got {DATA_FORMAT!r}")
+
 for _d in (DATA_DIR, FILES_DIR, FIG_DIR):
     _d.mkdir(parents=True, exist_ok=True)
 
@@ -27,3 +38,8 @@ def figures(subdir: str) -> Path:
     path = FIG_DIR / subdir
     path.mkdir(parents=True, exist_ok=True)
     return path
+
+
+def dataset(stem: str, fmt: str = None) -> Path:
+    """Return the path of a generated dataset in the configured format, e.g. dataset('synthetic_tasks')."""
+    return FILES_DIR / f"{stem}{DATA_FORMATS[fmt or DATA_FORMAT]}"
@@ -0,0 +1,80 @@
+"""
+Бенчмарк forward pass Монте-Карло LTRROE: по задачам против level-synchronous.
+
+Графы строятся project_level.generate_dependencies:
+- wide_shallow — случайные рёбра между любыми задачами, малая глубина;
+- narrow_deep  — рёбра только между соседними задачами (max_span), глубина ~ n_tasks;
+- typical      — размер синтетических проектов датасета (MAX_TASKS задач).
+Для каждого графа печатается число уровней и время обоих проходов на матрице
+(NUM_SIMULATIONS, n_tasks).
+"""
+
+import argparse
+import time
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+
+from ltrroe.core.engine import _forward_pass_by_task, forward_pass_days
+from ltrroe.core.graph import CompiledGraph
+from ltrroe.core.objects import Project, Task
+from ltrroe.synth.project_level import MAX_TASKS, generate_dependencies
+
+NUM_TASKS = 2000
+NUM_SIMULATIONS = 1000
+REPEATS = 3
+RANDOM_SEED = 27
+
+
+def synthetic_graph(n_tasks: int, max_span=None, min_dependencies=None,
+                    rng: Optional[np.random.Generator] = None) -> CompiledGraph:
+    """Скомпилированный граф проекта из n_tasks задач со случайными зависимостями."""
+    project = Project(proj_id=f"bench_{n_tasks}")
+    project.proj_start_date = datetime(2026, 1, 1)
+    for task_id in range(n_tasks):
+        project.proj_tasks[task_id] = Task(task_id, f"Task_{task_id}", [], 1, 0.0, (1.0, 2.0, 3.0))
+    if min_dependencies is None:
+        min_dependencies = n_tasks
+    project.proj_dependencies = generate_dependencies(
+        list(project.proj_tasks), min_dependencies=min_dependencies, max_span=max_span, rng=rng)
+    return CompiledGraph(project)
+
+
+def bench_shapes(n_tasks: int = NUM_TASKS, seed: int = RANDOM_SEED):
+    rng = np.random.default_rng(seed)
+    return {
+        "wide_shallow": synthetic_graph(n_tasks, rng=rng),
+        "narrow_deep": synthetic_graph(n_tasks, max_span=2, min_dependencies=3 * n_tasks // 2, rng=rng),
+        "typical": synthetic_graph(MAX_TASKS, min_dependencies=MAX_TASKS, rng=rng),
+    }
+
+
+def best_time(func, *args, repeats: int = REPEATS) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-tasks", type=int, default=NUM_TASKS)
+    parser.add_argument("--num-simulations", type=int, default=NUM_SIMULATIONS)
+    parser.add_argument("--seed", type=int, default=RANDOM_SEED)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    rng = np.random.default_rng(args.seed)
+
+    print(f"{'graph':<14}{'tasks':>7}{'edges':>8}{'levels':>8}{'by task, s':>12}{'levels, s':>11}{'speedup':>9}")
+    for name, graph in bench_shapes(args.num_tasks, args.seed).items():
+        durations = rng.uniform(1.0, 10.0, size=(args.num_simulations, graph.n_tasks))
+        by_task = best_time(_forward_pass_by_task, graph, durations)
+        by_level = best_time(forward_pass_days, graph, durations)
+        print(f"{name:<14}{graph.n_tasks:>7}{graph.n_edges:>8}{graph.n_levels:>8}"
+              f"{by_task:>12.4f}{by_level:>11.4f}{by_task / by_level:>8.1f}x")
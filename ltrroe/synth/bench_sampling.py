@@ -0,0 +1,91 @@
+"""
+Бенчмарк планов сэмплирования Монте-Карло LTRROE.
+
+Для каждого плана (random, lhs, antithetic, sobol) P90 оценивается в REPLICATES
+независимых повторах на сетке числа итераций; стандартная ошибка P90 — разброс
+оценок между повторами. Отчёт — минимальное число итераций из сетки, при котором
+SE(P90) не превышает целевой, на create_test_project и синтетических проектах.
+"""
+
+import argparse
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ltrroe.core.engine import monte_carlo_batch
+from ltrroe.core.graph import CompiledGraph
+from ltrroe.core.sampling import SAMPLING_METHODS
+from ltrroe.core.test_data import create_test_project
+from ltrroe.synth.project_level import generate_project, percentile
+
+ITERATION_GRID = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+REPLICATES = 30
+TARGET_SE = 0.1
+NUM_SYNTHETIC = 5
+RANDOM_SEED = 27
+
+
+def p90_standard_error(project, num_simulations: int, sampling: str,
+                       replicates: int = REPLICATES, seed: int = RANDOM_SEED,
+                       graph: Optional[CompiledGraph] = None) -> float:
+    """SE оценки P90 (в днях) по replicates независимым повторам."""
+    if graph is None:
+        graph = CompiledGraph(project)
+    rng = np.random.default_rng(seed)
+    estimates = [
+        percentile(np.sort(monte_carlo_batch(project, num_simulations, rng=rng, graph=graph,
+                                             sampling=sampling)), 0.9)
+        for _ in range(replicates)
+    ]
+    return float(np.std(estimates, ddof=1))
+
+
+def iterations_to_target(project, sampling: str, target_se: float = TARGET_SE,
+                         grid: Sequence[int] = ITERATION_GRID, replicates: int = REPLICATES,
+                         seed: int = RANDOM_SEED) -> Optional[int]:
+    """Минимальное число итераций из grid с SE(P90) <= target_se; None, если не достигнуто."""
+    graph = CompiledGraph(project)
+    for n in grid:
+        if p90_standard_error(project, n, sampling, replicates, seed, graph) <= target_se:
+            return n
+    return None
+
+
+def benchmark(projects: List, target_se: float = TARGET_SE,
+              methods: Sequence[str] = SAMPLING_METHODS,
+              grid: Sequence[int] = ITERATION_GRID,
+              replicates: int = REPLICATES) -> Dict[str, Dict[str, Optional[int]]]:
+    """Таблица project_id -> {план: итераций до целевой SE}."""
+    return {
+        project.proj_id: {
+            method: iterations_to_target(project, method, target_se, grid, replicates)
+            for method in methods
+        }
+        for project in projects
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--target-se", type=float, default=TARGET_SE,
+                        help="целевая стандартная ошибка P90, дни")
+    parser.add_argument("--replicates", type=int, default=REPLICATES)
+    parser.add_argument("--num-synthetic", type=int, default=NUM_SYNTHETIC)
+    parser.add_argument("--seed", type=int, default=RANDOM_SEED)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    generator = np.random.default_rng(args.seed)
+    projects = [create_test_project()] + [
+        generate_project(i + 1, generator) for i in range(args.num_synthetic)
+    ]
+    table = benchmark(projects, args.target_se, replicates=args.replicates)
+
+    print(f"Итераций до SE(P90) <= {args.target_se} дн. (сетка {ITERATION_GRID[0]}..{ITERATION_GRID[-1]})")
+    print(f"{'project':<16}" + "".join(f"{m:>12}" for m in SAMPLING_METHODS))
+    for project_id, row in table.items():
+        cells = "".join(f"{(str(row[m]) if row[m] else '>' + str(ITERATION_GRID[-1])):>12}"
+                        for m in SAMPLING_METHODS)
+        print(f"{str(project_id):<16}{cells}")
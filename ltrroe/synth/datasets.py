@@ -0,0 +1,234 @@
+"""
+Чтение и запись синтетических датасетов LTRROE в CSV или Parquet.
+
+Формат определяется расширением файла (см. ltrroe.paths.dataset). Parquet хранит
+колонки с типизированной схемой (bool mc_success, целые счётчики, float перцентили),
+поэтому читателям не нужно восстанавливать типы после разбора текста.
+Потоковая запись Parquet создаёт каталог-датасет из файлов part-NNNNN.parquet
+(по файлу на чанк); читатели принимают и каталог, и одиночный файл.
+Для Parquet требуется pyarrow: pip install "ltrroe[parquet]".
+"""
+
+import csv
+import os
+import shutil
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow — необязательная зависимость
+    pa = None
+    pq = None
+
+
+CHUNK_SIZE = 500
+# Имя файла чанка в каталоге-датасете Parquet
+PART_NAME = "part-{:05d}.parquet"
+
+if pa is not None:
+    PROJECT_SCHEMA = pa.schema([
+        ("project_id", pa.string()),
+        ("n_tasks", pa.int32()),
+        ("n_employees", pa.int32()),
+        ("n_dependencies", pa.int32()),
+        ("det_duration_days", pa.float64()),
+        ("p10", pa.float64()),
+        ("p50", pa.float64()),
+        ("p90", pa.float64()),
+        ("schedule_risk_ratio", pa.float64()),
+        ("det_vs_p50_delta", pa.float64()),
+        ("critical_path_tasks", pa.int32()),
+        ("avg_employee_efficiency", pa.float64()),
+        ("mc_iterations", pa.int32()),
+        ("mc_success", pa.bool_()),
+        ("error_msg", pa.string()),
+    ])
+
+    TASK_SCHEMA = pa.schema([
+        ("project_id", pa.int64()),
+        ("task_id", pa.int64()),
+        ("planned_optimistic", pa.float64()),
+        ("planned_likely", pa.float64()),
+        ("planned_pessimistic", pa.float64()),
+        ("criticality", pa.int32()),
+        ("cost", pa.float64()),
+        ("num_required_skills", pa.int32()),
+        ("num_assigned", pa.int32()),
+        ("assigned_avg_efficiency", pa.float64()),
+        ("assigned_total_load", pa.float64()),
+        ("num_predecessors", pa.int32()),
+        ("num_successors", pa.int32()),
+        ("actual_duration", pa.float64()),
+        ("primary_slowdown", pa.float64()),
+        ("primary_overload", pa.float64()),
+        ("primary_min_efficiency", pa.float64()),
+        ("primary_miss_ratio", pa.float64()),
+        ("assigned_avg_miss_ratio", pa.float64()),
+        ("assigned_min_efficiency", pa.float64()),
+    ])
+else:
+    PROJECT_SCHEMA = None
+    TASK_SCHEMA = None
+
+
+def is_parquet(path) -> bool:
+    return Path(path).suffix == ".parquet"
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError('Для формата Parquet нужен pyarrow: pip install "ltrroe[parquet]"')
+
+
+def dataset_parts(path) -> List[Path]:
+    """
+    Файлы Parquet-датасета по порядку: сам файл или завершённые чанки каталога.
+    Недописанные чанки (временные файлы с точкой в начале имени) не входят.
+    """
+    path = Path(path)
+    if not path.is_dir():
+        return [path] if path.exists() else []
+    parts = [part for part in path.glob("part-*.parquet") if part.stem[len("part-"):].isdigit()]
+    return sorted(parts, key=lambda part: int(part.stem[len("part-"):]))
+
+
+def read_dataset(path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Прочитать датасет в DataFrame; формат определяется по расширению."""
+    if is_parquet(path):
+        _require_pyarrow()
+        parts = dataset_parts(path)
+        if not parts:
+            raise FileNotFoundError(f"Датасет {path} не найден или пуст")
+        return pa.concat_tables(pq.read_table(part, columns=columns) for part in parts).to_pandas()
+    return pd.read_csv(path, usecols=columns)
+
+
+def dataset_columns(path) -> List[str]:
+    """Имена колонок датасета без чтения данных (пустой список — данных ещё нет)."""
+    if is_parquet(path):
+        _require_pyarrow()
+        parts = dataset_parts(path)
+        return pq.read_schema(parts[0]).names if parts else []
+    with open(path, newline="", encoding="utf-8") as f:
+        return next(csv.reader(f), [])
+
+
+def write_dataset(df: pd.DataFrame, path, schema=None):
+    """Записать DataFrame целиком; для Parquet колонки приводятся к schema."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if is_parquet(path):
+        _require_pyarrow()
+        if path.is_dir():
+            shutil.rmtree(path)
+        table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+        pq.write_table(table, path)
+    else:
+        df.to_csv(path, index=False)
+
+
+class ChunkedCsvWriter:
+    """
+    Потоковая запись строк датасета.
+    Строки копятся в буфере и сбрасываются на диск (с fsync) каждые chunk_size строк,
+    поэтому память не растёт с числом проектов, а при сбое теряется не больше одного чанка.
+    """
+
+    def __init__(self, path, fieldnames, chunk_size=CHUNK_SIZE, append=False):
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        self._buffer = []
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a" if append else "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=fieldnames, extrasaction="ignore")
+        if not append:
+            self._writer.writeheader()
+
+    def write(self, row):
+        self._buffer.append(row)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        self._writer.writerows(self._buffer)
+        self._buffer.clear()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ChunkedParquetWriter:
+    """
+    Потоковая запись в Parquet: каждый чанк — отдельный файл part-NNNNN.parquet
+    в каталоге path. Parquet без футера нечитаем, поэтому чанк пишется во временный
+    файл, fsync-ается и переименовывается: после сбоя остаются все завершённые чанки,
+    а дозапись (append) добавляет новые файлы, не перечитывая старые.
+    """
+
+    def __init__(self, path, schema, chunk_size=CHUNK_SIZE, append=False):
+        _require_pyarrow()
+        self.path = Path(path)
+        self.schema = schema
+        self.chunk_size = chunk_size
+        self._buffer = []
+        if self.path.is_file():
+            if append:
+                # Одиночный файл (write_dataset) становится первым чанком каталога
+                legacy = self.path.with_name(self.path.name + ".legacy")
+                os.replace(self.path, legacy)
+                self.path.mkdir()
+                os.replace(legacy, self.path / PART_NAME.format(0))
+            else:
+                self.path.unlink()
+        elif self.path.is_dir() and not append:
+            shutil.rmtree(self.path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        for stale in self.path.glob(".part-*"):
+            stale.unlink()
+        self._next_part = len(dataset_parts(self.path))
+
+    def write(self, row):
+        self._buffer.append(row)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        name = PART_NAME.format(self._next_part)
+        tmp_path = self.path / f".{name}.tmp"
+        pq.write_table(pa.Table.from_pylist(self._buffer, schema=self.schema), tmp_path)
+        with open(tmp_path, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path / name)
+        self._next_part += 1
+        self._buffer.clear()
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_row_writer(path, fieldnames, schema=None, chunk_size=CHUNK_SIZE, append=False):
+    """Открыть потоковый writer нужного формата."""
+    if is_parquet(path):
+        return ChunkedParquetWriter(path, schema, chunk_size, append=append)
+    return ChunkedCsvWriter(path, fieldnames, chunk_size, append=append)
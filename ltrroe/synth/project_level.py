@@ -2,23 +2,45 @@
 Генератор синтетического датасета LTRROE на уровне проектов.
 
 Выходной CSV совместим по основным колонкам с metrics_results_full.csv:
-одна строка = один проект, а не одна задача.
+одна строка = один проект, а не одна задача. При LTRROE_DATA_FORMAT=parquet
+(или --output *.parquet) датасет пишется в Parquet с типизированной схемой.
 """
 
 import argparse
-import csv
-import random
+import os
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import partial
+from itertools import chain
 from pathlib import Path
-from ltrroe.paths import FILES_DIR, figures
+from ltrroe.paths import FILES_DIR, dataset
 from statistics import mean
 
+import numpy as np
+
 from ltrroe.core.objects import Project, Employee, Task, Dependency
-from ltrroe.core.algorithms import (
-    calculate_backward_pass,
-    calculate_schedule,
-    monte_carlo_simulation,
+from ltrroe.core.batch import MAX_BATCH_CELLS, ProjectBatch, simulate_many
+from ltrroe.core.engine import (
+    float_analysis,
+    monte_carlo_adaptive,
+    monte_carlo_batch,
+    monte_carlo_sketch,
+    schedule_days,
+)
+from ltrroe.core.graph import CompiledGraph
+from ltrroe.core.stats import order_statistic_index
+from ltrroe.synth.datasets import (
+    CHUNK_SIZE,
+    PROJECT_SCHEMA,
+    dataset_columns,
+    dataset_parts,
+    is_parquet,
+    open_row_writer,
+    read_dataset,
 )
+from ltrroe.synth.sample_store import SAMPLE_DTYPE, SampleStore
 
 
 RANDOM_SEED = 27
@@ -29,8 +51,11 @@ MAX_TASKS = 30
 MIN_EMPLOYEES = 3
 MAX_EMPLOYEES = 15
 MIN_DEPENDENCIES = 3
+ADAPTIVE_BATCH_SIZE = 500
+PACK_SIZE = 64
 
-OUTPUT_CSV = FILES_DIR / "synthetic_project_metrics.csv"
+OUTPUT_PATH = dataset("synthetic_project_metrics")
+SAMPLES_DIR = FILES_DIR / "mc_samples"
 
 SKILL_POOL = [
     "Python", "Java", "JavaScript", "C++", "SQL", "DevOps",
@@ -46,80 +71,97 @@ CSV_FIELDS = [
     "det_vs_p50_delta",
     "critical_path_tasks",
     "avg_employee_efficiency",
+    "mc_iterations",
     "mc_success",
     "error_msg",
 ]
 
 
-def random_skills(max_skills=4):
-    return random.sample(SKILL_POOL, k=random.randint(1, max_skills))
+def _generator(rng):
+    return rng if rng is not None else np.random.default_rng()
+
 
+def random_skills(rng, max_skills=4):
+    k = int(rng.integers(1, max_skills + 1))
+    return [SKILL_POOL[i] for i in rng.choice(len(SKILL_POOL), size=k, replace=False)]
 
-def random_efficiency(skills):
-    return {skill: round(random.uniform(0.6, 1.4), 2) for skill in skills}
 
+def random_efficiency(skills, rng):
+    return {skill: round(float(rng.uniform(0.6, 1.4)), 2) for skill in skills}
 
-def random_triple(low=1.0, high=18.0):
+
+def random_triple(rng, low=1.0, high=18.0):
     """PERT-триплет в днях: optimistic <= likely <= pessimistic."""
-    optimistic = round(random.uniform(low, high * 0.65), 2)
-    likely = round(random.uniform(optimistic, high * 0.9), 2)
-    pessimistic = round(random.uniform(likely + 0.1, high), 2)
+    optimistic = round(float(rng.uniform(low, high * 0.65)), 2)
+    likely = round(float(rng.uniform(optimistic, high * 0.9)), 2)
+    pessimistic = round(float(rng.uniform(likely + 0.1, high)), 2)
     return optimistic, likely, pessimistic
 
 
-def generate_dependencies(task_ids, min_dependencies=MIN_DEPENDENCIES):
-    """Случайный DAG: зависимости только от меньшего task_id к большему."""
+def generate_dependencies(task_ids, min_dependencies=MIN_DEPENDENCIES, max_span=None, rng=None):
+    """
+    Случайный DAG: зависимости только от меньшего task_id к большему.
+    max_span ограничивает расстояние между концами ребра в списке task_ids:
+    малый span даёт узкий и глубокий граф (span=1 — цепочка).
+    rng — numpy.random.Generator (по умолчанию новый, без фиксированного сида).
+    """
+    rng = _generator(rng)
     possible_edges = [
         (from_id, to_id)
         for i, from_id in enumerate(task_ids)
-        for to_id in task_ids[i + 1:]
+        for to_id in task_ids[i + 1:None if max_span is None else i + 1 + max_span]
     ]
     max_edges = len(possible_edges)
     if max_edges < min_dependencies:
         return []
 
-    upper = min(max_edges, max(min_dependencies, round(len(task_ids) * random.uniform(0.6, 1.4))))
-    n_dependencies = random.randint(min_dependencies, upper)
-    sampled_edges = random.sample(possible_edges, n_dependencies)
+    upper = min(max_edges, max(min_dependencies, round(len(task_ids) * rng.uniform(0.6, 1.4))))
+    n_dependencies = int(rng.integers(min_dependencies, upper + 1))
+    sampled = rng.choice(max_edges, size=n_dependencies, replace=False)
 
     return [
         Dependency(
-            dep_from_task=from_id,
-            dep_to_task=to_id,
+            dep_from_task=possible_edges[k][0],
+            dep_to_task=possible_edges[k][1],
             dep_type="FS",
             dep_lag=0.0,
             dep_mandatory=True,
         )
-        for from_id, to_id in sampled_edges
+        for k in sampled
     ]
 
 
-def generate_project(proj_id):
+def generate_project(proj_id, rng=None):
+    """
+    Случайный проект. Все случайные величины берутся из rng (numpy.random.Generator),
+    поэтому проект определяется только состоянием генератора.
+    """
+    rng = _generator(rng)
     project = Project(proj_id=f"synth_{proj_id}")
     project.proj_start_date = datetime(2026, 1, 1)
 
-    for emp_id in range(random.randint(MIN_EMPLOYEES, MAX_EMPLOYEES)):
-        skills = random_skills(max_skills=4)
+    for emp_id in range(int(rng.integers(MIN_EMPLOYEES, MAX_EMPLOYEES + 1))):
+        skills = random_skills(rng, max_skills=4)
         emp = Employee(
             emp_id=emp_id,
             emp_name=f"Employee_{emp_id}",
             emp_skills=skills,
-            emp_error_prob=round(random.uniform(0.05, 0.30), 2),
-            emp_cost_per_hour=round(random.uniform(20.0, 80.0), 2),
-            emp_efficiency=random_efficiency(skills),
+            emp_error_prob=round(float(rng.uniform(0.05, 0.30)), 2),
+            emp_cost_per_hour=round(float(rng.uniform(20.0, 80.0)), 2),
+            emp_efficiency=random_efficiency(skills, rng),
         )
-        emp.emp_max_daily_hours = random.uniform(4, 12)
+        emp.emp_max_daily_hours = float(rng.uniform(4, 12))
         emp.emp_current_load = 0.0
         project.proj_employees[emp.emp_id] = emp
 
-    for task_id in range(random.randint(MIN_TASKS, MAX_TASKS)):
+    for task_id in range(int(rng.integers(MIN_TASKS, MAX_TASKS + 1))):
         task = Task(
             task_id=task_id,
             task_name=f"Task_{task_id}",
-            task_skills=random_skills(max_skills=3),
-            task_crit=random.randint(1, 5),
-            task_cost=round(random.uniform(100, 2000), 2),
-            task_duration_dist=random_triple(),
+            task_skills=random_skills(rng, max_skills=3),
+            task_crit=int(rng.integers(1, 6)),
+            task_cost=round(float(rng.uniform(100, 2000)), 2),
+            task_duration_dist=random_triple(rng),
         )
         project.proj_tasks[task.task_id] = task
 
@@ -130,25 +172,25 @@ def generate_project(proj_id):
             if set(task.task_skills) & set(emp.emp_skills)
         ] or employees
 
-        assigned = random.sample(candidates, random.randint(1, min(3, len(candidates))))
-        for emp in assigned:
+        n_assigned = int(rng.integers(1, min(3, len(candidates)) + 1))
+        for k in rng.choice(len(candidates), size=n_assigned, replace=False):
+            emp = candidates[k]
             task.task_assigned_to.append(emp.emp_id)
             emp.emp_assigned_tasks.append(task.task_id)
-            emp.emp_current_load += round(random.uniform(1.0, 5.0), 1)
+            emp.emp_current_load += round(float(rng.uniform(1.0, 5.0)), 1)
 
-    project.proj_dependencies = generate_dependencies(list(project.proj_tasks.keys()))
+    project.proj_dependencies = generate_dependencies(list(project.proj_tasks.keys()), rng=rng)
     return project
 
 
 def percentile(sorted_values, q):
-    if not sorted_values:
+    if len(sorted_values) == 0:
         return None
-    idx = min(len(sorted_values) - 1, max(0, int(len(sorted_values) * q)))
-    return sorted_values[idx]
+    return sorted_values[order_statistic_index(len(sorted_values), q)]
 
 
-def project_to_metrics(project, num_simulations):
-    row = {
+def _project_row(project):
+    return {
         "project_id": getattr(project, "proj_id", None),
         "n_tasks": len(project.proj_tasks),
         "n_employees": len(project.proj_employees),
@@ -157,41 +199,81 @@ def project_to_metrics(project, num_simulations):
         "error_msg": None,
     }
 
-    try:
-        early_start, early_finish, task_duration = calculate_schedule(project)
-        det_duration = (max(early_finish.values()) - project.proj_start_date).days
-        row["det_duration_days"] = det_duration
-
-        late_start, _ = calculate_backward_pass(project, early_finish, task_duration)
-        row["critical_path_tasks"] = sum(
-            1 for tid in project.proj_tasks
-            if tid in early_start and tid in late_start
-            and (late_start[tid] - early_start[tid]).total_seconds() < 1
-        )
 
-        eff_values = [
-            mean(emp.emp_efficiency.values())
-            for emp in project.proj_employees.values()
-            if emp.emp_efficiency
-        ]
-        row["avg_employee_efficiency"] = round(mean(eff_values), 4) if eff_values else None
+def _schedule_metrics(row, project, det_end, critical_count):
+    """Детерминированная часть строки: срок CPM, критический путь, эффективность."""
+    det_duration = round(float(det_end), 2)
+    row["det_duration_days"] = det_duration
+    row["critical_path_tasks"] = int(critical_count)
 
-        sims = monte_carlo_simulation(project, num_simulations=num_simulations)
-        if not sims:
-            row["error_msg"] = "MC returned empty list"
+    eff_values = [
+        mean(emp.emp_efficiency.values())
+        for emp in project.proj_employees.values()
+        if emp.emp_efficiency
+    ]
+    row["avg_employee_efficiency"] = round(mean(eff_values), 4) if eff_values else None
+    return det_duration
+
+
+def _risk_metrics(row, det_duration, p10, p50, p90):
+    row["p10"] = p10
+    row["p50"] = p50
+    row["p90"] = p90
+    row["schedule_risk_ratio"] = round((p90 - p50) / p50, 4) if p50 else 0.0
+    row["det_vs_p50_delta"] = round(p50 - det_duration, 2)
+    row["mc_success"] = True
+
+
+def _sample_metrics(row, det_duration, sims, keep_samples):
+    """Перцентили по полной выборке МК; False, если выборка пуста."""
+    row["mc_iterations"] = len(sims)
+    if not len(sims):
+        row["error_msg"] = "MC returned empty list"
+        return False
+
+    sorted_sims = np.sort(sims)
+    p10, p50, p90 = (round(float(percentile(sorted_sims, q)), 2) for q in (0.10, 0.50, 0.90))
+    _risk_metrics(row, det_duration, p10, p50, p90)
+    if keep_samples:
+        # Полная выборка уходит в SampleStore, в датасет не пишется
+        row["samples"] = sims.astype(SAMPLE_DTYPE)
+    return True
+
+
+def project_to_metrics(project, num_simulations, rng=None, keep_samples=False, rel_tol=None,
+                       use_sketch=False):
+    """
+    Метрики одного проекта. При rel_tol МК адаптивный: num_simulations — верхний
+    бюджет, фактическое число итераций пишется в mc_iterations. При use_sketch
+    перцентили считаются потоковым скетчем без хранения выборки.
+    """
+    row = _project_row(project)
+
+    try:
+        graph = CompiledGraph(project)
+        early_start, early_finish, task_duration = schedule_days(project, graph)
+        # Нулевой резерв времени с точностью до секунды
+        _, _, critical = float_analysis(graph, early_start, early_finish, task_duration)
+        det_duration = _schedule_metrics(row, project, early_finish.max(), critical.sum())
+
+        if use_sketch:
+            sketch = monte_carlo_sketch(project, num_simulations=num_simulations, rng=rng, graph=graph)
+            row["mc_iterations"] = sketch.count
+            if not sketch.count:
+                row["error_msg"] = "MC returned empty list"
+                return row
+            p10, p50, p90 = (round(sketch.quantile(q), 2) for q in (0.10, 0.50, 0.90))
+            _risk_metrics(row, det_duration, p10, p50, p90)
             return row
 
-        sorted_sims = sorted(sims)
-        p10 = percentile(sorted_sims, 0.10)
-        p50 = percentile(sorted_sims, 0.50)
-        p90 = percentile(sorted_sims, 0.90)
-
-        row["p10"] = p10
-        row["p50"] = p50
-        row["p90"] = p90
-        row["schedule_risk_ratio"] = round((p90 - p50) / p50, 4) if p50 else 0.0
-        row["det_vs_p50_delta"] = p50 - det_duration
-        row["mc_success"] = True
+        if rel_tol is None:
+            sims = monte_carlo_batch(project, num_simulations=num_simulations, rng=rng, graph=graph)
+        else:
+            sims, _ = monte_carlo_adaptive(
+                project, rel_tol=rel_tol, batch_size=ADAPTIVE_BATCH_SIZE,
+                max_simulations=num_simulations, rng=rng, graph=graph,
+            )
+        _sample_metrics(row, det_duration, sims, keep_samples)
         return row
 
     except Exception as exc:
@@ -199,38 +281,232 @@ def project_to_metrics(project, num_simulations):
         return row
 
 
-def build_dataset(num_projects, num_simulations, output_csv):
-    rows = []
-    attempts = 0
-    ok = 0
-
-    while len(rows) < num_projects:
-        attempts += 1
-        project = generate_project(attempts)
-        if len(project.proj_dependencies) < MIN_DEPENDENCIES:
-            continue
+def projects_to_metrics(projects, num_simulations, seeds, keep_samples=False):
+    """
+    Метрики пакета проектов: CPM, резервы и МК всех проектов одним проходом
+    (ltrroe.core.batch). seeds[k] — SeedSequence МК проекта k; строки совпадают
+    с project_to_metrics(projects[k], rng=default_rng(seeds[k])). Если пакет не
+    собирается (ошибка в одном из проектов), проекты считаются по одному.
+    """
+    try:
+        if num_simulations <= 0:
+            raise ValueError("Пустой бюджет МК")
+        batch = ProjectBatch(projects)
+        early_start, early_finish, task_duration = batch.schedule()
+        _, _, critical = batch.float_analysis(early_start, early_finish, task_duration)
+        det_ends = batch.project_max(early_finish)
+        critical_counts = np.add.reduceat(critical, batch.offsets[:-1])
+        sims = simulate_many(projects, num_simulations,
+                             rng=[np.random.default_rng(seq) for seq in seeds], graphs=batch.graphs)
+    except Exception:
+        return [
+            project_to_metrics(project, num_simulations, rng=np.random.default_rng(seq),
+                               keep_samples=keep_samples)
+            for project, seq in zip(projects, seeds)
+        ]
 
-        row = project_to_metrics(project, num_simulations)
+    rows = []
+    for project, det_end, critical_count, project_sims in zip(projects, det_ends, critical_counts, sims):
+        row = _project_row(project)
+        det_duration = _schedule_metrics(row, project, det_end, critical_count)
+        _sample_metrics(row, det_duration, project_sims, keep_samples)
         rows.append(row)
-        if row["mc_success"]:
-            ok += 1
-        if len(rows) % 100 == 0 or len(rows) == num_projects:
-            print(f"  [{len(rows)}/{num_projects}] успешно={ok}")
-
-    output_csv.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_csv, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
-        writer.writeheader()
-        writer.writerows(rows)
-
-    ok_rows = [row for row in rows if row["mc_success"]]
-    print(f"\nСохранено: {output_csv}")
-    print(f"Итого: {len(rows)} проектов, успешный МК: {len(ok_rows)}")
-    if ok_rows:
+    return rows
+
+
+def project_seeds(seed, index):
+    """
+    Независимые потоки проекта: генератор и Монте-Карло (дочерние SeedSequence).
+    Зависят только от --seed и номера проекта, а не от порядка выполнения,
+    поэтому любой проект восстанавливается отдельно за O(1).
+    """
+    generator_seq, mc_seq = np.random.SeedSequence(seed, spawn_key=(index,)).spawn(2)
+    return generator_seq, mc_seq
+
+
+def indexed_project(index, seed):
+    """Проект с номером index и SeedSequence его Монте-Карло."""
+    generator_seq, mc_seq = project_seeds(seed, index)
+    rng = np.random.default_rng(generator_seq)
+
+    # Повторяем генерацию, пока не наберётся достаточно зависимостей
+    project = generate_project(index + 1, rng)
+    while len(project.proj_dependencies) < MIN_DEPENDENCIES:
+        project = generate_project(index + 1, rng)
+    return project, mc_seq
+
+
+def simulate_indexed_project(index, num_simulations, seed, keep_samples=False, rel_tol=None,
+                             use_sketch=False):
+    """Сгенерировать и просимулировать проект с номером index (запускается в воркере)."""
+    project, mc_seq = indexed_project(index, seed)
+    return project_to_metrics(project, num_simulations, rng=np.random.default_rng(mc_seq),
+                              keep_samples=keep_samples, rel_tol=rel_tol, use_sketch=use_sketch)
+
+
+def simulate_indexed_projects(indexes, num_simulations, seed, keep_samples=False, rel_tol=None,
+                              use_sketch=False):
+    """
+    Строки для группы номеров проектов. Обычный МК считается одним пакетом
+    (projects_to_metrics); адаптивный, скетч и группа из одного проекта — по проекту.
+    """
+    if rel_tol is not None or use_sketch or len(indexes) == 1:
+        return [
+            simulate_indexed_project(index, num_simulations, seed, keep_samples=keep_samples,
+                                     rel_tol=rel_tol, use_sketch=use_sketch)
+            for index in indexes
+        ]
+    projects, seeds = zip(*(indexed_project(index, seed) for index in indexes))
+    return projects_to_metrics(list(projects), num_simulations, list(seeds), keep_samples=keep_samples)
+
+
+def pack_size(num_simulations, workers, remaining):
+    """
+    Проектов в одной группе воркера: пакет имеет смысл, только если в MAX_BATCH_CELLS
+    помещается больше одного проекта из MAX_TASKS задач; при этом каждому воркеру
+    должна достаться хотя бы одна группа.
+    """
+    fits = MAX_BATCH_CELLS // max(1, MAX_TASKS * num_simulations)
+    per_worker = -(-remaining // max(1, workers))
+    return max(1, min(PACK_SIZE, fits, per_worker))
+
+
+def _ordered_imap(executor, fn, items, max_pending):
+    """
+    Как executor.map, но в работе не больше max_pending заданий: пул загружен
+    непрерывно (без барьера на каждый чанк), а память не растёт с числом заданий.
+    Результаты возвращаются в порядке items.
+    """
+    pending = deque()
+    try:
+        for item in items:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _truncate_partial_line(path):
+    """Отрезать недописанную последнюю строку (если запись прервалась посреди строки)."""
+    with open(path, "rb+") as f:
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(0, size - 65536))
+        tail = f.read()
+        last_newline = tail.rfind(b"\n")
+        if last_newline < 0:
+            f.truncate(0)
+        else:
+            f.truncate(size - len(tail) + last_newline + 1)
+
+
+def read_resume_state(output):
+    """
+    Подготовить частично записанный датасет к продолжению.
+    Возвращает: (число завершённых проектов, их schedule_risk_ratio при успешном МК)
+    """
+    output = Path(output)
+    if not output.exists():
+        return 0, []
+
+    if is_parquet(output):
+        if not dataset_parts(output):
+            return 0, []
+    else:
+        _truncate_partial_line(output)
+        if output.stat().st_size == 0:
+            return 0, []
+
+    if dataset_columns(output) != CSV_FIELDS:
+        raise ValueError(f"Невозможно продолжить {output}: другой набор колонок")
+
+    df = read_dataset(output, columns=["project_id", "mc_success", "schedule_risk_ratio"])
+    expected = [f"synth_{index + 1}" for index in range(len(df))]
+    mismatched = [
+        (want, got) for want, got in zip(expected, df["project_id"].astype(str)) if want != got
+    ]
+    if mismatched:
+        want, got = mismatched[0]
+        raise ValueError(f"Невозможно продолжить {output}: ожидался {want}, найден {got}")
+
+    success = df["mc_success"].astype(str) == "True"
+    return len(df), df.loc[success, "schedule_risk_ratio"].astype(float).tolist()
+
+
+def build_dataset(num_projects, num_simulations, output, seed=RANDOM_SEED, workers=1,
+                  chunk_size=CHUNK_SIZE, resume=False, samples_dir=None, rel_tol=None,
+                  use_sketch=False):
+    if use_sketch and (samples_dir is not None or rel_tol is not None):
+        raise ValueError("Скетч квантилей не хранит выборку: несовместим с --store-samples и --adaptive")
+
+    done, ratios = read_resume_state(output) if resume else (0, [])
+    append = resume and Path(output).exists() and Path(output).stat().st_size > 0
+    risk_ratios = array("d", ratios)
+    if done:
+        print(f"  Продолжение с проекта {done + 1}/{num_projects}")
+
+    store = SampleStore(samples_dir) if samples_dir is not None else None
+    if store is not None:
+        if resume:
+            # Выборки пишутся раньше строк датасета, поэтому хранилище может только опережать его
+            expected = [f"synth_{index + 1}" for index in range(done)]
+            if store.project_ids[:done] != expected:
+                raise ValueError(
+                    f"Хранилище выборок {samples_dir} не согласовано с датасетом: "
+                    f"в нём {len(store)} проектов, в датасете {done}"
+                )
+            store.truncate(expected)
+        elif len(store):
+            raise ValueError(f"Хранилище выборок {samples_dir} не пусто; используйте --resume")
+
+    worker = partial(simulate_indexed_projects, num_simulations=num_simulations, seed=seed,
+                     keep_samples=store is not None, rel_tol=rel_tol, use_sketch=use_sketch)
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        with open_row_writer(output, CSV_FIELDS, PROJECT_SCHEMA, chunk_size, append=append) as writer:
+            # Малые проекты при малом бюджете МК считаются пакетами за один проход движка
+            size = pack_size(num_simulations, workers, num_projects - done)
+            groups = (range(start, min(start + size, num_projects))
+                      for start in range(done, num_projects, size))
+            if executor is not None:
+                results = _ordered_imap(executor, worker, groups, workers * 4)
+            else:
+                results = map(worker, groups)
+
+            # Результаты приходят в порядке номеров проектов
+            pending = []
+            for row in chain.from_iterable(results):
+                samples = row.pop("samples", None)
+                if samples is not None:
+                    store.append(row["project_id"], samples)
+                pending.append(row)
+                if row["mc_success"]:
+                    risk_ratios.append(row["schedule_risk_ratio"])
+                done += 1
+                if len(pending) >= chunk_size or done == num_projects:
+                    # Сначала на диск выборки, затем строки: датасет не опережает хранилище
+                    if store is not None:
+                        store.flush()
+                    for pending_row in pending:
+                        writer.write(pending_row)
+                    pending.clear()
+                    print(f"  [{done}/{num_projects}] успешно={len(risk_ratios)}")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if store is not None:
+            store.close()
+
+    print(f"\nСохранено: {output}")
+    print(f"Итого: {done} проектов, успешный МК: {len(risk_ratios)}")
+    if risk_ratios:
         print(
             "Schedule risk ratio: "
-            f"mean={mean(row['schedule_risk_ratio'] for row in ok_rows):.3f}, "
-            f"median={sorted(row['schedule_risk_ratio'] for row in ok_rows)[len(ok_rows)//2]:.3f}"
+            f"mean={mean(risk_ratios):.3f}, "
+            f"median={sorted(risk_ratios)[len(risk_ratios)//2]:.3f}"
         )
 
 
@@ -239,11 +515,29 @@ def parse_args():
     parser.add_argument("--num-projects", type=int, default=NUM_PROJECTS)
     parser.add_argument("--num-simulations", type=int, default=NUM_SIMULATIONS)
     parser.add_argument("--seed", type=int, default=RANDOM_SEED)
-    parser.add_argument("--output", type=Path, default=OUTPUT_CSV)
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH,
+                        help="путь датасета; .parquet включает колоночный формат")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="число процессов; результат не зависит от него")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help="строк в чанке между сбросами на диск")
+    parser.add_argument("--resume", action="store_true",
+                        help="продолжить с последнего завершённого проекта в --output")
+    parser.add_argument("--store-samples", nargs="?", type=Path, const=SAMPLES_DIR, default=None,
+                        metavar="DIR", help="сохранять полные выборки МК (memmap float32)")
+    parser.add_argument("--adaptive", nargs="?", type=float, const=0.01, default=None,
+                        metavar="REL_TOL",
+                        help="адаптивный МК: остановка, когда ДИ P50/P90 уже REL_TOL от оценки; "
+                             "--num-simulations становится верхним бюджетом")
+    parser.add_argument("--sketch", action="store_true",
+                        help="перцентили потоковым скетчем в постоянной памяти, без сортировки выборки")
     return parser.parse_args()
 
 
 if __name__ == "__main__":
     args = parse_args()
-    random.seed(args.seed)
-    build_dataset(args.num_projects, args.num_simulations, args.output)
+    build_dataset(args.num_projects, args.num_simulations, args.output,
+                  seed=args.seed, workers=args.workers,
+                  chunk_size=args.chunk_size, resume=args.resume,
+                  samples_dir=args.store_samples, rel_tol=args.adaptive,
+                  use_sketch=args.sketch)
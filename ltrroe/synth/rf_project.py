@@ -12,7 +12,8 @@
 
 from pathlib import Path
 
-from ltrroe.paths import FILES_DIR, figures
+from ltrroe.paths import FILES_DIR, dataset, figures
+from ltrroe.synth.datasets import read_dataset
 import joblib
 import matplotlib.pyplot as plt
 import numpy as np
@@ -26,7 +27,7 @@ from sklearn.model_selection import KFold, cross_val_score, train_test_split
 
 RANDOM_STATE = 42
 VIS_DIR = figures("rf_synth_project")
-DATA_PATH = FILES_DIR / "synthetic_project_metrics.csv"
+DATA_PATH = dataset("synthetic_project_metrics")
 
 FEATURES = [
     "n_tasks",
@@ -71,7 +72,7 @@ RF_PROFILES = [
 
 
 def bool_series(series: pd.Series) -> pd.Series:
-    """Надёжно приводит CSV-колонку True/False к bool."""
+    """Надёжно приводит CSV-колонку True/False к bool (в Parquet колонка уже bool)."""
     if series.dtype == bool:
         return series
     return series.astype(str).str.strip().str.lower().isin({"true", "1", "yes"})
@@ -246,7 +247,7 @@ def save_plots(
 
 
 def main() -> None:
-    df = pd.read_csv(DATA_PATH)
+    df = read_dataset(DATA_PATH)
     print("Файл:", DATA_PATH)
     print("Размер датасета до очистки:", df.shape)
 
@@ -0,0 +1,204 @@
+"""
+Хранилище полных выборок Монте-Карло.
+
+Длительности всех симуляций каждого проекта дописываются в один бинарный файл
+float32 (samples.f32), а индекс project_id -> (offset, length) хранится рядом
+в samples_index.csv. Чтение идёт через np.memmap, поэтому новые квантили (P80, P95)
+и риск-метрики (CVaR) считаются по сохранённым выборкам без повторной симуляции.
+"""
+
+import csv
+import io
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ltrroe.core.stats import order_statistic_index
+
+DATA_FILE = "samples.f32"
+INDEX_FILE = "samples_index.csv"
+INDEX_FIELDS = ["project_id", "offset", "length"]
+SAMPLE_DTYPE = np.float32
+
+
+class SampleStore:
+    """
+    Выборки длительностей проектов в одном memory-mapped массиве float32.
+    Запись — только дописыванием в конец; смещения в индексе считаются в элементах.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.data_path = self.directory / DATA_FILE
+        self.index_path = self.directory / INDEX_FILE
+        self.index: Dict[str, tuple] = {}
+        self._order: List[str] = []
+        self._size = 0
+        self._data_file = None
+        self._index_file = None
+        self._mmap = None
+        self._load_index()
+
+    def _load_index(self):
+        if not self.index_path.exists():
+            return
+        with open(self.index_path, newline="", encoding="utf-8") as f:
+            text = f.read()
+        # Недописанная последняя строка (сбой посреди записи) не читается
+        if not text.endswith("\n"):
+            text = text[:text.rfind("\n") + 1]
+        for row in csv.DictReader(io.StringIO(text, newline="")):
+            offset, length = int(row["offset"]), int(row["length"])
+            self.index[row["project_id"]] = (offset, length)
+            self._order.append(row["project_id"])
+            self._size = offset + length
+
+    def __len__(self):
+        return len(self._order)
+
+    def __contains__(self, project_id):
+        return project_id in self.index
+
+    @property
+    def project_ids(self) -> List[str]:
+        return list(self._order)
+
+    # --- запись ---
+
+    def _drop_partial_tail(self):
+        """
+        Отрезать хвост прерванной записи: недописанную строку индекса и выборки,
+        для которых строка индекса не успела записаться.
+        """
+        if self.index_path.exists():
+            with open(self.index_path, "rb+") as f:
+                f.truncate(f.read().rfind(b"\n") + 1)
+        if self.data_path.exists():
+            size = self._size * np.dtype(SAMPLE_DTYPE).itemsize
+            with open(self.data_path, "rb+") as f:
+                if f.seek(0, os.SEEK_END) < size:
+                    raise ValueError(f"Файл выборок {self.data_path} короче, чем указано в индексе")
+                f.truncate(size)
+
+    def _open_for_append(self):
+        if self._data_file is not None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._drop_partial_tail()
+        new_index = not self.index_path.exists() or self.index_path.stat().st_size == 0
+        self._data_file = open(self.data_path, "ab")
+        self._index_file = open(self.index_path, "a", newline="", encoding="utf-8")
+        self._index_writer = csv.writer(self._index_file)
+        if new_index:
+            self._index_writer.writerow(INDEX_FIELDS)
+
+    def append(self, project_id: str, samples: np.ndarray):
+        """Дописать выборку проекта в конец хранилища."""
+        if project_id in self.index:
+            raise ValueError(f"Выборка проекта {project_id} уже сохранена")
+        self._open_for_append()
+        data = np.ascontiguousarray(samples, dtype=SAMPLE_DTYPE)
+        self._data_file.write(data.tobytes())
+        self._index_writer.writerow([project_id, self._size, len(data)])
+        self.index[project_id] = (self._size, len(data))
+        self._order.append(project_id)
+        self._size += len(data)
+        self._mmap = None
+
+    def flush(self):
+        if self._data_file is None:
+            return
+        self._data_file.flush()
+        self._index_file.flush()
+        os.fsync(self._data_file.fileno())
+        os.fsync(self._index_file.fileno())
+
+    def close(self):
+        self.flush()
+        if self._data_file is not None:
+            self._data_file.close()
+            self._index_file.close()
+            self._data_file = None
+            self._index_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def truncate(self, keep_project_ids: Iterable[str]):
+        """
+        Оставить только начальный отрезок хранилища из keep_project_ids.
+        Используется при --resume, когда выборки успели записаться дальше датасета.
+        """
+        self.close()
+        keep = set(keep_project_ids)
+        kept = []
+        for project_id in self._order:
+            if project_id not in keep:
+                break
+            kept.append(project_id)
+
+        size = 0
+        if kept:
+            offset, length = self.index[kept[-1]]
+            size = offset + length
+        if self.data_path.exists():
+            with open(self.data_path, "rb+") as f:
+                f.truncate(size * np.dtype(SAMPLE_DTYPE).itemsize)
+        self.index = {project_id: self.index[project_id] for project_id in kept}
+        self._order = kept
+        self._size = size
+        self._mmap = None
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.index_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(INDEX_FIELDS)
+            for project_id in kept:
+                writer.writerow([project_id, *self.index[project_id]])
+
+    # --- чтение ---
+
+    def _array(self) -> np.ndarray:
+        if self._mmap is None:
+            self.flush()
+            if self._size == 0:
+                self._mmap = np.empty(0, dtype=SAMPLE_DTYPE)
+            else:
+                self._mmap = np.memmap(self.data_path, dtype=SAMPLE_DTYPE, mode="r",
+                                       shape=(self._size,))
+        return self._mmap
+
+    def samples(self, project_id: str) -> np.ndarray:
+        """Выборка проекта (представление memmap, без копирования)."""
+        offset, length = self.index[project_id]
+        return self._array()[offset:offset + length]
+
+    def risk_metrics(self, quantiles=(0.1, 0.5, 0.9), cvar_levels=(),
+                     project_ids: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Пересчитать квантили и CVaR по сохранённым выборкам.
+        CVaR_a — средняя длительность в худших (1 - a) долях симуляций.
+        Возвращает: DataFrame с колонками p<квантиль> и cvar<уровень>, индекс — project_id
+        """
+        if project_ids is None:
+            project_ids = self._order
+        columns = (["project_id"]
+                   + [f"p{round(q * 100):g}" for q in quantiles]
+                   + [f"cvar{round(level * 100):g}" for level in cvar_levels])
+        rows = []
+        for project_id in project_ids:
+            values = np.sort(self.samples(project_id)).astype(np.float64)
+            n = len(values)
+            row = {"project_id": project_id}
+            for q in quantiles:
+                row[f"p{round(q * 100):g}"] = values[order_statistic_index(n, q)] if n else np.nan
+            for level in cvar_levels:
+                row[f"cvar{round(level * 100):g}"] = values[order_statistic_index(n, level):].mean() if n else np.nan
+            rows.append(row)
+        return pd.DataFrame(rows, columns=columns).set_index("project_id")
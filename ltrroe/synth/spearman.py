@@ -9,8 +9,9 @@ import pandas as pd
 from scipy.stats import spearmanr
 from pathlib import Path
 
-from ltrroe.paths import FILES_DIR, figures
-df = pd.read_csv(FILES_DIR / 'synthetic_tasks.csv')
+from ltrroe.paths import dataset
+from ltrroe.synth.datasets import read_dataset
+df = read_dataset(dataset('synthetic_tasks'))
 
 features = [
     'planned_optimistic', 'planned_likely', 'planned_pessimistic',
@@ -4,12 +4,14 @@
 и вычисляет фактические длительности задач с помощью ядерных алгоритмов.
 """
 
-import random
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from pathlib import Path
-from ltrroe.paths import FILES_DIR, figures
+from ltrroe.paths import FILES_DIR, dataset
+from ltrroe.synth.datasets import TASK_SCHEMA, write_dataset
 from ltrroe.core.objects import Project, Employee, Task, Dependency
+from ltrroe.core.graph import DEPENDENCY_TYPES
 from ltrroe.core.algorithms import (
     calculate_schedule,
     get_predecessors,
@@ -18,13 +20,13 @@ from ltrroe.core.algorithms import (
 )
 
 # Конфигурация
-random.seed(27)                 # воспроизводимые результаты
+RANDOM_SEED = 27                # воспроизводимые результаты
 NUM_PROJECTS = 10000              # количество генерируемых проектов
 MIN_TASKS = 5
 MAX_TASKS = 30
 MIN_EMPLOYEES = 3
 MAX_EMPLOYEES = 15
-OUTPUT_CSV = FILES_DIR / "synthetic_tasks.csv"
+OUTPUT_PATH = dataset("synthetic_tasks")
 
 # Пул возможных навыков
 SKILL_POOL = [
@@ -32,70 +34,81 @@ SKILL_POOL = [
     "ML", "UI/UX", "testing", "architecture", "databases", "documentation"
 ]
 
-def random_skills(max_skills=4):
+def random_skills(rng, max_skills=4):
     """Возвращает случайное подмножество навыков (размер 1..max_skills)."""
-    return random.sample(SKILL_POOL, k=random.randint(1, max_skills))
+    k = int(rng.integers(1, max_skills + 1))
+    return [SKILL_POOL[i] for i in rng.choice(len(SKILL_POOL), size=k, replace=False)]
 
-def random_efficiency(skills):
+def random_efficiency(skills, rng):
     """Генерирует словарь эффективности для каждого навыка (0.6..1.4)."""
-    return {skill: round(random.uniform(0.6, 1.4), 2) for skill in skills}
+    return {skill: round(float(rng.uniform(0.6, 1.4)), 2) for skill in skills}
 
-def random_triple(low=1, high=30):
+def random_triple(rng, low=1, high=30):
     """Генерирует триплет (оптимистичная, вероятная, пессимистичная) с low ≤ likely ≤ high."""
-    a = random.randint(low, high - 2)
-    b = random.randint(a, high - 1)
-    c = random.randint(b, high)
+    a = int(rng.integers(low, high - 1))
+    b = int(rng.integers(a, high))
+    c = int(rng.integers(b, high + 1))
     return (a, b, c)
 
-def generate_dependencies(task_ids, density=0.3):
+def generate_dependencies(task_ids, density=0.3, rng=None):
     """
     Генерирует случайные зависимости (только прямые, чтобы избежать циклов)
+    rng — numpy.random.Generator (по умолчанию новый, без фиксированного сида)
     """
+    if rng is None:
+        rng = np.random.default_rng()
     deps = []
     for i, from_id in enumerate(task_ids):
         for to_id in task_ids[i + 1:]:
-            if random.random() < density:
-                dep_type = random.choice(["FS", "SS", "FF", "SF"])
-                lag = round(random.uniform(0, 3), 1)
-                mandatory = random.choice([True, False])
+            if rng.random() < density:
+                dep_type = DEPENDENCY_TYPES[int(rng.integers(len(DEPENDENCY_TYPES)))]
+                lag = round(float(rng.uniform(0, 3)), 1)
+                mandatory = bool(rng.integers(2))
                 deps.append(Dependency(from_id, to_id, dep_type, lag, mandatory))
     return deps
 
-def generate_project(proj_id):
+def project_rng(proj_id, seed=RANDOM_SEED):
+    """Генератор проекта proj_id: не зависит от порядка генерации и других проектов."""
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(proj_id,)))
+
+def generate_project(proj_id, rng=None):
     """
     Генерирует один полный проект.
+    rng — numpy.random.Generator; по умолчанию project_rng(proj_id)
     Возвращает список словарей признаков (по одному на задачу)
     """
+    if rng is None:
+        rng = project_rng(proj_id)
     project = Project()
     project.proj_start_date = datetime.now()
 
     # Создание сотрудников 
-    num_employees = random.randint(MIN_EMPLOYEES, MAX_EMPLOYEES)
+    num_employees = int(rng.integers(MIN_EMPLOYEES, MAX_EMPLOYEES + 1))
     for emp_id in range(num_employees):
-        skills = random_skills(max_skills=4)
+        skills = random_skills(rng, max_skills=4)
         emp = Employee(
             emp_id=emp_id,
             emp_name=f"Employee_{emp_id}",
             emp_skills=skills,
-            emp_error_prob=round(random.uniform(0.05, 0.30), 2),
-            emp_cost_per_hour=round(random.uniform(20.0, 80.0), 2),
-            emp_efficiency=random_efficiency(skills)
+            emp_error_prob=round(float(rng.uniform(0.05, 0.30)), 2),
+            emp_cost_per_hour=round(float(rng.uniform(20.0, 80.0)), 2),
+            emp_efficiency=random_efficiency(skills, rng)
         )
-        emp.emp_max_daily_hours = random.uniform(4, 12)
+        emp.emp_max_daily_hours = float(rng.uniform(4, 12))
         emp.emp_current_load = 0.0
         project.proj_employees[emp.emp_id] = emp
 
     # ---- Создание задач ----
-    num_tasks = random.randint(MIN_TASKS, MAX_TASKS)
+    num_tasks = int(rng.integers(MIN_TASKS, MAX_TASKS + 1))
     for task_id in range(num_tasks):
-        req_skills = random_skills(max_skills=3)
+        req_skills = random_skills(rng, max_skills=3)
         task = Task(
             task_id=task_id,
             task_name=f"Task_{task_id}",
             task_skills=req_skills,
-            task_crit=random.randint(1, 5),
-            task_cost=round(random.uniform(100, 2000), 2),
-            task_duration_dist=random_triple(2, 30)
+            task_crit=int(rng.integers(1, 6)),
+            task_cost=round(float(rng.uniform(100, 2000)), 2),
+            task_duration_dist=random_triple(rng, 2, 30)
         )
         project.proj_tasks[task.task_id] = task
 
@@ -107,20 +120,20 @@ def generate_project(proj_id):
         ]
         if not candidates:
             candidates = list(project.proj_employees.values())
-        num_assign = random.randint(1, min(3, len(candidates)))
-        assigned = random.sample(candidates, num_assign)
+        num_assign = int(rng.integers(1, min(3, len(candidates)) + 1))
+        assigned = [candidates[k] for k in rng.choice(len(candidates), size=num_assign, replace=False)]
         for emp in assigned:
             task.task_assigned_to.append(emp.emp_id)
             emp.emp_assigned_tasks.append(task.task_id)
             available_hours = max(0.0, emp.emp_max_daily_hours - emp.emp_current_load)
             upper_load = min(8.0, available_hours)
-            load_inc = round(random.uniform(0.5, upper_load), 1) if upper_load >= 0.5 else 0.0
+            load_inc = round(float(rng.uniform(0.5, upper_load)), 1) if upper_load >= 0.5 else 0.0
             if load_inc > 0:
                 emp.emp_current_load += load_inc
 
     # Создание зависимостей
     task_ids = list(project.proj_tasks.keys())
-    project.proj_dependencies = generate_dependencies(task_ids, density=0.3)
+    project.proj_dependencies = generate_dependencies(task_ids, density=0.3, rng=rng)
 
     # Расчёт расписания и фактических длительностей
     _, _, task_duration = calculate_schedule(project)
@@ -197,5 +210,5 @@ if __name__ == "__main__":
             print(f"Сгенерировано {proj_id + 1} проектов...")
 
     df = pd.DataFrame(all_tasks)
-    df.to_csv(OUTPUT_CSV, index=False)
-    print(f"Датасет сохранён: {OUTPUT_CSV} ({len(df)} задач из {NUM_PROJECTS} проектов).")
+    write_dataset(df, OUTPUT_PATH, schema=TASK_SCHEMA)
+    print(f"Датасет сохранён: {OUTPUT_PATH} ({len(df)} задач из {NUM_PROJECTS} проектов).")
@@ -13,12 +13,13 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
 
-from ltrroe.paths import FILES_DIR, figures
+from ltrroe.paths import FILES_DIR, dataset, figures
+from ltrroe.synth.datasets import read_dataset
 # 1. Загрузка данных 
 VIS_DIR = figures("xgboost")
-DATA_PATH = FILES_DIR / "synthetic_tasks.csv"
+DATA_PATH = dataset("synthetic_tasks")
 VIS_DIR.mkdir(parents=True, exist_ok=True)
-df = pd.read_csv(DATA_PATH)
+df = read_dataset(DATA_PATH)
 
 print("Размер датасета:", df.shape)
 print("Средняя длительность задачи:", df['actual_duration'].mean().round(2), "дней")
@@ -0,0 +1,73 @@
+"""Tests for the simulated-annealing assignment search."""
+
+import numpy as np
+import pytest
+
+from ltrroe.core.assignment import AssignmentOptimizer
+from ltrroe.core.engine import monte_carlo_batch
+from ltrroe.core.test_data import create_test_project
+from ltrroe.core.whatif import WhatIfSimulator
+from ltrroe.synth.project_level import generate_project
+
+
+def _project(seed=0):
+    return generate_project(seed, np.random.default_rng(seed))
+
+
+def test_task_options_match_single_scenarios():
+    project = create_test_project()
+    simulator = WhatIfSimulator(project, 500, rng=np.random.default_rng(1))
+    task_id = list(project.proj_tasks)[1]
+    options = simulator.task_options(task_id, [0.5, 1.0, 2.5])
+    assert options.shape == (3, 500)
+    for row, slowdown in zip(options, [0.5, 1.0, 2.5]):
+        np.testing.assert_array_equal(row, simulator.scenario(slowdowns={task_id: slowdown}))
+
+
+def test_evaluate_task_scores_every_candidate_on_common_numbers():
+    project = _project(1)
+    optimizer = AssignmentOptimizer(project, 400, rng=np.random.default_rng(2), cost_weight=1e-4)
+    task_id = next(t for t, task in project.proj_tasks.items() if task.task_assigned_to)
+    result = optimizer.evaluate_task(task_id)
+    assert result["employee_ids"] == list(project.proj_employees)
+
+    # keeping the current primary assignee reproduces the current score
+    current = result["employee_ids"].index(project.proj_tasks[task_id].task_assigned_to[0])
+    assert result["quantile"][current] == optimizer.quantile
+    assert result["score"][current] == pytest.approx(optimizer.score)
+
+    # any candidate equals a full rerun on the same random numbers
+    e = int(np.argmax(result["score"]))
+    project.proj_tasks[task_id].task_assigned_to = [result["employee_ids"][e]]
+    rerun = monte_carlo_batch(project, 400, rng=np.random.default_rng(2))
+    assert result["quantile"][e] == pytest.approx(np.partition(rerun, 360)[360], abs=1e-9)
+
+
+@pytest.mark.parametrize("cost_weight", [0.0, 1e-3])
+def test_optimize_improves_and_matches_rerun(cost_weight):
+    project = _project(3)
+    optimizer = AssignmentOptimizer(project, 300, rng=np.random.default_rng(4),
+                                    cost_weight=cost_weight)
+    result = optimizer.optimize(150, rng=np.random.default_rng(5))
+    assert result["score"] <= result["initial_score"] + 1e-9
+    assert result["evaluated"] == 150 * len(project.proj_employees)
+
+    for task_id, employee_ids in result["assignments"].items():
+        project.proj_tasks[task_id].task_assigned_to = employee_ids
+    rerun = monte_carlo_batch(project, 300, rng=np.random.default_rng(4))
+    np.testing.assert_allclose(optimizer.simulator.baseline, rerun, rtol=0, atol=1e-9)
+    assert result["quantile"] == pytest.approx(np.partition(rerun, 270)[270], abs=1e-9)
+
+
+def test_greedy_search_respects_candidates():
+    project = create_test_project()
+    task_ids = list(project.proj_tasks)
+    allowed = list(project.proj_employees)[:2]
+    optimizer = AssignmentOptimizer(project, 200, rng=np.random.default_rng(0),
+                                    candidates={task_ids[0]: allowed})
+    result = optimizer.optimize(20, rng=np.random.default_rng(0), temperature=0.0)
+    assert set(result["assignments"]) <= {task_ids[0]}
+    assert all(ids[0] in allowed for ids in result["assignments"].values())
+
+    with pytest.raises(ValueError):
+        AssignmentOptimizer(project, 10, candidates={task_ids[0]: ["nobody"]})
@@ -0,0 +1,92 @@
+"""Tests for packed multi-project CPM and Monte Carlo."""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from ltrroe.core.batch import ProjectBatch, schedule_many, simulate_many
+from ltrroe.core.engine import float_analysis, monte_carlo_batch, schedule_days
+from ltrroe.core.graph import CompiledGraph
+from ltrroe.core.objects import Project, Task
+from ltrroe.core.test_data import create_test_project
+from ltrroe.synth import project_level
+from ltrroe.synth.project_level import (
+    generate_project,
+    indexed_project,
+    project_to_metrics,
+    projects_to_metrics,
+    simulate_indexed_projects,
+)
+from ltrroe.synth.task_level import generate_dependencies
+
+
+def _mixed_dependency_project(proj_id, rng):
+    project = Project(proj_id=proj_id)
+    project.proj_start_date = datetime(2026, 1, 1)
+    n_tasks = int(rng.integers(3, 20))
+    for task_id in range(n_tasks):
+        project.proj_tasks[task_id] = Task(task_id, f"T{task_id}", [], 1, 0.0, (1.0, 3.0, 6.0))
+    # FS/SS/FF/SF edges with lags
+    project.proj_dependencies = generate_dependencies(list(range(n_tasks)), density=0.3, rng=rng)
+    return project
+
+
+def _projects():
+    rng = np.random.default_rng(5)
+    return ([create_test_project()]
+            + [_mixed_dependency_project(k, rng) for k in range(1, 4)]
+            + [generate_project(k, rng) for k in range(4, 7)])
+
+
+def test_union_graph_keeps_projects_disjoint():
+    graphs = [CompiledGraph(project) for project in _projects()]
+    union = CompiledGraph.union(graphs)
+    assert union.n_tasks == sum(g.n_tasks for g in graphs)
+    assert union.n_edges == sum(g.n_edges for g in graphs)
+    assert union.n_levels == max(g.n_levels for g in graphs)
+    assert union.task_ids[graphs[0].n_tasks] == (1, graphs[1].task_ids[0])
+
+
+def test_schedule_many_matches_per_project():
+    projects = _projects()
+    batch = ProjectBatch(projects)
+    early_start, early_finish, durations = batch.schedule()
+    _, _, critical = batch.float_analysis(early_start, early_finish, durations)
+
+    for project, packed, mask in zip(projects, schedule_many(projects), batch.split(critical)):
+        expected = schedule_days(project)
+        for got, want in zip(packed, expected):
+            np.testing.assert_allclose(got, want, rtol=0, atol=1e-12)
+        graph = CompiledGraph(project)
+        _, _, want_critical = float_analysis(graph, *expected)
+        np.testing.assert_array_equal(mask, want_critical)
+
+
+@pytest.mark.parametrize("sampling", ["random", "lhs"])
+def test_simulate_many_matches_monte_carlo_batch(sampling):
+    projects = _projects()
+    seeds = np.random.SeedSequence(11).spawn(len(projects))
+    # a tiny cell budget forces several packed sweeps
+    sims = simulate_many(projects, 400, rng=[np.random.default_rng(s) for s in seeds],
+                         sampling=sampling, max_cells=2000)
+    assert sims.shape == (len(projects), 400)
+    for project, seq, row in zip(projects, seeds, sims):
+        expected = monte_carlo_batch(project, 400, rng=np.random.default_rng(seq), sampling=sampling)
+        np.testing.assert_allclose(row, expected, rtol=0, atol=1e-12)
+
+
+def test_batch_rejects_empty_project():
+    with pytest.raises(ValueError):
+        ProjectBatch([create_test_project(), Project(proj_id="empty")])
+
+
+def test_packed_dataset_rows_match_single_project_rows(monkeypatch):
+    projects, seeds = zip(*(indexed_project(index, 27) for index in range(8)))
+    with monkeypatch.context() as patch:
+        # the packed path must not fall back to per-project metrics
+        patch.setattr(project_level, "project_to_metrics", None)
+        packed = projects_to_metrics(list(projects), 300, list(seeds))
+    single = [project_to_metrics(p, 300, rng=np.random.default_rng(s)) for p, s in zip(projects, seeds)]
+    assert packed == single
+    assert simulate_indexed_projects(range(8), 300, 27) == single
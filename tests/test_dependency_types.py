@@ -0,0 +1,104 @@
+"""Tests for FS/SS/FF/SF dependency types, lags and float analysis in the CPM passes."""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from ltrroe.core.algorithms import _forward_pass, calculate_backward_pass
+from ltrroe.core.engine import backward_pass_days, float_analysis, forward_pass_days
+from ltrroe.core.graph import CompiledGraph
+from ltrroe.core.objects import Dependency, Project, Task
+from ltrroe.synth.task_level import generate_dependencies
+
+
+def _project(n_tasks, dependencies):
+    project = Project(proj_id="deps")
+    project.proj_start_date = datetime(2026, 1, 1)
+    for task_id in range(n_tasks):
+        project.proj_tasks[task_id] = Task(task_id, f"T{task_id}", [], 1, 0.0, (1.0, 2.0, 3.0))
+    project.proj_dependencies = dependencies
+    return project
+
+
+def _days(project, dates):
+    return {k: (v - project.proj_start_date).total_seconds() / 86400 for k, v in dates.items()}
+
+
+@pytest.mark.parametrize("dep_type, lag, expected_start", [
+    ("FS", 1.0, 5.0),   # ES_1 >= EF_0 + 1
+    ("SS", 1.0, 1.0),   # ES_1 >= ES_0 + 1
+    ("FF", 1.0, 3.0),   # EF_1 >= EF_0 + 1
+    ("SF", 1.0, 0.0),   # EF_1 >= ES_0 + 1, clamped to the project start
+    ("SF", 3.0, 1.0),
+])
+def test_single_edge_semantics(dep_type, lag, expected_start):
+    project = _project(2, [Dependency(0, 1, dep_type, lag)])
+    graph = CompiledGraph(project)
+    durations = np.array([4.0, 2.0])
+
+    early_start, early_finish = forward_pass_days(graph, durations)
+    assert early_start[1] == pytest.approx(expected_start)
+
+    reference_start, _ = _forward_pass(project, {0: 4.0, 1: 2.0}, graph)
+    assert _days(project, reference_start)[1] == pytest.approx(expected_start)
+
+
+def test_mixed_types_match_reference_and_slack_is_non_negative():
+    project = _project(25, generate_dependencies(list(range(25)), density=0.3,
+                                                 rng=np.random.default_rng(11)))
+    graph = CompiledGraph(project)
+    assert not graph.finish_to_start_only
+    durations = np.random.default_rng(0).uniform(0.5, 8.0, size=(6, 25))
+
+    early_start, early_finish = forward_pass_days(graph, durations)
+    late_start, late_finish = backward_pass_days(graph, early_finish, durations)
+    assert np.all(late_start - early_start >= -1e-9)
+    # every sample has a critical task finishing at the project end
+    assert np.all(np.isclose(late_start - early_start, 0.0).any(axis=-1))
+
+    for row in range(durations.shape[0]):
+        row_durations = dict(zip(graph.task_ids, durations[row]))
+        ref_start, ref_finish = _forward_pass(project, row_durations, graph)
+        ref_late_start, _ = calculate_backward_pass(project, ref_finish, row_durations, graph)
+        np.testing.assert_allclose(
+            [_days(project, ref_start)[t] for t in graph.task_ids], early_start[row], atol=1e-6)
+        np.testing.assert_allclose(
+            [_days(project, ref_late_start)[t] for t in graph.task_ids], late_start[row], atol=1e-6)
+
+
+def test_unknown_dependency_type_rejected():
+    with pytest.raises(ValueError):
+        CompiledGraph(_project(2, [Dependency(0, 1, "XX", 0.0)]))
+
+
+def test_float_analysis_on_diamond():
+    # 0 -> 1 -> 3 and 0 -> 2 -> 3; task 2 is shorter by 3 days
+    project = _project(4, [Dependency(0, 1, "FS", 0.0), Dependency(0, 2, "FS", 0.0),
+                           Dependency(1, 3, "FS", 0.0), Dependency(2, 3, "FS", 0.0)])
+    graph = CompiledGraph(project)
+    durations = np.array([2.0, 5.0, 2.0, 1.0])
+    early_start, early_finish = forward_pass_days(graph, durations)
+
+    total_float, free_float, critical = float_analysis(graph, early_start, early_finish, durations)
+    np.testing.assert_allclose(total_float, [0.0, 0.0, 3.0, 0.0])
+    np.testing.assert_allclose(free_float, [0.0, 0.0, 3.0, 0.0])
+    assert critical.tolist() == [True, True, False, True]
+
+
+def test_float_analysis_batched_matches_rows():
+    project = _project(20, generate_dependencies(list(range(20)), density=0.3,
+                                                 rng=np.random.default_rng(5)))
+    graph = CompiledGraph(project)
+    durations = np.random.default_rng(1).uniform(0.5, 6.0, size=(4, 20))
+    early_start, early_finish = forward_pass_days(graph, durations)
+
+    total_float, free_float, critical = float_analysis(graph, early_start, early_finish, durations)
+    assert np.all(free_float <= total_float + 1e-9)
+    assert np.all(free_float >= -1e-9)
+    for row in range(durations.shape[0]):
+        row_total, row_free, row_critical = float_analysis(
+            graph, early_start[row], early_finish[row], durations[row])
+        np.testing.assert_allclose(row_total, total_float[row])
+        np.testing.assert_allclose(row_free, free_float[row])
+        assert row_critical.tolist() == critical[row].tolist()
@@ -0,0 +1,163 @@
+"""Equivalence tests for the vectorized Monte Carlo engine.
+
+The per-task reference implementation in ``algorithms`` is the ground truth:
+the batched forward pass must reproduce it exactly for the same durations, and
+the sampled distributions must agree statistically.
+"""
+
+import random
+import statistics
+
+import numpy as np
+import pytest
+
+from ltrroe.core.test_data import create_test_project
+from ltrroe.core.algorithms import (
+    _forward_pass,
+    calculate_backward_pass,
+    calculate_schedule,
+    monte_carlo_simulation,
+)
+from ltrroe.core.graph import CompiledGraph
+from ltrroe.core.sampling import batch_generator
+from ltrroe.core.engine import (
+    _forward_pass_by_task,
+    backward_pass_days,
+    days_to_dates,
+    forward_pass_days,
+    forward_pass_matrix,
+    monte_carlo_adaptive,
+    monte_carlo_batch,
+    percentile_halfwidth,
+    schedule_days,
+    triangular_inverse_cdf,
+)
+from ltrroe.synth.bench_forward_pass import bench_shapes
+
+
+def _finish_days(project, early_finish):
+    return {
+        task_id: (finish - project.proj_start_date).total_seconds() / 86400
+        for task_id, finish in early_finish.items()
+    }
+
+
+def test_forward_pass_matrix_matches_reference():
+    project = create_test_project()
+    graph = CompiledGraph(project)
+    task_ids = graph.task_ids
+    rng = np.random.default_rng(0)
+    durations = rng.uniform(1.0, 10.0, size=(5, len(task_ids)))
+
+    early_finish = forward_pass_matrix(graph, durations)
+
+    for row in range(durations.shape[0]):
+        _, reference = _forward_pass(project, dict(zip(task_ids, durations[row])), graph)
+        reference_days = _finish_days(project, reference)
+        for j, task_id in enumerate(task_ids):
+            assert early_finish[row, j] == pytest.approx(reference_days[task_id], abs=1e-6)
+
+
+@pytest.mark.parametrize("shape", ["wide_shallow", "narrow_deep", "typical"])
+def test_level_synchronous_matches_per_task_pass(shape):
+    graph = bench_shapes(300, seed=3)[shape]
+    durations = np.random.default_rng(2).uniform(1.0, 10.0, size=(50, graph.n_tasks))
+
+    early_start, early_finish = forward_pass_days(graph, durations)
+    reference_start, reference_finish = _forward_pass_by_task(graph, durations)
+    np.testing.assert_array_equal(early_start, reference_start)
+    np.testing.assert_array_equal(early_finish, reference_finish)
+
+    # a single schedule (1-D input) goes through the same kernel
+    row_start, row_finish = forward_pass_days(graph, durations[7])
+    np.testing.assert_array_equal(row_finish, reference_finish[7])
+
+
+def test_triangular_samples_within_bounds():
+    u = np.random.default_rng(1).random((1000, 3))
+    samples = triangular_inverse_cdf([1.0, 2.0, 5.0], [2.0, 2.0, 5.0], [4.0, 3.0, 5.0], u)
+    assert np.all(samples[:, 0] >= 1.0) and np.all(samples[:, 0] <= 4.0)
+    assert np.all(samples[:, 1] >= 2.0) and np.all(samples[:, 1] <= 3.0)
+    assert np.all(samples[:, 2] == 5.0)
+
+
+def test_triangular_rejects_invalid_distribution():
+    with pytest.raises(ValueError):
+        triangular_inverse_cdf([5.0], [4.0], [6.0], np.zeros((1, 1)))
+
+
+def test_batch_matches_reference_distribution():
+    project = create_test_project()
+    random.seed(3)
+    reference = monte_carlo_simulation(project, num_simulations=3000)
+    batch = monte_carlo_batch(project, num_simulations=3000, rng=np.random.default_rng(3))
+
+    assert batch.shape == (3000,)
+    assert abs(statistics.mean(reference) - batch.mean()) < 0.5
+    assert abs(statistics.median(reference) - np.median(batch)) < 0.5
+
+
+def test_numeric_schedule_matches_datetime_schedule():
+    project = create_test_project()
+    graph = CompiledGraph(project)
+    early_start, early_finish, durations = schedule_days(project, graph)
+    late_start, late_finish = backward_pass_days(graph, early_finish, durations)
+
+    ref_es, ref_ef, ref_dur = calculate_schedule(project, graph)
+    ref_ls, ref_lf = calculate_backward_pass(project, ref_ef, ref_dur, graph)
+
+    assert early_finish.dtype == np.float64
+    for numeric, reference in (
+        (early_start, ref_es), (early_finish, ref_ef),
+        (late_start, ref_ls), (late_finish, ref_lf),
+    ):
+        expected = _finish_days(project, reference)
+        for i, task_id in enumerate(graph.task_ids):
+            assert numeric[i] == pytest.approx(expected[task_id], abs=1e-6)
+
+
+def test_days_to_dates_round_trip():
+    project = create_test_project()
+    _, early_finish, _ = schedule_days(project)
+    dates = days_to_dates(project, early_finish)
+    days = _finish_days(project, dates)
+    assert list(days) == list(project.proj_tasks)
+    assert np.allclose(list(days.values()), early_finish, atol=1e-6)
+
+
+def test_adaptive_stops_early_on_small_project():
+    project = create_test_project()
+    durations, iterations = monte_carlo_adaptive(
+        project, rel_tol=0.02, batch_size=250, max_simulations=10000,
+        rng=np.random.default_rng(4),
+    )
+    assert iterations == len(durations)
+    assert iterations < 10000
+    ordered = np.sort(durations)
+    for q in (0.5, 0.9):
+        estimate = ordered[int(iterations * q)]
+        assert percentile_halfwidth(ordered, q) <= 0.02 * estimate
+
+
+def test_adaptive_respects_budget():
+    project = create_test_project()
+    durations, iterations = monte_carlo_adaptive(
+        project, rel_tol=1e-6, batch_size=300, max_simulations=1000,
+        rng=np.random.default_rng(5),
+    )
+    assert iterations == 1000 and len(durations) == 1000
+
+
+def test_seed_sequence_batches_regenerate_independently():
+    project = create_test_project()
+    seed_seq = np.random.SeedSequence(12)
+    full = monte_carlo_batch(project, 1000, rng=seed_seq, batch_size=250)
+    third = monte_carlo_batch(project, 250, rng=batch_generator(seed_seq, 2))
+    np.testing.assert_array_equal(full[500:750], third)
+
+
+def test_python_reference_uses_given_generator():
+    project = create_test_project()
+    reference = monte_carlo_simulation(project, 200, rng=np.random.default_rng(4), backend="python")
+    batch = monte_carlo_batch(project, 200, rng=np.random.default_rng(4))
+    np.testing.assert_allclose(reference, batch, atol=1e-6)
@@ -0,0 +1,75 @@
+"""Tests for the optional Numba Monte Carlo kernel against the NumPy engine."""
+
+import os
+import random
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ltrroe.core import fast
+from ltrroe.core.algorithms import monte_carlo_simulation
+from ltrroe.core.engine import monte_carlo_batch
+from ltrroe.core.objects import Project, Task
+from ltrroe.core.test_data import create_test_project
+from ltrroe.synth.task_level import generate_dependencies
+
+
+def _mixed_dependency_project():
+    project = Project(proj_id="mixed")
+    project.proj_start_date = datetime(2026, 1, 1)
+    for task_id in range(15):
+        project.proj_tasks[task_id] = Task(task_id, f"T{task_id}", [], 1, 0.0, (1.0, 3.0, 6.0))
+    project.proj_dependencies = generate_dependencies(list(range(15)), density=0.3,
+                                                     rng=np.random.default_rng(4))
+    return project
+
+
+@pytest.mark.parametrize("make_project", [create_test_project, _mixed_dependency_project])
+@pytest.mark.parametrize("sampling", ["random", "lhs"])
+def test_kernel_matches_engine_for_fixed_seed(make_project, sampling):
+    project = make_project()
+    expected = monte_carlo_batch(project, 500, rng=np.random.default_rng(42), sampling=sampling)
+    durations = fast.monte_carlo_fast(project, 500, rng=np.random.default_rng(42), sampling=sampling)
+    np.testing.assert_allclose(durations, expected, rtol=0, atol=1e-9)
+
+
+@pytest.mark.skipif(not fast.HAVE_NUMBA, reason="numba is not installed")
+def test_monte_carlo_simulation_selects_numba_and_is_reproducible():
+    project = create_test_project()
+    random.seed(8)
+    first = monte_carlo_simulation(project, 300)
+    random.seed(8)
+    second = monte_carlo_simulation(project, 300)
+    assert first == second
+
+    durations = monte_carlo_simulation(project, 300, rng=np.random.default_rng(9))
+    expected = monte_carlo_batch(project, 300, rng=np.random.default_rng(9))
+    np.testing.assert_allclose(durations, expected, rtol=0, atol=1e-9)
+
+
+def test_python_backend_and_unknown_backend():
+    project = create_test_project()
+    random.seed(1)
+    assert len(monte_carlo_simulation(project, 20, backend="python")) == 20
+    with pytest.raises(ValueError):
+        monte_carlo_simulation(project, 20, backend="cuda")
+
+
+
+@pytest.mark.skipif(not fast.HAVE_NUMBA, reason="numba is not installed")
+def test_threading_layer_is_selected_on_first_run_not_on_import():
+    code = (
+        "import numba; before = list(numba.config.THREADING_LAYER_PRIORITY)\n"
+        "from ltrroe.core import fast\n"
+        "from ltrroe.core.test_data import create_test_project\n"
+        "assert numba.config.THREADING_LAYER_PRIORITY == before\n"
+        "fast.monte_carlo_fast(create_test_project(), 10)\n"
+        "assert numba.config.THREADING_LAYER_PRIORITY == fast.FORK_SAFE_THREADING_LAYERS\n"
+    )
+    env = {key: value for key, value in os.environ.items() if key != "NUMBA_THREADING_LAYER"}
+    subprocess.run([sys.executable, "-c", code], check=True, env=env,
+                   cwd=Path(__file__).resolve().parent.parent)
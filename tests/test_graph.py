@@ -0,0 +1,84 @@
+"""Tests for the compiled project graph (CSR adjacency + topological order)."""
+
+import time
+
+import numpy as np
+import pytest
+
+from ltrroe.core.objects import Dependency, Project, Task
+from ltrroe.core.test_data import create_test_project
+from ltrroe.core.algorithms import (
+    calculate_backward_pass,
+    calculate_schedule,
+    get_predecessors,
+    get_successors,
+)
+from ltrroe.core.graph import CompiledGraph
+
+
+def _chain_project(n_tasks):
+    project = Project(proj_id="chain")
+    for task_id in range(n_tasks):
+        project.proj_tasks[task_id] = Task(task_id, f"T{task_id}", [], 1, 0.0, (1, 2, 3))
+    project.proj_dependencies = [
+        Dependency(task_id, task_id + 1, "FS", 0.0) for task_id in range(n_tasks - 1)
+    ]
+    return project
+
+
+def test_csr_matches_dependency_scan():
+    project = create_test_project()
+    graph = CompiledGraph(project)
+    for task_id, i in graph.index.items():
+        preds = sorted(graph.task_ids[p] for p in graph.predecessors(i))
+        succs = sorted(graph.task_ids[s] for s in graph.successors(i))
+        assert preds == sorted(get_predecessors(project, task_id))
+        assert succs == sorted(get_successors(project, task_id))
+
+
+def test_topological_order_respects_edges():
+    graph = CompiledGraph(create_test_project())
+    position = {int(i): pos for pos, i in enumerate(graph.order)}
+    for u, v in zip(graph.edge_from, graph.edge_to):
+        assert position[int(u)] < position[int(v)]
+
+
+def test_levels_group_tasks_by_depth():
+    graph = CompiledGraph(create_test_project())
+    for u, v in zip(graph.edge_from, graph.edge_to):
+        assert graph.depth[v] > graph.depth[u]
+    assert graph.n_levels == int(graph.depth.max()) + 1
+    covered = [int(i) for i in np.flatnonzero(graph.depth == 0)]
+    for level, (tasks, edges, starts) in enumerate(graph.levels, start=1):
+        assert np.all(graph.depth[tasks] == level)
+        # edges are grouped per task in the order given by starts
+        ends = list(starts[1:]) + [len(edges)]
+        for task, lo, hi in zip(tasks, starts, ends):
+            assert np.all(graph.edge_to[edges[lo:hi]] == task)
+            assert hi - lo == len(graph.predecessors(task))
+        covered.extend(int(i) for i in tasks)
+    assert sorted(covered) == list(range(graph.n_tasks))
+
+
+def test_cycle_detected():
+    project = _chain_project(3)
+    project.proj_dependencies.append(Dependency(2, 0, "FS", 0.0))
+    with pytest.raises(ValueError, match="циклы"):
+        CompiledGraph(project)
+
+
+def test_unknown_task_rejected():
+    project = _chain_project(3)
+    project.proj_dependencies.append(Dependency(2, 99, "FS", 0.0))
+    with pytest.raises(ValueError):
+        CompiledGraph(project)
+
+
+def test_large_chain_schedule_is_not_quadratic():
+    project = _chain_project(5000)
+    started = time.perf_counter()
+    graph = CompiledGraph(project)
+    _, early_finish, task_duration = calculate_schedule(project, graph)
+    late_start, _ = calculate_backward_pass(project, early_finish, task_duration, graph)
+    assert time.perf_counter() - started < 5.0
+    assert len(late_start) == 5000
@@ -0,0 +1,78 @@
+"""Tests for the vectorized rework and fatigue model."""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from ltrroe.core.engine import monte_carlo_batch, monte_carlo_sensitivity, sample_durations
+from ltrroe.core.human_factors import HumanFactorModel
+from ltrroe.core.objects import Employee, Project, Task
+from ltrroe.core.test_data import create_test_project
+
+
+def _one_employee_project(error_prob=0.0, fatigue=1.0):
+    project = Project(proj_id="human")
+    project.proj_start_date = datetime(2026, 1, 1)
+    emp = Employee(0, "E", [], error_prob, 10.0, {})
+    emp.emp_fatigue = fatigue
+    project.proj_employees[0] = emp
+    for task_id in range(3):
+        project.proj_tasks[task_id] = Task(task_id, f"T{task_id}", [], 1, 0.0, (1.0, 2.0, 4.0))
+        project.proj_tasks[task_id].task_assigned_to = [0]
+    project.add_dependency(0, 1, "FS", 0.0)
+    project.add_dependency(1, 2, "FS", 0.0)
+    # an unassigned task never tires or fails
+    project.proj_tasks[3] = Task(3, "T3", [], 1, 0.0, (1.0, 2.0, 4.0))
+    return project
+
+
+def test_neutral_model_keeps_durations():
+    project = _one_employee_project()
+    model = HumanFactorModel(project, fatigue_rate=0.0)
+    task_ids = list(project.proj_tasks)
+    plain = sample_durations(project, task_ids, 500, np.random.default_rng(0))
+    modelled = sample_durations(project, task_ids, 500, np.random.default_rng(0), human_factors=model)
+    np.testing.assert_array_equal(plain, modelled)
+
+
+def test_fatigue_accumulates_in_early_start_order():
+    project = _one_employee_project(fatigue=1.2)
+    model = HumanFactorModel(project, fatigue_rate=0.1)
+    durations = np.array([[2.0, 3.0, 1.0, 5.0]])
+    np.testing.assert_allclose(model.prior_load(durations), [[0.0, 2.0, 5.0, 0.0]])
+
+    result = model.apply(durations, np.random.default_rng(0))
+    np.testing.assert_allclose(result, [[2.0 * 1.2, 3.0 * 1.2 * 1.2, 1.0 * 1.2 * 1.5, 5.0]])
+
+
+def test_error_rate_and_rework():
+    project = _one_employee_project(error_prob=0.3)
+    model = HumanFactorModel(project, rework_fraction=0.5, fatigue_rate=0.0)
+    durations = np.ones((20000, 4))
+    result = model.apply(durations, np.random.default_rng(1))
+    assert set(np.unique(result[:, :3])) == {1.0, 1.5}
+    assert abs((result[:, :3] == 1.5).mean() - 0.3) < 0.01
+    np.testing.assert_array_equal(result[:, 3], 1.0)
+
+    certain = HumanFactorModel(_one_employee_project(error_prob=1.0), fatigue_rate=0.0)
+    np.testing.assert_array_equal(certain.apply(durations, np.random.default_rng(1))[:, :3], 1.5)
+
+
+def test_monte_carlo_with_human_factors_only_delays():
+    project = create_test_project()
+    model = HumanFactorModel(project)
+    base = monte_carlo_batch(project, 2000, rng=np.random.default_rng(5))
+    delayed = monte_carlo_batch(project, 2000, rng=np.random.default_rng(5), human_factors=model)
+    # durations are sampled first, so the pairs share the same uniforms
+    assert np.all(delayed >= base - 1e-9)
+    assert np.percentile(delayed, 90) > np.percentile(base, 90)
+
+    durations, sensitivity = monte_carlo_sensitivity(project, 1000, batch_size=400,
+                                                     rng=np.random.default_rng(2), human_factors=model)
+    assert len(durations) == 1000 and sensitivity.count == 1000
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        HumanFactorModel(create_test_project(), rework_fraction=-0.1)
@@ -0,0 +1,106 @@
+"""Tests for the incremental what-if scheduler against full CPM recomputation."""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from ltrroe.core.engine import backward_pass_days, forward_pass_days
+from ltrroe.core.graph import CompiledGraph
+from ltrroe.core.incremental import IncrementalSchedule
+from ltrroe.core.objects import Dependency, Project, Task
+from ltrroe.core.test_data import create_test_project
+from ltrroe.synth.bench_forward_pass import synthetic_graph
+from ltrroe.synth.task_level import generate_dependencies
+
+
+def _mixed_dependency_project(n_tasks=40, seed=3):
+    project = Project(proj_id="mixed")
+    project.proj_start_date = datetime(2026, 1, 1)
+    for task_id in range(n_tasks):
+        project.proj_tasks[task_id] = Task(task_id, f"T{task_id}", [], 1, 0.0, (1.0, 3.0, 6.0))
+    project.proj_dependencies = generate_dependencies(list(range(n_tasks)), density=0.15,
+                                                     rng=np.random.default_rng(seed))
+    return project
+
+
+def _assert_matches_full_recompute(schedule):
+    graph = CompiledGraph(schedule.project)
+    # the incremental state keeps its own task index; the project task order is unchanged
+    assert graph.task_ids == schedule.task_ids
+    early_start, early_finish = forward_pass_days(graph, schedule.durations)
+    late_start, late_finish = backward_pass_days(graph, early_finish, schedule.durations)
+    np.testing.assert_allclose(schedule.early_start, early_start, atol=1e-9)
+    np.testing.assert_allclose(schedule.early_finish, early_finish, atol=1e-9)
+    np.testing.assert_allclose(schedule.late_start, late_start, atol=1e-9)
+    np.testing.assert_allclose(schedule.late_finish, late_finish, atol=1e-9)
+
+
+def test_random_edits_match_full_recompute():
+    project = _mixed_dependency_project()
+    schedule = IncrementalSchedule(project)
+    _assert_matches_full_recompute(schedule)
+
+    rng = np.random.default_rng(0)
+    task_ids = list(project.proj_tasks)
+    for _ in range(60):
+        action = rng.integers(3)
+        if action == 0:
+            schedule.set_duration(int(rng.choice(task_ids)), float(rng.uniform(0.0, 8.0)))
+        elif action == 1:
+            a, b = (int(t) for t in rng.choice(task_ids, 2, replace=False))
+            try:
+                schedule.add_dependency(a, b, str(rng.choice(["FS", "SS", "FF", "SF"])),
+                                        float(rng.uniform(-1.0, 2.0)))
+            except ValueError:
+                continue  # would close a cycle
+        else:
+            dep = list(project.proj_dependencies)[rng.integers(len(project.proj_dependencies))]
+            schedule.remove_dependency(dep.dep_from_task, dep.dep_to_task)
+        _assert_matches_full_recompute(schedule)
+
+
+def test_assign_updates_project_and_duration():
+    project = create_test_project()
+    schedule = IncrementalSchedule(project)
+    task_id = next(iter(project.proj_tasks))
+    employee_id = list(project.proj_employees)[-1]
+
+    schedule.assign(task_id, [employee_id])
+    assert project.proj_tasks[task_id].task_assigned_to == [employee_id]
+    _assert_matches_full_recompute(schedule)
+    with pytest.raises(ValueError):
+        schedule.assign(task_id, ["nobody"])
+
+
+def test_cycle_is_rejected_without_side_effects():
+    project = create_test_project()
+    schedule = IncrementalSchedule(project)
+    dep = project.proj_dependencies[0]
+    n_dependencies = len(project.proj_dependencies)
+    before = schedule.early_finish.copy()
+
+    with pytest.raises(ValueError):
+        schedule.add_dependency(dep.dep_to_task, dep.dep_from_task)
+    assert len(project.proj_dependencies) == n_dependencies
+    np.testing.assert_array_equal(schedule.early_finish, before)
+    _assert_matches_full_recompute(schedule)
+
+
+def test_edit_within_float_recomputes_a_small_cone():
+    graph = synthetic_graph(10000, max_span=2, min_dependencies=15000, rng=np.random.default_rng(1))
+    project = Project(proj_id="deep")
+    project.proj_tasks = {task_id: Task(task_id, "", [], 1, 0.0, (1.0, 2.0, 3.0))
+                          for task_id in graph.task_ids}
+    project.proj_dependencies = [
+        Dependency(graph.task_ids[i], graph.task_ids[j], "FS", 0.0)
+        for i, j in zip(graph.edge_from.tolist(), graph.edge_to.tolist())
+    ]
+    schedule = IncrementalSchedule(project)
+
+    # growing a task by less than its float stops at its direct successors
+    i = int(np.argmax(schedule.total_float))
+    task_id = schedule.task_ids[i]
+    recomputed = schedule.set_duration(task_id, schedule.durations[i] + schedule.total_float[i] / 2)
+    assert recomputed < 50
+    _assert_matches_full_recompute(schedule)
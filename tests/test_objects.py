@@ -0,0 +1,104 @@
+"""Tests for the slotted object model and the columnar ProjectArrays view."""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from ltrroe.core.algorithms import build_task_slowdown_cache
+from ltrroe.core.engine import monte_carlo_batch, schedule_days, task_durations_days
+from ltrroe.core.graph import CompiledGraph
+from ltrroe.core.objects import Employee, Project, ProjectArrays, Task
+from ltrroe.core.test_data import create_test_project
+from ltrroe.synth.project_level import generate_project
+from ltrroe.synth.task_level import generate_dependencies
+
+
+def _fields(obj):
+    return {name: getattr(obj, name) for name in type(obj).__slots__}
+
+
+def _assert_same_project(a, b):
+    assert _fields(a).keys() == _fields(b).keys()
+    for name in ("proj_id", "proj_start_date", "proj_current_date", "_next_dep_id"):
+        assert getattr(a, name) == getattr(b, name)
+    assert a.proj_outsources == b.proj_outsources
+    assert list(a.proj_tasks) == list(b.proj_tasks)
+    for task_id in a.proj_tasks:
+        assert _fields(a.proj_tasks[task_id]) == _fields(b.proj_tasks[task_id])
+    assert list(a.proj_employees) == list(b.proj_employees)
+    for emp_id in a.proj_employees:
+        assert _fields(a.proj_employees[emp_id]) == _fields(b.proj_employees[emp_id])
+    assert type(a.proj_dependencies) is type(b.proj_dependencies)
+    if isinstance(a.proj_dependencies, dict):
+        assert list(a.proj_dependencies) == list(b.proj_dependencies)
+        deps_a, deps_b = a.proj_dependencies.values(), b.proj_dependencies.values()
+    else:
+        deps_a, deps_b = a.proj_dependencies, b.proj_dependencies
+    assert [_fields(d) for d in deps_a] == [_fields(d) for d in deps_b]
+
+
+def _list_dependency_project():
+    project = Project(proj_id="mixed")
+    project.proj_start_date = datetime(2026, 1, 1)
+    for task_id in range(30):
+        task = Task(task_id, f"T{task_id}", ["Python"], 2, 10.0, (1.0, 3.0, 6.0))
+        task.task_actual_duration = 2.5 if task_id % 4 == 0 else None
+        project.proj_tasks[task_id] = task
+    project.proj_dependencies = generate_dependencies(list(range(30)), density=0.2,
+                                                     rng=np.random.default_rng(2))
+    return project
+
+
+def test_objects_have_no_instance_dict():
+    employee = Employee(0, "A", ["Python"], 0.1, 30.0, {"Python": 1.0})
+    task = Task(0, "T", ["Python"], 1, 0.0, (1.0, 2.0, 3.0))
+    for obj in (employee, task, Project()):
+        assert not hasattr(obj, "__dict__")
+    with pytest.raises(AttributeError):
+        task.task_unknown = 1
+
+
+@pytest.mark.parametrize("make_project", [
+    create_test_project,
+    _list_dependency_project,
+    lambda: generate_project(4, np.random.default_rng(4)),
+])
+def test_round_trip_is_lossless(make_project):
+    project = make_project()
+    arrays = ProjectArrays.from_project(project)
+    assert arrays.task_duration_dist.shape == (len(project.proj_tasks), 3)
+    assert arrays.dep_from.dtype == np.intp and arrays.dep_to.dtype == np.intp
+    _assert_same_project(project, arrays.to_project())
+
+
+@pytest.mark.parametrize("make_project", [create_test_project, _list_dependency_project])
+def test_engine_consumes_arrays_directly(make_project):
+    project = make_project()
+    arrays = ProjectArrays.from_project(project)
+
+    graph, array_graph = CompiledGraph(project), CompiledGraph(arrays)
+    assert array_graph.task_ids == graph.task_ids
+    np.testing.assert_array_equal(array_graph.edge_from, graph.edge_from)
+    np.testing.assert_array_equal(array_graph.edge_lag, graph.edge_lag)
+    assert array_graph.edge_type == graph.edge_type
+
+    assert build_task_slowdown_cache(arrays) == build_task_slowdown_cache(project)
+    np.testing.assert_array_equal(task_durations_days(arrays, array_graph),
+                                  task_durations_days(project, graph))
+    for expected, actual in zip(schedule_days(project), schedule_days(arrays)):
+        np.testing.assert_array_equal(actual, expected)
+    np.testing.assert_array_equal(monte_carlo_batch(arrays, 500, rng=np.random.default_rng(7)),
+                                  monte_carlo_batch(project, 500, rng=np.random.default_rng(7)))
+
+
+def test_invalid_dependencies_are_rejected():
+    project = _list_dependency_project()
+    project.proj_dependencies[0].dep_type = "XX"
+    with pytest.raises(ValueError):
+        ProjectArrays.from_project(project)
+
+    arrays = ProjectArrays.from_project(_list_dependency_project())
+    arrays.dep_to[0] = arrays.n_tasks
+    with pytest.raises(ValueError):
+        CompiledGraph(arrays)
@@ -0,0 +1,92 @@
+"""Tests for the outsourcing what-if engine and its cost/P90 frontier."""
+
+import numpy as np
+import pytest
+
+from ltrroe.core.objects import Outsource
+from ltrroe.core.outsourcing import OutsourcingAnalyzer, pareto_front
+from ltrroe.core.test_data import create_test_project
+from ltrroe.core.whatif import WhatIfSimulator
+
+
+def _project_with_vendors():
+    project = create_test_project()
+    skills = sorted({s for task in project.proj_tasks.values() for s in task.task_skills})
+    project.proj_outsources = [
+        Outsource(10, "Fast", skills, 900.0, 0.9, 2, 0.6),
+        Outsource(11, "Cheap", skills, 150.0, 0.6, 4, 1.4),
+        Outsource(12, "Exact", skills, 300.0, 1.0, 0, 1.0),
+    ]
+    return project
+
+
+def test_vendor_durations_match_simulator_scenarios():
+    project = _project_with_vendors()
+    analyzer = OutsourcingAnalyzer(project, 800, rng=np.random.default_rng(1))
+    simulator = WhatIfSimulator(project, 800, rng=np.random.default_rng(1))
+    np.testing.assert_array_equal(analyzer.simulator.baseline, simulator.baseline)
+
+    task_id = list(project.proj_tasks)[2]
+    result = analyzer.evaluate_task(task_id)
+    assert result["outs_ids"] == [None, 10, 11, 12]
+    assert result["quantile"][0] == analyzer.quantile
+    assert result["cost"][0] == pytest.approx(analyzer.cost)
+
+    # a perfectly reliable vendor without lead time is a pure duration multiplier
+    exact = simulator.scenario(slowdowns={task_id: 1.0})
+    assert result["quantile"][3] == np.partition(exact, 720)[720]
+
+    # failures add rework, lead time is added to every simulation
+    analyzer.set_option(task_id, 11)
+    base = analyzer.simulator.task_durations(task_id, 1.0)
+    row = analyzer._option_durations(analyzer.graph.index[task_id], np.array([1]))[0]
+    failed = row > 4.0 + base * 1.4 + 1e-9
+    np.testing.assert_allclose(row, 4.0 + base * 1.4 * (1.0 + 0.5 * failed))
+    assert 0.25 < failed.mean() < 0.55
+    assert analyzer.plan == {task_id: 11}
+
+    # switching back restores the baseline exactly
+    analyzer.set_option(task_id, None)
+    np.testing.assert_array_equal(analyzer.simulator.baseline, simulator.baseline)
+
+
+def test_skill_filter_and_validation():
+    project = create_test_project()
+    analyzer = OutsourcingAnalyzer(project, 100, rng=np.random.default_rng(0))
+    for task_id, task in project.proj_tasks.items():
+        allowed = [o.outs_id for o in project.proj_outsources if set(task.task_skills) <= set(o.outs_skills)]
+        assert analyzer.evaluate_task(task_id)["outs_ids"] == [None] + allowed
+
+    task_id = next(t for t, task in project.proj_tasks.items() if "UI/UX" not in task.task_skills
+                   and not set(task.task_skills) <= {"DevOps", "Python", "базы_данных"})
+    with pytest.raises(ValueError):
+        analyzer.set_option(task_id, 1)
+    with pytest.raises(ValueError):
+        OutsourcingAnalyzer(project, 10, outsources=[Outsource(0, "bad", [], 1.0, 1.5, 0, 1.0)])
+
+
+def test_pareto_frontier_is_reproducible_and_restores_plan():
+    project = _project_with_vendors()
+    analyzer = OutsourcingAnalyzer(project, 500, rng=np.random.default_rng(3))
+    baseline = analyzer.simulator.baseline.copy()
+    front = analyzer.pareto_frontier()
+
+    assert len(front) >= 2
+    costs = [point["cost"] for point in front]
+    quantiles = [point["quantile"] for point in front]
+    assert costs == sorted(costs)
+    assert all(a > b for a, b in zip(quantiles, quantiles[1:]))
+    assert analyzer.plan == {}
+    np.testing.assert_array_equal(analyzer.simulator.baseline, baseline)
+
+    point = front[-1]
+    for task_id, outs_id in point["plan"].items():
+        analyzer.set_option(task_id, outs_id)
+    assert analyzer.quantile == pytest.approx(point["quantile"], abs=1e-9)
+    assert analyzer.cost == pytest.approx(point["cost"])
+
+
+def test_pareto_front_filter():
+    points = [{"cost": 3, "quantile": 5}, {"cost": 1, "quantile": 9},
+              {"cost": 2, "quantile": 9}, {"cost": 4, "quantile": 6}]
+    assert [(p["cost"], p["quantile"]) for p in pareto_front(points)] == [(1, 9), (3, 5)]
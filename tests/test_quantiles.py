@@ -0,0 +1,66 @@
+"""Tests for the streaming quantile sketch against exact sorted percentiles."""
+
+import numpy as np
+import pytest
+
+from ltrroe.core.engine import monte_carlo_batch, monte_carlo_sketch
+from ltrroe.core.quantiles import StreamingQuantiles
+from ltrroe.core.test_data import create_test_project
+from ltrroe.synth.project_level import percentile
+
+QUANTILES = (0.0, 0.1, 0.5, 0.9, 0.99, 1.0)
+
+
+def _assert_within_bound(sketch, values):
+    ordered = np.sort(values)
+    for q in QUANTILES:
+        assert abs(sketch.quantile(q) - percentile(ordered, q)) <= sketch.error_bound + 1e-12
+
+
+@pytest.mark.parametrize("values", [
+    np.random.default_rng(0).gamma(3.0, 12.0, size=50000),
+    np.random.default_rng(1).normal(0.0, 5.0, size=20000),
+    np.random.default_rng(2).lognormal(3.0, 1.0, size=20000),
+])
+def test_batched_updates_within_documented_bound(values):
+    sketch = StreamingQuantiles(n_bins=1024)
+    for batch in np.array_split(values, 17):
+        sketch.update(batch)
+    assert sketch.count == len(values)
+    _assert_within_bound(sketch, values)
+    # the bin width stays proportional to the observed range
+    assert sketch.bin_width <= 4 * (values.max() - values.min()) / sketch.n_bins
+
+
+def test_single_sample_updates_expand_both_ways():
+    values = np.random.default_rng(3).uniform(-50.0, 50.0, size=3000)
+    sketch = StreamingQuantiles(n_bins=256)
+    for value in values:
+        sketch.update(value)
+    _assert_within_bound(sketch, values)
+
+
+def test_constant_input():
+    sketch = StreamingQuantiles()
+    sketch.update(np.full(100, 7.0))
+    assert sketch.p10 == sketch.p90 == 7.0
+    assert sketch.schedule_risk_ratio() == 0.0
+
+
+def test_empty_sketch_has_no_estimates():
+    sketch = monte_carlo_sketch(create_test_project(), num_simulations=0)
+    assert sketch.count == 0
+    assert sketch.quantile(0.5) is None
+    assert sketch.p10 is None and sketch.p50 is None and sketch.p90 is None
+    assert sketch.schedule_risk_ratio() is None
+
+
+def test_monte_carlo_sketch_matches_exact_percentiles():
+    project = create_test_project()
+    exact = monte_carlo_batch(project, num_simulations=20000, rng=np.random.default_rng(8))
+    sketch = monte_carlo_sketch(project, num_simulations=20000, batch_size=20000,
+                                rng=np.random.default_rng(8))
+    _assert_within_bound(sketch, exact)
+    ordered = np.sort(exact)
+    expected_ratio = (percentile(ordered, 0.9) - percentile(ordered, 0.5)) / percentile(ordered, 0.5)
+    assert sketch.schedule_risk_ratio() == pytest.approx(expected_ratio, abs=1e-3)
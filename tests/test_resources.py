@@ -0,0 +1,100 @@
+"""Tests for the resource-constrained parallel schedule generation scheme."""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from ltrroe.core.engine import forward_pass_days, monte_carlo_batch, schedule_days
+from ltrroe.core.graph import CompiledGraph
+from ltrroe.core.objects import Assignment, Employee, Project, Task
+from ltrroe.core.resources import (
+    ResourceScheduler,
+    monte_carlo_resources,
+    schedule_resources,
+)
+from ltrroe.core.test_data import create_test_project
+from ltrroe.synth.project_level import generate_project
+
+
+def _unlimited(project):
+    for emp in project.proj_employees.values():
+        emp.emp_max_daily_hours = 1e9
+    return project
+
+
+def _shared_employee_project(hours_a=8.0, hours_b=8.0, capacity=8.0):
+    project = Project(proj_id="shared")
+    project.proj_start_date = datetime(2026, 1, 1)
+    emp = Employee(0, "E", [], 0.0, 10.0, {})
+    emp.emp_max_daily_hours = capacity
+    project.proj_employees[0] = emp
+    for task_id, dist in ((0, (3.0, 3.0, 3.0)), (1, (2.0, 2.0, 2.0))):
+        project.proj_tasks[task_id] = Task(task_id, f"T{task_id}", [], 1, 0.0, dist)
+        project.proj_tasks[task_id].task_assigned_to = [0]
+    project.proj_dependencies = []
+    assignments = [
+        Assignment(0, 0, None, None, hours_a),
+        Assignment(1, 0, None, None, hours_b),
+    ]
+    return project, assignments
+
+
+def test_unlimited_capacity_reduces_to_cpm():
+    project = _unlimited(create_test_project())
+    start, finish, durations = schedule_resources(project)
+    early_start, early_finish, expected = schedule_days(project)
+    np.testing.assert_allclose(start, early_start, atol=1e-9)
+    np.testing.assert_allclose(finish, early_finish, atol=1e-9)
+
+    sims = monte_carlo_resources(project, 300, rng=np.random.default_rng(4))
+    np.testing.assert_allclose(sims, monte_carlo_batch(project, 300, rng=np.random.default_rng(4)),
+                               atol=1e-9)
+
+
+def test_full_time_tasks_on_one_employee_run_in_sequence():
+    project, assignments = _shared_employee_project()
+    start, finish, _ = schedule_resources(project, assignments=assignments, priority="est")
+    assert finish.max() == pytest.approx(5.0)
+    # explicit priorities decide which task goes first
+    start, _, _ = schedule_resources(project, assignments=assignments, priority=np.array([1.0, 0.0]))
+    np.testing.assert_allclose(start, [2.0, 0.0])
+
+    # half-time tasks share the employee
+    project, assignments = _shared_employee_project(4.0, 4.0)
+    _, finish, _ = schedule_resources(project, assignments=assignments)
+    assert finish.max() == pytest.approx(3.0)
+
+
+def test_schedule_respects_precedence_and_capacity():
+    project = generate_project(1, np.random.default_rng(12))
+    graph = CompiledGraph(project)
+    scheduler = ResourceScheduler(project, graph)
+    durations = np.random.default_rng(0).uniform(0.5, 6.0, graph.n_tasks)
+    start, finish = scheduler.run(durations)
+
+    np.testing.assert_allclose(finish - start, durations)
+    for i, j in zip(graph.edge_from, graph.edge_to):
+        assert start[j] >= finish[i] - 1e-9
+    capacity = scheduler.resources.capacity
+    for t in start:
+        load = np.zeros(len(capacity))
+        for j in np.flatnonzero((start <= t) & (finish > t)):
+            for e, hours in scheduler.resources.demand[j].items():
+                load[e] += hours
+        assert np.all(load <= np.asarray(capacity) + 1e-9)
+
+    # contention can only delay the project
+    assert finish.max() >= forward_pass_days(graph, durations)[1].max() - 1e-9
+
+
+def test_contention_raises_monte_carlo_percentiles():
+    project = generate_project(2, np.random.default_rng(3))
+    constrained = monte_carlo_resources(project, 400, rng=np.random.default_rng(1))
+    unconstrained = monte_carlo_batch(project, 400, rng=np.random.default_rng(1))
+    assert np.all(constrained >= unconstrained - 1e-9)
+
+
+def test_invalid_priority_rule():
+    with pytest.raises(ValueError):
+        schedule_resources(create_test_project(), priority="random")
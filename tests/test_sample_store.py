@@ -0,0 +1,92 @@
+"""Tests for the memory-mapped Monte Carlo sample store."""
+
+import numpy as np
+import pytest
+
+from ltrroe.synth.datasets import read_dataset
+from ltrroe.synth.project_level import build_dataset, percentile
+from ltrroe.synth.sample_store import SampleStore
+
+
+def test_append_and_read_back(tmp_path):
+    rng = np.random.default_rng(0)
+    first, second = rng.random(100), rng.random(37)
+    with SampleStore(tmp_path) as store:
+        store.append("a", first)
+        store.append("b", second)
+
+    store = SampleStore(tmp_path)
+    assert store.project_ids == ["a", "b"]
+    assert np.allclose(store.samples("a"), first.astype(np.float32))
+    assert np.allclose(store.samples("b"), second.astype(np.float32))
+    with pytest.raises(ValueError):
+        store.append("a", first)
+
+
+def test_risk_metrics_match_sorted_percentile(tmp_path):
+    values = np.random.default_rng(1).gamma(4.0, 10.0, size=1000).astype(np.float32)
+    with SampleStore(tmp_path) as store:
+        store.append("p", values)
+        metrics = store.risk_metrics(quantiles=(0.5, 0.9, 0.95), cvar_levels=(0.9,))
+
+    ordered = np.sort(values)
+    assert metrics.loc["p", "p95"] == pytest.approx(percentile(ordered, 0.95))
+    assert metrics.loc["p", "cvar90"] == pytest.approx(ordered[900:].mean(), rel=1e-6)
+    assert metrics.loc["p", "cvar90"] >= metrics.loc["p", "p90"]
+
+
+def test_dataset_percentiles_recomputed_from_store(tmp_path):
+    output = tmp_path / "projects.csv"
+    samples_dir = tmp_path / "samples"
+    build_dataset(4, 300, output, seed=3, samples_dir=samples_dir)
+
+    df = read_dataset(output).set_index("project_id")
+    metrics = SampleStore(samples_dir).risk_metrics(quantiles=(0.1, 0.9))
+    assert list(metrics.index) == list(df.index)
+    assert np.allclose(metrics["p90"], df["p90"], atol=0.01)
+    assert np.allclose(metrics["p10"], df["p10"], atol=0.01)
+
+
+def test_resume_truncates_store_to_dataset(tmp_path):
+    output = tmp_path / "projects.csv"
+    samples_dir = tmp_path / "samples"
+    build_dataset(3, 200, output, seed=3, samples_dir=samples_dir)
+    # the store got ahead of the dataset before a crash
+    with SampleStore(samples_dir) as store:
+        store.append("synth_4", np.zeros(200))
+
+    build_dataset(5, 200, output, seed=3, chunk_size=2, resume=True, samples_dir=samples_dir)
+    assert SampleStore(samples_dir).project_ids == [f"synth_{i}" for i in range(1, 6)]
+
+
+def test_resume_rejects_store_with_missing_projects(tmp_path):
+    output = tmp_path / "projects.csv"
+    samples_dir = tmp_path / "samples"
+    build_dataset(4, 200, output, seed=3, samples_dir=samples_dir)
+    # projects 3 and 4 lost from the index
+    index_path = samples_dir / "samples_index.csv"
+    lines = index_path.read_text(encoding="utf-8").splitlines(keepends=True)
+    index_path.write_text("".join(lines[:-2]), encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        build_dataset(6, 200, output, seed=3, resume=True, samples_dir=samples_dir)
+
+
+def test_partial_index_line_is_dropped(tmp_path):
+    first, second = np.arange(10.0), np.arange(5.0)
+    with SampleStore(tmp_path) as store:
+        store.append("a", first)
+    # crash in the middle of the next append: data written, index line cut off
+    with open(tmp_path / "samples.f32", "ab") as f:
+        f.write(np.ones(7, dtype=np.float32).tobytes())
+    with open(tmp_path / "samples_index.csv", "a", encoding="utf-8") as f:
+        f.write("b,10")
+
+    store = SampleStore(tmp_path)
+    assert store.project_ids == ["a"]
+    with store:
+        store.append("b", second)
+    store = SampleStore(tmp_path)
+    assert store.project_ids == ["a", "b"]
+    assert np.array_equal(store.samples("a"), first)
+    assert np.array_equal(store.samples("b"), second)
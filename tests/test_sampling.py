@@ -0,0 +1,65 @@
+"""Tests for variance-reduction sampling plans (LHS, antithetic, Sobol)."""
+
+import random
+
+import numpy as np
+import pytest
+
+from ltrroe.core.algorithms import monte_carlo_simulation, random_triangular, triangular_from_uniform
+from ltrroe.core.engine import monte_carlo_batch
+from ltrroe.core.sampling import SAMPLING_METHODS, uniform_design
+from ltrroe.core.test_data import create_test_project
+from ltrroe.synth.bench_sampling import p90_standard_error
+
+
+@pytest.mark.parametrize("method", SAMPLING_METHODS)
+def test_design_shape_and_range(method):
+    u = uniform_design(method, 100, 7, np.random.default_rng(0))
+    assert u.shape == (100, 7)
+    assert np.all((u >= 0.0) & (u < 1.0))
+
+
+def test_lhs_has_one_point_per_stratum():
+    n = 64
+    u = uniform_design("lhs", n, 5, np.random.default_rng(1))
+    for column in u.T:
+        assert sorted(np.floor(column * n).astype(int)) == list(range(n))
+
+
+def test_antithetic_pairs_mirror():
+    u = uniform_design("antithetic", 10, 3, np.random.default_rng(2))
+    np.testing.assert_allclose(u[:5] + u[5:], 1.0)
+
+
+def test_unknown_method_rejected():
+    with pytest.raises(ValueError):
+        uniform_design("halton", 10, 3, np.random.default_rng(0))
+
+
+def test_triangular_from_uniform_matches_random_triangular():
+    random.seed(5)
+    u = random.random()
+    random.seed(5)
+    assert random_triangular(2.0, 3.0, 7.0) == triangular_from_uniform(2.0, 3.0, 7.0, u)
+
+
+@pytest.mark.parametrize("method", SAMPLING_METHODS)
+def test_strategies_agree_on_mean(method):
+    project = create_test_project()
+    reference = monte_carlo_batch(project, 20000, rng=np.random.default_rng(3))
+    durations = monte_carlo_batch(project, 4096, rng=np.random.default_rng(4), sampling=method)
+    assert abs(durations.mean() - reference.mean()) < 0.5
+
+
+def test_reference_simulation_accepts_sampling_plan():
+    project = create_test_project()
+    durations = monte_carlo_simulation(project, 256, sampling="lhs", rng=np.random.default_rng(6))
+    batch = monte_carlo_batch(project, 256, rng=np.random.default_rng(6), sampling="lhs")
+    np.testing.assert_allclose(sorted(durations), np.sort(batch), atol=1e-6)
+
+
+def test_lhs_reduces_p90_standard_error():
+    project = create_test_project()
+    random_se = p90_standard_error(project, 512, "random", replicates=20, seed=7)
+    lhs_se = p90_standard_error(project, 512, "lhs", replicates=20, seed=7)
+    assert lhs_se < random_se
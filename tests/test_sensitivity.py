@@ -0,0 +1,55 @@
+"""Tests for streaming criticality and sensitivity indices."""
+
+import numpy as np
+from scipy import stats
+
+from ltrroe.core.engine import (
+    float_analysis,
+    forward_pass_days,
+    monte_carlo_batch,
+    monte_carlo_sensitivity,
+    sample_durations,
+)
+from ltrroe.core.graph import CompiledGraph
+from ltrroe.core.sensitivity import TaskSensitivity
+from ltrroe.core.test_data import create_test_project
+
+
+def test_streaming_indices_match_full_matrix():
+    rng = np.random.default_rng(0)
+    x = rng.gamma(2.0, 3.0, size=(6000, 4))
+    x[:, 3] = 5.0  # constant duration has no correlation
+    y = x[:, 0] * 2.0 + x[:, 1] + rng.normal(0.0, 1.0, size=6000)
+    critical = x > 6.0
+
+    sensitivity = TaskSensitivity(4)
+    for rows in np.array_split(np.arange(6000), 7):
+        sensitivity.update(x[rows], y[rows], critical[rows])
+
+    assert sensitivity.count == 6000
+    np.testing.assert_allclose(sensitivity.criticality, critical.mean(axis=0))
+    for j in range(3):
+        assert abs(sensitivity.pearson[j] - np.corrcoef(x[:, j], y)[0, 1]) < 1e-9
+        assert abs(sensitivity.spearman[j] - stats.spearmanr(x[:, j], y)[0]) < 0.02
+    assert sensitivity.pearson[3] == 0.0 and sensitivity.spearman[3] == 0.0
+    np.testing.assert_allclose(sensitivity.cruciality,
+                               sensitivity.criticality * np.abs(sensitivity.pearson))
+
+
+def test_monte_carlo_criticality_matches_per_sample_analysis():
+    project = create_test_project()
+    graph = CompiledGraph(project)
+
+    durations, sensitivity = monte_carlo_sensitivity(
+        project, 3000, batch_size=700, rng=np.random.default_rng(1), graph=graph)
+    # the tracked run consumes the same random stream as a plain batch
+    np.testing.assert_allclose(durations, monte_carlo_batch(project, 3000, rng=np.random.default_rng(1)))
+
+    matrix = sample_durations(project, graph.task_ids, 3000, np.random.default_rng(1))
+    early_start, early_finish = forward_pass_days(graph, matrix)
+    _, _, critical = float_analysis(graph, early_start, early_finish, matrix)
+    np.testing.assert_allclose(sensitivity.criticality, critical.mean(axis=0))
+
+    summary = sensitivity.summary(graph.task_ids)
+    assert set(summary) == set(graph.task_ids)
+    assert all(0.0 <= values["criticality"] <= 1.0 for values in summary.values())
@@ -0,0 +1,68 @@
+"""Tests for the skills x employees slowdown matrices."""
+
+import numpy as np
+import pytest
+
+from ltrroe.core.algorithms import build_task_slowdown_cache, calculate_slowdown_factor
+from ltrroe.core.skills import COORDINATION_OVERHEAD, SkillMatrix
+from ltrroe.core.test_data import create_test_project
+from ltrroe.synth.project_level import generate_project
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_pair_slowdowns_match_scalar_reference(seed):
+    project = generate_project(seed, np.random.default_rng(seed))
+    matrix = SkillMatrix(project)
+    for t, task_id in enumerate(matrix.task_ids):
+        for e, emp_id in enumerate(matrix.employee_ids):
+            expected = calculate_slowdown_factor(project.proj_employees[emp_id],
+                                                 project.proj_tasks[task_id])
+            assert matrix.slowdown[t, e] == expected
+
+
+def test_reference_project_and_primary_cache():
+    project = create_test_project()
+    matrix = SkillMatrix(project)
+    for t, task_id in enumerate(matrix.task_ids):
+        task = project.proj_tasks[task_id]
+        for e, emp_id in enumerate(matrix.employee_ids):
+            assert matrix.slowdown[t, e] == calculate_slowdown_factor(project.proj_employees[emp_id], task)
+
+    cache = build_task_slowdown_cache(project)
+    for task_id, task in project.proj_tasks.items():
+        employee = project.proj_employees.get(task.task_assigned_to[0]) if task.task_assigned_to else None
+        expected = calculate_slowdown_factor(employee, task) if employee else 1.0
+        assert cache[task_id] == expected
+
+
+def test_team_slowdowns():
+    project = create_test_project()
+    matrix = SkillMatrix(project)
+    assigned = np.zeros_like(matrix.slowdown, dtype=bool)
+    assigned[0, [0, 1]] = True
+    assigned[1, 2] = True
+
+    team = matrix.team_slowdowns(assigned)
+    s0, s1 = matrix.slowdown[0, 0], matrix.slowdown[0, 1]
+    assert team[0] == pytest.approx((1.0 + COORDINATION_OVERHEAD) / (1.0 / s0 + 1.0 / s1))
+    assert team[1] == matrix.slowdown[1, 2]
+    assert np.all(team[2:] == 1.0)
+
+    # a batch of candidate assignments in one expression
+    batch = np.stack([assigned, ~assigned])
+    np.testing.assert_array_equal(matrix.team_slowdowns(batch)[0], team)
+
+    cache = build_task_slowdown_cache(project, team=True)
+    expected = matrix.team_slowdowns(matrix.assignment_matrix(project))
+    np.testing.assert_allclose(list(cache.values()), expected, rtol=1e-12)
+    np.testing.assert_allclose(matrix.assigned_slowdowns(project, team=True), expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_assigned_slowdowns_do_not_build_pair_matrix(seed):
+    project = generate_project(seed, np.random.default_rng(seed))
+    matrix = SkillMatrix(project)
+    primary = matrix.assigned_slowdowns(project)
+    assert matrix._slowdown is None
+    np.testing.assert_array_equal(primary, list(build_task_slowdown_cache(project).values()))
+    np.testing.assert_array_equal(primary, matrix.team_slowdowns(matrix.assignment_matrix(project, True)))
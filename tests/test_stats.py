@@ -0,0 +1,29 @@
+"""Tests for the shared order statistic and expected work cost helpers."""
+
+import numpy as np
+
+from ltrroe.core.stats import expected_work_cost, hourly_rates, order_statistic, order_statistic_index
+from ltrroe.core.test_data import create_test_project
+from ltrroe.synth.project_level import percentile
+
+
+def test_order_statistic_matches_sorted_index():
+    values = np.random.default_rng(0).random((3, 101))
+    for q in (0.0, 0.1, 0.5, 0.9, 1.0):
+        k = order_statistic_index(101, q)
+        assert np.array_equal(order_statistic(values, q), np.sort(values, axis=-1)[:, k])
+        assert percentile(np.sort(values[0]), q) == np.sort(values[0])[k]
+    assert order_statistic_index(10, 1.0) == 9
+
+
+def test_expected_work_cost_broadcasts_pairs():
+    project = create_test_project()
+    employee_ids = list(project.proj_employees)
+    hourly = hourly_rates(project, employee_ids + [None, "missing"])
+    assert hourly[-2:].tolist() == [0.0, 0.0]
+    assert hourly[0] == project.proj_employees[employee_ids[0]].emp_cost_per_hour
+
+    mean_days = np.array([2.0, 3.0])
+    pair = expected_work_cost(mean_days[:, None], np.ones((2, 3)), np.array([1.0, 2.0, 3.0])[None, :], 8.0)
+    assert pair.shape == (2, 3)
+    assert pair[1, 2] == 3.0 * 8.0 * 3.0
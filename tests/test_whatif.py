@@ -0,0 +1,83 @@
+"""Tests for the common-random-numbers what-if Monte Carlo."""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from ltrroe.core.engine import monte_carlo_batch
+from ltrroe.core.objects import Project, Task
+from ltrroe.core.test_data import create_test_project
+from ltrroe.core.whatif import WhatIfSimulator, paired_quantile_deltas
+from ltrroe.synth.task_level import generate_dependencies
+
+
+def _mixed_dependency_project():
+    project = Project(proj_id="mixed")
+    project.proj_start_date = datetime(2026, 1, 1)
+    for task_id in range(25):
+        project.proj_tasks[task_id] = Task(task_id, f"T{task_id}", [], 1, 0.0, (1.0, 3.0, 6.0))
+    project.proj_dependencies = generate_dependencies(list(range(25)), density=0.2,
+                                                     rng=np.random.default_rng(6))
+    return project
+
+
+@pytest.mark.parametrize("make_project", [create_test_project, _mixed_dependency_project])
+def test_baseline_and_scenarios_match_full_reruns(make_project):
+    project = make_project()
+    simulator = WhatIfSimulator(project, 2000, rng=np.random.default_rng(3))
+    np.testing.assert_array_equal(simulator.baseline,
+                                  monte_carlo_batch(project, 2000, rng=np.random.default_rng(3)))
+    np.testing.assert_array_equal(simulator.scenario(), simulator.baseline)
+
+    task_id = list(project.proj_tasks)[len(project.proj_tasks) // 2]
+    scenario = simulator.scenario(distributions={task_id: (4.0, 9.0, 20.0)})
+
+    # a full rerun with the same uniforms gives the same paired sample
+    project.proj_tasks[task_id].task_duration_dist = (4.0, 9.0, 20.0)
+    expected = monte_carlo_batch(project, 2000, rng=np.random.default_rng(3))
+    np.testing.assert_allclose(scenario, expected, rtol=0, atol=1e-9)
+
+
+def test_assignment_scenario_and_apply():
+    project = create_test_project()
+    simulator = WhatIfSimulator(project, 1000, rng=np.random.default_rng(1))
+    task_id = next(iter(project.proj_tasks))
+    employee_id = list(project.proj_employees)[-1]
+
+    assigned = list(project.proj_tasks[task_id].task_assigned_to)
+    scenario = simulator.scenario(assignments={task_id: [employee_id]})
+    assert not np.array_equal(scenario, simulator.baseline)
+    # the simulator never mutates the project
+    assert project.proj_tasks[task_id].task_assigned_to == assigned
+    applied = simulator.apply(assignments={task_id: [employee_id]})
+    np.testing.assert_array_equal(applied, scenario)
+    np.testing.assert_array_equal(simulator.scenario(), scenario)
+
+    project.proj_tasks[task_id].task_assigned_to = [employee_id]
+    expected = monte_carlo_batch(project, 1000, rng=np.random.default_rng(1))
+    np.testing.assert_allclose(simulator.baseline, expected, rtol=0, atol=1e-9)
+
+
+def test_paired_intervals_are_tighter_than_independent_runs():
+    project = _mixed_dependency_project()
+    simulator = WhatIfSimulator(project, 4000, rng=np.random.default_rng(2))
+    task_id = 0
+    report = simulator.compare(distributions={task_id: (1.0, 3.5, 7.0)}, rng=np.random.default_rng(0))
+    assert set(report) == {"p50", "p90"}
+
+    for values in report.values():
+        assert values["ci_low"] <= values["delta"] <= values["ci_high"]
+    paired_width = report["p90"]["ci_high"] - report["p90"]["ci_low"]
+
+    independent = WhatIfSimulator(project, 4000, rng=np.random.default_rng(99)).scenario(
+        distributions={task_id: (1.0, 3.5, 7.0)})
+    unpaired = paired_quantile_deltas(simulator.baseline, independent, rng=np.random.default_rng(0))
+    assert paired_width < unpaired["p90"]["ci_high"] - unpaired["p90"]["ci_low"]
+
+
+def test_invalid_inputs():
+    with pytest.raises(ValueError):
+        WhatIfSimulator(Project(proj_id="empty"), 100)
+    with pytest.raises(ValueError):
+        paired_quantile_deltas(np.ones(3), np.ones(4))